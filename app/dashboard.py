@@ -263,16 +263,13 @@ elif page == "🔮 Make Predictions":
         
         # Basic Store Information
         st.markdown("**🏪 Store Information**")
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2 = st.columns(2)
         
         with col1:
             store = st.number_input("Store Number", min_value=1, max_value=1115, value=1, step=1)
         with col2:
             store_open = st.selectbox("Store Open?", options=[0, 1], format_func=lambda x: "Closed" if x == 0 else "Open", index=1)
-        with col3:
-            store_type = st.selectbox("Store Type", options=[0, 1, 2, 3], format_func=lambda x: ['a', 'b', 'c', 'd'][x], index=0)
-        with col4:
-            assortment = st.selectbox("Assortment", options=[0, 1, 2], format_func=lambda x: ['a', 'b', 'c'][x], index=0)
+        st.caption("Store type, assortment and competition distance are looked up from store.csv by the API")
         
         st.markdown("---")
         
@@ -295,14 +292,12 @@ elif page == "🔮 Make Predictions":
         
         # Promotional Features
         st.markdown("**🎯 Promotional Features**")
-        col1, col2, col3 = st.columns(3)
+        col1, col2 = st.columns(2)
         
         with col1:
             promo = st.checkbox("Promotion Active?", value=False)
         with col2:
             school_holiday = st.checkbox("School Holiday?", value=True)
-        with col3:
-            competition_distance = st.number_input("Competition Distance (m)", value=1000.0, step=100.0)
         
         st.markdown("---")
         
@@ -335,6 +330,11 @@ elif page == "🔮 Make Predictions":
             sales_per_customer = sales_lag_1 / customers_lag_1 if customers_lag_1 > 0 else 0
             
             try:
+                # Static store metadata comes from the API's store table
+                store_response = requests.get(f"{api_url}/stores/{store}", timeout=5)
+                store_response.raise_for_status()
+                store_info = store_response.json()
+                
                 # Create payload with PascalCase keys to match API requirements
                 payload = {
                     "DayOfWeek": day_of_week,
@@ -357,9 +357,9 @@ elif page == "🔮 Make Predictions":
                     "SalesPerCustomer": sales_per_customer,
                     "Store": store,
                     "Open": store_open,
-                    "StoreType": store_type,
-                    "Assortment": assortment,
-                    "CompetitionDistance": competition_distance
+                    "StoreType": store_info["StoreType"],
+                    "Assortment": store_info["Assortment"],
+                    "CompetitionDistance": store_info["CompetitionDistance"]
                 }
                 
                 response = requests.post(f"{api_url}/predict", json=payload, timeout=5)
@@ -510,16 +510,31 @@ elif page == "📈 Model Performance":
 elif page == "🏥 Health Check":
     st.header("🏥 System Health & Monitoring")
     
+    # Live values from the API (/health and /stats); full histograms are on /metrics
+    try:
+        health = requests.get(f"{api_url}/health", timeout=5).json()
+        stats = requests.get(f"{api_url}/stats", timeout=5).json()
+    except requests.exceptions.RequestException:
+        health, stats = None, None
+    
     col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.metric("API Status", "🟢 Online")
-    with col2:
-        st.metric("Database", "🟢 Connected")
-    with col3:
-        st.metric("Model", "🟢 Loaded")
-    with col4:
-        st.metric("Uptime", "99.8%")
+    if health is None:
+        st.error(f"❌ **API not reachable at** `{api_url}`")
+    else:
+        cache_stats = stats.get("prediction_cache", {})
+        with col1:
+            st.metric("API Status", "🟢 Online")
+        with col2:
+            st.metric("Model", "🟢 Loaded" if health["model_loaded"] else "🔴 Not loaded")
+        with col3:
+            st.metric("Uptime", str(timedelta(seconds=int(stats["uptime_seconds"]))))
+        with col4:
+            if cache_stats.get("enabled"):
+                st.metric("Cache Hit Rate", f"{cache_stats['hit_rate']*100:.1f}%")
+            else:
+                st.metric("Cache Hit Rate", "N/A")
+        st.caption(f"Inference jobs in flight: {stats['inference_pending']} | Prometheus metrics: {api_url}/metrics")
     
     st.markdown("---")
     st.subheader("📊 System Logs (Last 24 Hours)")
@@ -549,6 +564,10 @@ elif page == "📚 Documentation":
         "GET /health": "Check API health status",
         "POST /predict": "Single prediction request",
         "POST /predict_batch": "Batch predictions",
+        "POST /predict_store": "Single prediction from Store and Date",
+        "GET /stores/{store_id}": "Store metadata from store.csv",
+        "GET /stats": "Inference pool, micro-batching and cache statistics",
+        "GET /metrics": "Prometheus metrics (latency histograms, inference stages)",
         "GET /model/info": "Model metadata and performance"
     }
     
@@ -0,0 +1,146 @@
+"""Model packaging - native XGBoost + .npy scaler artifacts that load fast without unpickling
+
+Only the scaler vectors are memory-mapped and shared between processes; the
+UBJSON booster is parsed into each process's own heap.
+
+Usage:
+    python -m src.api.artifacts export [--model models/best_model.pkl] [--scaler models/scaler.pkl]
+    python -m src.api.artifacts export --version 2025-11-20 [--activate]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import xgboost as xgb
+
+from .inference import FEATURE_NAMES, N_FEATURES, N_SCALED, MODEL_PATH, SCALER_PATH, load_artifacts
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = "models/packaged"
+MODEL_FILE = "model.ubj"
+SCALER_FILE = "scaler.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+class AffineScaler:
+    """Drop-in for StandardScaler.transform backed by plain mean_/scale_ vectors
+
+    The vectors can be read-only memory maps, so every worker process shares
+    the same pages.
+    """
+
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X):
+        return (X - self.mean_) / self.scale_
+
+
+def probe_matrix(scaler, n_rows=64, seed=0):
+    """Plausible raw rows for comparing two model/scaler pairs"""
+    rng = np.random.default_rng(seed)
+    matrix = np.empty((n_rows, N_FEATURES), dtype=np.float32)
+    matrix[:, :N_SCALED] = scaler.mean_ + rng.standard_normal((n_rows, N_SCALED)) * scaler.scale_
+    matrix[:, N_SCALED:] = [1, 1, 0, 0, 1000.0]
+    return matrix
+
+
+def package_model(model, scaler, out_dir, version=None, **manifest_fields):
+    """Write a fitted model/scaler pair in packaged form and a manifest; returns the max abs diff"""
+    os.makedirs(out_dir, exist_ok=True)
+
+    model.save_model(os.path.join(out_dir, MODEL_FILE))
+    np.save(os.path.join(out_dir, SCALER_FILE), np.vstack([scaler.mean_, scaler.scale_]).astype(np.float64))
+
+    # The packaged pair must reproduce the in-memory one
+    packed_model, packed_scaler = load_packaged(out_dir)
+    probe = probe_matrix(scaler)
+    expected = model.predict(np.hstack([scaler.transform(probe[:, :N_SCALED]), probe[:, N_SCALED:]]))
+    actual = packed_model.predict(np.hstack([packed_scaler.transform(probe[:, :N_SCALED]), probe[:, N_SCALED:]]))
+    max_diff = float(np.max(np.abs(expected - actual)))
+
+    manifest = {
+        "version": version,
+        "feature_names": FEATURE_NAMES,
+        "n_scaled": N_SCALED,
+        "model_file": MODEL_FILE,
+        "scaler_file": SCALER_FILE,
+        **manifest_fields,
+        "exported_at": datetime.now().isoformat(),
+        "max_abs_diff_vs_source": max_diff,
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return max_diff
+
+
+def export_artifacts(model_path=MODEL_PATH, scaler_path=SCALER_PATH, out_dir=PACKAGE_DIR, version=None):
+    """Write the booster in UBJSON, the scaler as a (2, 17) .npy and a manifest; returns the max abs diff"""
+    model, scaler = load_artifacts(model_path, scaler_path)
+    return package_model(model, scaler, out_dir, version=version,
+                         source_model=model_path, source_scaler=scaler_path)
+
+
+def load_packaged(package_dir=PACKAGE_DIR, mmap=True):
+    """Load a packaged model directory; the scaler vectors are memory-mapped"""
+    model = xgb.XGBRegressor()
+    model.load_model(os.path.join(package_dir, MODEL_FILE))
+    params = np.load(os.path.join(package_dir, SCALER_FILE), mmap_mode='r' if mmap else None)
+    return model, AffineScaler(params[0], params[1])
+
+
+def is_packaged(package_dir):
+    return os.path.exists(os.path.join(package_dir, MANIFEST_FILE))
+
+
+def load_serving_artifacts(package_dir=PACKAGE_DIR, model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """Prefer the packaged artifacts, falling back to the joblib pickles"""
+    start = time.perf_counter()
+    if is_packaged(package_dir):
+        model, scaler = load_packaged(package_dir)
+        source = package_dir
+    else:
+        model, scaler = load_artifacts(model_path, scaler_path)
+        source = model_path
+    logger.info(f"📦 Artifacts loaded from {source} in {time.perf_counter() - start:.3f}s")
+    return model, scaler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.api.artifacts", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export", help="Package the pickled model and scaler")
+    export_cmd.add_argument("--model", default=MODEL_PATH)
+    export_cmd.add_argument("--scaler", default=SCALER_PATH)
+    export_cmd.add_argument("--out", default=None,
+                            help=f"Output directory (default: {PACKAGE_DIR}, or models/versions/<version>)")
+    export_cmd.add_argument("--version", default=None, help="Export as a versioned model")
+    export_cmd.add_argument("--activate", action="store_true", help="Point models/versions/CURRENT at --version")
+    args = parser.parse_args(argv)
+
+    # Imported here: registry imports this module
+    from .registry import VERSIONS_DIR, activate_version
+
+    out_dir = args.out or (os.path.join(VERSIONS_DIR, args.version) if args.version else PACKAGE_DIR)
+    max_diff = export_artifacts(args.model, args.scaler, out_dir, version=args.version)
+    print(f"✔ Packaged artifacts written to {out_dir}")
+    print(f"✔ Max abs prediction difference vs pickle: {max_diff:.6g}")
+
+    if args.activate:
+        if not args.version:
+            parser.error("--activate requires --version")
+        activate_version(VERSIONS_DIR, args.version)
+        print(f"✔ {VERSIONS_DIR}/CURRENT -> {args.version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Micro-batching dispatcher that coalesces concurrent single-row predictions"""
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from .metrics import INFERENCE_STAGE
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """Collects single-row requests for up to ``window_ms`` or ``max_rows`` and scores them together
+
+    ``predict_fn`` is an async callable taking a raw (N, 22) matrix and the
+    model bundle and returning N predictions. Rows queued against different
+    bundles (across a hot reload) are scored separately. If it raises, every
+    caller in that group gets the same exception. All state is only touched
+    from the event loop thread.
+    """
+
+    def __init__(self, predict_fn, window_ms=2.0, max_rows=64):
+        self.predict_fn = predict_fn
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._pending = []  # (row, bundle, future, enqueued_at)
+        self._timer = None
+        self._tasks = set()
+
+        # Counters for the stats endpoint
+        self.batches = 0
+        self.rows = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.batch_size_max = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    async def submit(self, row, bundle):
+        """Queue one (1, 22) raw feature row and wait for its prediction from ``bundle``"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, bundle, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        groups = {}
+        for entry in batch:
+            groups.setdefault(id(entry[1]), []).append(entry)
+        for group in groups.values():
+            task = asyncio.ensure_future(self._run(group))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        dispatched_at = time.perf_counter()
+        self._record(batch, dispatched_at)
+        with INFERENCE_STAGE.time("concatenation"):
+            matrix = np.concatenate([row for row, _, _, _ in batch], axis=0)
+
+        try:
+            predictions = await self.predict_fn(matrix, batch[0][1])
+        except Exception as e:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future, _), prediction in zip(batch, predictions):
+            # Callers that disconnected meanwhile have cancelled futures
+            if not future.done():
+                future.set_result(float(prediction))
+
+    def _record(self, batch, dispatched_at):
+        size = len(batch)
+        self.batches += 1
+        self.rows += size
+        self.batch_size_max = max(self.batch_size_max, size)
+        bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound), len(BATCH_SIZE_BUCKETS))
+        self.batch_size_counts[bucket] += 1
+        for _, _, _, enqueued_at in batch:
+            wait = dispatched_at - enqueued_at
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    def stats(self):
+        """Queue wait and batch size summary"""
+        labels = [f"<={bound}" for bound in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+        return {
+            "enabled": True,
+            "window_ms": self.window * 1000,
+            "max_rows": self.max_rows,
+            "batches": self.batches,
+            "rows": self.rows,
+            "queued_now": len(self._pending),
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.batch_size_max,
+            "batch_size_histogram": dict(zip(labels, self.batch_size_counts)),
+            "mean_queue_wait_ms": 1000 * self.queue_wait_total / self.rows if self.rows else 0.0,
+            "max_queue_wait_ms": 1000 * self.queue_wait_max,
+        }
@@ -0,0 +1,97 @@
+"""In-memory LRU + TTL cache for single-row predictions"""
+
+import hashlib
+import sys
+import time
+from collections import OrderedDict
+
+# Rough per-entry cost of the OrderedDict node and the (value, expires_at) tuple
+ENTRY_OVERHEAD_BYTES = 120
+
+
+class PredictionCache:
+    """Maps hash(model version, 22 raw feature values) -> prediction
+
+    Entries expire ``ttl_seconds`` after insertion. The least recently used
+    entries are evicted once either ``max_entries`` or ``max_bytes`` is
+    exceeded. Only the event loop thread touches the cache, so it has no lock.
+    """
+
+    def __init__(self, max_entries=100_000, max_bytes=32_000_000, ttl_seconds=3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self._entries = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(features_row, model_version):
+        """Hash the raw float32 feature bytes together with the model version"""
+        digest = hashlib.blake2b(model_version.encode() + b"\0", digest_size=16)
+        digest.update(features_row.tobytes())
+        return digest.digest()
+
+    @staticmethod
+    def _entry_size(key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD_BYTES
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self.bytes += self._entry_size(key, value)
+
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self.bytes -= self._entry_size(key, value)
+
+    def clear(self):
+        """Drop every entry, e.g. when a new model is loaded"""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,90 @@
+"""Runtime configuration for the API, read from environment variables (or a .env file)"""
+
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+# INFERENCE WORKER POOL
+# Threads are enough for XGBoost/numpy since they release the GIL while predicting
+INFERENCE_THREADS = _env_int("INFERENCE_THREADS", min(4, os.cpu_count() or 1))
+# Requests waiting for or running inference before new ones get 429
+INFERENCE_MAX_PENDING = _env_int("INFERENCE_MAX_PENDING", 32)
+# Optional process pool for heavy batches (0 = disabled)
+PROCESS_POOL_WORKERS = _env_int("PROCESS_POOL_WORKERS", 0)
+PROCESS_POOL_MIN_ROWS = _env_int("PROCESS_POOL_MIN_ROWS", 5000)
+
+# Model backend: "xgboost" (booster.predict) or "flat" (numpy flattened trees, see
+# src/api/tree_engine.py - much lower fixed cost per call; falls back to xgboost if
+# it does not reproduce the booster's predictions)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "xgboost").lower()
+
+# MICRO-BATCHING (opt-in)
+# Coalesce concurrent single-row predictions into one model call
+MICRO_BATCHING = os.getenv("MICRO_BATCHING", "0").lower() in ("1", "true", "yes")
+MICRO_BATCH_WINDOW_MS = float(os.getenv("MICRO_BATCH_WINDOW_MS", 2.0))
+MICRO_BATCH_MAX_ROWS = _env_int("MICRO_BATCH_MAX_ROWS", 64)
+
+# LOGGING
+LOG_FILE = os.getenv("LOG_FILE", "logs/api.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = _env_int("LOG_MAX_BYTES", 10_000_000)
+LOG_BACKUP_COUNT = _env_int("LOG_BACKUP_COUNT", 5)
+# Successful requests to these paths are not access-logged (e.g. 30 s health probes)
+LOG_SKIP_PATHS = set(filter(None, os.getenv("LOG_SKIP_PATHS", "/health").split(",")))
+# Fraction of /predict requests whose features are dumped at DEBUG level
+LOG_FEATURE_SAMPLE_RATE = float(os.getenv("LOG_FEATURE_SAMPLE_RATE", 0.0))
+
+# PREDICTION CACHE
+PREDICTION_CACHE = os.getenv("PREDICTION_CACHE", "1").lower() in ("1", "true", "yes")
+CACHE_MAX_ENTRIES = _env_int("CACHE_MAX_ENTRIES", 100_000)
+CACHE_MAX_BYTES = _env_int("CACHE_MAX_BYTES", 32_000_000)
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 3600))
+
+# BINARY BATCH INPUT
+# Largest packed float32 (N, 22) body accepted by /predict_batch/binary
+BINARY_BATCH_MAX_ROWS = _env_int("BINARY_BATCH_MAX_ROWS", 1_000_000)
+
+# STREAMING BATCH (NDJSON)
+# Rows scored per model call; each chunk is written out as soon as it finishes
+STREAM_CHUNK_ROWS = _env_int("STREAM_CHUNK_ROWS", 1000)
+
+# MODEL ARTIFACTS
+# Packaged (native UBJSON + .npy) artifacts, used when present; see src/api/artifacts.py
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "models/packaged")
+# Load artifacts at import time, before a pre-forking server (gunicorn --preload) forks.
+# Only the scaler .npy is memory-mapped; the booster is parsed into each process's heap.
+PRELOAD_ARTIFACTS = os.getenv("PRELOAD_ARTIFACTS", "0").lower() in ("1", "true", "yes")
+
+# FEATURE TABLE
+# Columnar table from `python -m src.features.pipeline build`; when present the feature
+# store is loaded from it instead of re-parsing the training CSV
+FEATURE_TABLE_DIR = os.getenv("FEATURE_TABLE_DIR", "Data/features")
+
+# MODEL VERSIONS / HOT RELOAD
+# Versioned packaged models live in <dir>/<version>/; <dir>/CURRENT names the one to serve
+MODEL_VERSIONS_DIR = os.getenv("MODEL_VERSIONS_DIR", "models/versions")
+# Seconds between checks of CURRENT for a new version (0 = only reload via /admin/reload)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", 0))
+# When set, /admin endpoints require a matching X-Admin-Token header
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+# MONITORING / ACTUALS FEEDBACK
+# Days of served /predict_store predictions kept for joining with actuals
+MONITOR_RETENTION_DAYS = _env_int("MONITOR_RETENTION_DAYS", 62)
+# Predictions kept in the PerformanceMonitor ring buffers
+MONITOR_CAPACITY = _env_int("MONITOR_CAPACITY", 1_000_000)
+# Append-only binary log of matched (prediction, actual) pairs ("" = disabled)
+PREDICTION_LOG_DIR = os.getenv("PREDICTION_LOG_DIR", "logs/predictions")
+# Largest /monitor/actuals batch accepted
+ACTUALS_MAX_ROWS = _env_int("ACTUALS_MAX_ROWS", 2_000_000)
+
+# FORECASTING
+# Longest horizon (days) accepted by /forecast
+FORECAST_MAX_HORIZON = _env_int("FORECAST_MAX_HORIZON", 92)
@@ -0,0 +1,101 @@
+"""Bounded worker pools that keep model inference off the asyncio event loop"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .inference import InferencePipeline
+from .artifacts import PACKAGE_DIR, load_serving_artifacts
+
+logger = logging.getLogger(__name__)
+
+# Per-process pipeline for the optional process pool, and the package it was loaded from
+_WORKER_PIPELINE = None
+_WORKER_PACKAGE = None
+
+
+class InferenceOverloaded(Exception):
+    """Raised when too many inference jobs are already queued or running"""
+
+
+class InferenceUnavailable(Exception):
+    """Raised when the worker pools have been shut down"""
+
+
+def _init_process_worker(package_dir):
+    """Load the artifacts once in each pool process instead of pickling them per call"""
+    global _WORKER_PIPELINE, _WORKER_PACKAGE
+    _WORKER_PIPELINE = InferencePipeline(*load_serving_artifacts(package_dir))
+    _WORKER_PACKAGE = package_dir
+
+
+def _predict_in_process(package_dir, matrix):
+    # A job submitted across a model swap may land on a worker holding another version
+    if package_dir != _WORKER_PACKAGE:
+        _init_process_worker(package_dir)
+    return _WORKER_PIPELINE.predict(matrix)
+
+
+class InferenceExecutor:
+    """Runs fused scaler + model calls on a thread pool, or a process pool for heavy batches
+
+    ``pending`` counts jobs queued or running. It is only touched from the
+    event loop thread, so it needs no lock, and a job is released when its
+    worker future completes, not when the awaiting request goes away. Once
+    it reaches ``max_pending`` new jobs are rejected instead of queued.
+    """
+
+    def __init__(self, threads, max_pending, process_workers=0, process_min_rows=5000,
+                 package_dir=PACKAGE_DIR):
+        self.max_pending = max_pending
+        self.process_min_rows = process_min_rows
+        self.pending = 0
+        self._threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="inference")
+        self.process_workers = process_workers
+        self._processes = self._start_processes(package_dir) if process_workers > 0 else None
+        self._closed = False
+        logger.info(f"⚙️  Inference pool: {threads} threads, {process_workers} processes, max {max_pending} pending")
+
+    def _start_processes(self, package_dir):
+        return ProcessPoolExecutor(
+            max_workers=self.process_workers,
+            initializer=_init_process_worker,
+            initargs=(package_dir or PACKAGE_DIR,),
+        )
+
+    def reload_processes(self, package_dir):
+        """Start process workers on new artifacts; jobs already running finish on the old ones"""
+        if self._processes is None:
+            return
+        old, self._processes = self._processes, self._start_processes(package_dir)
+        old.shutdown(wait=False)
+
+    def _release(self, future):
+        self.pending -= 1
+
+    async def predict(self, pipeline, matrix, package_dir=None):
+        """Score a raw (N, 22) matrix with an InferencePipeline without blocking the event loop
+
+        Heavy batches go to the process pool when ``package_dir`` (the
+        pipeline's packaged artifacts) is given; the workers score with that
+        package, reloading it if they hold another one.
+        """
+        if self._closed:
+            raise InferenceUnavailable("Inference workers are shut down")
+        if self.pending >= self.max_pending:
+            raise InferenceOverloaded(f"{self.pending} inference jobs already pending")
+
+        loop = asyncio.get_running_loop()
+        if self._processes is not None and package_dir is not None and len(matrix) >= self.process_min_rows:
+            future = self._processes.submit(_predict_in_process, package_dir, matrix)
+        else:
+            future = self._threads.submit(pipeline.predict, matrix)
+        self.pending += 1
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self._release, done))
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._closed = True
+        self._threads.shutdown(wait=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=True)
@@ -0,0 +1,182 @@
+"""Vectorized feature assembly and inference helpers - 22 FEATURES"""
+
+import threading
+from functools import partial
+from itertools import chain
+from operator import attrgetter
+
+import joblib
+import numpy as np
+
+from .metrics import INFERENCE_STAGE
+
+# THE CORRECT 22 FEATURES (17 from scaler + 5 missing)
+FEATURE_NAMES = [
+    'DayOfWeek', 'Month', 'Quarter', 'IsWeekend', 'Promo', 'SchoolHoliday',
+    'Sales_Lag_1', 'Sales_Lag_7', 'Sales_Lag_14', 'Sales_Lag_30',
+    'Customers_Lag_1', 'Customers_Lag_7', 'Sales_Rolling_Mean_7',
+    'Sales_Rolling_Mean_14', 'Sales_Rolling_Std_7', 'Sales_Rolling_Std_14',
+    'SalesPerCustomer', 'Store', 'Open', 'StoreType', 'Assortment',
+    'CompetitionDistance'
+]
+N_FEATURES = len(FEATURE_NAMES)
+N_SCALED = 17
+
+MODEL_PATH = "models/best_model.pkl"
+SCALER_PATH = "models/scaler.pkl"
+
+# Rows per preallocated InferencePipeline buffer (covers single rows and micro-batches)
+PIPELINE_BUFFER_ROWS = 256
+
+_row_values = attrgetter(*FEATURE_NAMES)
+
+
+def load_artifacts(model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """Load the fitted model and the scaler for the first 17 features"""
+    return joblib.load(model_path), joblib.load(scaler_path)
+
+
+def build_feature_matrix(items):
+    """Pack validated request items into one (N, 22) float32 matrix in FEATURE_NAMES order"""
+    n_rows = len(items)
+    values = chain.from_iterable(map(_row_values, items))
+    matrix = np.fromiter(values, dtype=np.float32, count=n_rows * N_FEATURES)
+    return matrix.reshape(n_rows, N_FEATURES)
+
+
+class FeatureRanges:
+    """Vectorized equivalent of the Field(ge/gt/le) and int constraints of a request schema"""
+
+    def __init__(self, lower, lower_strict, upper, integer):
+        self.lower = lower
+        self.lower_strict = lower_strict
+        self.upper = upper
+        self.integer = integer
+
+    @classmethod
+    def from_model(cls, model):
+        """Read the bounds of each FEATURE_NAMES field from a pydantic model"""
+        lower = np.full(N_FEATURES, -np.inf, dtype=np.float32)
+        lower_strict = np.zeros(N_FEATURES, dtype=bool)
+        upper = np.full(N_FEATURES, np.inf, dtype=np.float32)
+        integer = np.zeros(N_FEATURES, dtype=bool)
+
+        for col, name in enumerate(FEATURE_NAMES):
+            field = model.model_fields[name]
+            integer[col] = field.annotation is int
+            for constraint in field.metadata:
+                if getattr(constraint, 'ge', None) is not None:
+                    lower[col] = constraint.ge
+                if getattr(constraint, 'gt', None) is not None:
+                    lower[col], lower_strict[col] = constraint.gt, True
+                if getattr(constraint, 'le', None) is not None:
+                    upper[col] = constraint.le
+        return cls(lower, lower_strict, upper, integer)
+
+    def check(self, matrix):
+        """Elementwise (N, 22) mask of values that satisfy the constraints"""
+        ok = np.where(self.lower_strict, matrix > self.lower, matrix >= self.lower)
+        ok &= matrix <= self.upper
+        ints = matrix[:, self.integer]
+        ok[:, self.integer] &= ints == np.floor(ints)
+        return ok
+
+
+def valid_rows(matrix, ranges=None):
+    """(N,) mask of rows that are finite and, when ``ranges`` is given, within bounds"""
+    ok = np.isfinite(matrix)
+    if ranges is not None:
+        ok &= ranges.check(matrix)
+    return ok.all(axis=1)
+
+
+def validate_matrix(matrix, ranges=None):
+    """Return a mask of scoreable rows and (index, error) pairs for the rest
+
+    Rows must be finite and, when ``ranges`` is given, within its bounds.
+    """
+    finite = np.isfinite(matrix)
+    ok = finite & ranges.check(matrix) if ranges is not None else finite
+    valid_mask = ok.all(axis=1)
+    errors = []
+    for idx in np.flatnonzero(~valid_mask):
+        column = int(np.argmin(ok[idx]))
+        problem = "Value out of range" if finite[idx, column] else "Non-finite value"
+        errors.append((int(idx), f"{problem} for feature '{FEATURE_NAMES[column]}'"))
+    return valid_mask, errors
+
+
+def affine_in_place(matrix, mean, scale):
+    """(x - mean) / scale on the first 17 columns, written back into ``matrix``"""
+    scaled = matrix[:, :N_SCALED]
+    np.subtract(scaled, mean, out=scaled)
+    np.divide(scaled, scale, out=scaled)
+    return matrix
+
+
+def scale_in_place(matrix, scaler):
+    """Apply the StandardScaler to the first 17 columns without a transform() call or temporaries"""
+    return affine_in_place(matrix, scaler.mean_, scaler.scale_)
+
+
+def raw_predict_fn(model):
+    """Booster.inplace_predict for XGBoost models (skips XGBRegressor.predict's checks), else model.predict"""
+    get_booster = getattr(model, "get_booster", None)
+    if get_booster is None:
+        return model.predict
+    best_iteration = getattr(model, "best_iteration", None)
+    iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+    return partial(get_booster().inplace_predict, iteration_range=iteration_range)
+
+
+def predict_matrix(model, scaler, matrix):
+    """Scale and score a raw (N, 22) matrix with a single model call"""
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.float32)
+    with INFERENCE_STAGE.time("scaling"):
+        scale_in_place(matrix, scaler)
+    with INFERENCE_STAGE.time("predict"):
+        return model.predict(matrix)
+
+
+class InferencePipeline:
+    """Scaler and model fused into one call over a preallocated feature buffer
+
+    Each worker thread owns one (buffer_rows, 22) float32 buffer in
+    FEATURE_NAMES order. Up to ``buffer_rows`` rows are copied into it,
+    columns 0-16 are scaled in place from the precomputed mean_/scale_
+    vectors and a view of the filled rows goes straight to the model. Larger
+    matrices are scaled in place in their own memory instead. Either way
+    there is no concatenation and no sklearn input validation per call.
+    """
+
+    def __init__(self, model, scaler, buffer_rows=PIPELINE_BUFFER_ROWS):
+        self.model = model
+        self.mean = np.ascontiguousarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scaler.scale_, dtype=np.float64)
+        self.buffer_rows = buffer_rows
+        self._predict = raw_predict_fn(model)
+        self._local = threading.local()
+
+    def _buffer(self):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = np.empty((self.buffer_rows, N_FEATURES), dtype=np.float32)
+        return buffer
+
+    def predict(self, matrix):
+        """Scale and score a raw (N, 22) matrix; small inputs are left untouched"""
+        n_rows = len(matrix)
+        if n_rows == 0:
+            return np.empty(0, dtype=np.float32)
+        with INFERENCE_STAGE.time("scaling"):
+            if n_rows <= self.buffer_rows:
+                features = self._buffer()[:n_rows]
+                np.copyto(features, matrix)
+            elif matrix.dtype == np.float32 and matrix.flags.writeable and matrix.flags.c_contiguous:
+                features = matrix
+            else:
+                features = np.array(matrix, dtype=np.float32)
+            affine_in_place(features, self.mean, self.scale)
+        with INFERENCE_STAGE.time("predict"):
+            return self._predict(features)
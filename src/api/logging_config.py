@@ -0,0 +1,55 @@
+"""Non-blocking, rotated logging setup for the API"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+
+def setup_logging(log_file, level="INFO", max_bytes=10_000_000, backup_count=5):
+    """Route all records through a queue so request handlers never wait on file I/O
+
+    The calling thread only enqueues the record; a background listener thread
+    formats it and writes it to a size-rotated file and to stderr.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers[:] = [QueueHandler(log_queue)]
+
+    _listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def access_record(method, path, status, latency_ms, **fields):
+    """One structured access-log line (JSON) per request"""
+    record = {"method": method, "path": path, "status": status, "latency_ms": round(latency_ms, 3)}
+    record.update(fields)
+    return json.dumps(record, separators=(",", ":"))
@@ -1,26 +1,57 @@
 """FastAPI application for Rossmann Sales Forecasting - 22 FEATURES"""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+from pydantic import ValidationError
+import asyncio
+import json
+from functools import partial
+from typing import Optional
 import numpy as np
-import joblib
 from datetime import datetime
 import logging
+import random
+import time
 from .models import (
     PredictionInput, PredictionOutput, HealthCheckResponse,
-    BatchPredictionRequest, ModelInfoResponse
+    BatchPredictionRequest, ModelInfoResponse, StorePredictionInput,
+    StoreInfoResponse, ReloadRequest, ReloadResponse, ActualsBatch, ForecastRequest, DailyHistory
 )
+from .inference import (
+    FEATURE_NAMES, N_FEATURES, N_SCALED,
+    FeatureRanges, build_feature_matrix, validate_matrix, valid_rows
+)
+from .registry import ModelRegistry
+from .executor import InferenceExecutor, InferenceOverloaded, InferenceUnavailable
+from .batching import MicroBatcher
+from .cache import PredictionCache
+from .metrics import (
+    HTTP_REQUESTS, HTTP_LATENCY, INFERENCE_STAGE, BATCH_SIZE, MODEL_LOAD_SECONDS,
+    PROCESS_START_TIME, Gauge, render_metrics
+)
+from . import config
+from .logging_config import setup_logging, stop_logging, access_record
+from ..features.feature_store import FeatureStore
+from ..features.store_table import StoreTable
+from ..features.forecast import RecursiveForecast
+from ..features.pipeline import read_manifest as read_table_manifest
+from ..monitoring.performance_monitor import PerformanceMonitor
+from ..monitoring.drift import StoreDriftMonitor
+from ..monitoring.prediction_log import PredictionLog
+from ..monitoring.feedback import ServedPredictions, ActualsIngestor
 
 # LOGGING SETUP
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/api.log'),
-        logging.StreamHandler()
-    ]
+setup_logging(
+    config.LOG_FILE,
+    level=config.LOG_LEVEL,
+    max_bytes=config.LOG_MAX_BYTES,
+    backup_count=config.LOG_BACKUP_COUNT
 )
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("src.api.access")
 
 # APP INITIALIZATION
 app = FastAPI(
@@ -40,29 +71,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# STRUCTURED ACCESS LOG + REQUEST METRICS - one line per request
+class AccessLogMiddleware:
+    """Plain ASGI middleware, timed until the last response byte is sent
+    
+    Unlike @app.middleware("http") it never calls ``receive`` itself, so a
+    streaming route can keep reading its request body after the response
+    has started.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Route template (e.g. /stores/{store_id}) keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUESTS.inc(scope["method"], route, status)
+            HTTP_LATENCY.observe(elapsed, route)
+            
+            path = scope["path"]
+            if status >= 400 or path not in config.LOG_SKIP_PATHS:
+                access_logger.info(access_record(scope["method"], path, status, elapsed * 1000))
+
+app.add_middleware(AccessLogMiddleware)
+
 # LOAD MODEL AT STARTUP
-MODEL = None
-SCALER = None
-
-# THE CORRECT 22 FEATURES (17 from scaler + 5 missing)
-FEATURE_NAMES = [
-    'DayOfWeek', 'Month', 'Quarter', 'IsWeekend', 'Promo', 'SchoolHoliday',
-    'Sales_Lag_1', 'Sales_Lag_7', 'Sales_Lag_14', 'Sales_Lag_30',
-    'Customers_Lag_1', 'Customers_Lag_7', 'Sales_Rolling_Mean_7',
-    'Sales_Rolling_Mean_14', 'Sales_Rolling_Std_7', 'Sales_Rolling_Std_14',
-    'SalesPerCustomer', 'Store', 'Open', 'StoreType', 'Assortment',
-    'CompetitionDistance'
-]
+# Handlers read REGISTRY.active once per request, so a hot reload never mixes versions
+REGISTRY = ModelRegistry(config.MODEL_VERSIONS_DIR, config.ARTIFACT_DIR, backend=config.INFERENCE_BACKEND)
+FEATURE_STORE = None
+STORE_TABLE = None
+INFERENCE = None
+BATCHER = None
+CACHE = None
+MODEL_WATCHER = None
+MONITOR = None
+SERVED = None
+ACTUALS = None
+
+# Field(ge/gt/le) bounds of PredictionInput, for vectorized checks on binary input
+FEATURE_RANGES = FeatureRanges.from_model(PredictionInput)
+BINARY_MEDIA_TYPE = "application/octet-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Sales history used to serve lag/rolling features server-side
+HISTORY_PATH = "Data/train.csv"
+STORE_METADATA_PATH = "Data/store.csv"
+
+def load_model():
+    """Load the model and scaler (CURRENT version, else packaged artifacts, else pickles)"""
+    REGISTRY.swap(REGISTRY.load_bundle())
+
+def on_model_swap(old, new):
+    """Keep everything derived from the active model in step with it"""
+    MODEL_LOAD_SECONDS.set(new.load_seconds)
+    if old is None:
+        return
+    if CACHE is not None:
+        CACHE.clear()
+    if INFERENCE is not None:
+        INFERENCE.reload_processes(new.package_dir)
+
+REGISTRY.on_swap(on_model_swap)
+
+# With a pre-forking server the workers skip reading the artifacts. No model call runs
+# before the fork (OpenMP is not fork-safe); each worker warms the bundle at startup.
+if config.PRELOAD_ARTIFACTS:
+    REGISTRY.swap(REGISTRY.load_bundle(warm=False))
 
 @app.on_event("startup")
 async def startup_event():
     """Load model on application startup"""
-    global MODEL, SCALER
+    global FEATURE_STORE, STORE_TABLE, INFERENCE, BATCHER, CACHE, MODEL_WATCHER, MONITOR, SERVED, ACTUALS
     try:
-        MODEL = joblib.load("models/best_model.pkl")
-        SCALER = joblib.load("models/scaler.pkl")
+        if REGISTRY.active is None:
+            load_model()
+        else:
+            REGISTRY.warm(REGISTRY.active)
+        INFERENCE = InferenceExecutor(
+            threads=config.INFERENCE_THREADS,
+            max_pending=config.INFERENCE_MAX_PENDING,
+            process_workers=config.PROCESS_POOL_WORKERS,
+            process_min_rows=config.PROCESS_POOL_MIN_ROWS,
+            package_dir=REGISTRY.active.package_dir,
+        )
+        if config.PREDICTION_CACHE:
+            CACHE = PredictionCache(
+                max_entries=config.CACHE_MAX_ENTRIES,
+                max_bytes=config.CACHE_MAX_BYTES,
+                ttl_seconds=config.CACHE_TTL_SECONDS,
+            )
+        if config.MICRO_BATCHING:
+            BATCHER = MicroBatcher(
+                partial(run_inference, source="micro_batch"),
+                window_ms=config.MICRO_BATCH_WINDOW_MS,
+                max_rows=config.MICRO_BATCH_MAX_ROWS,
+            )
+            logger.info(f"⚙️  Micro-batching on: {config.MICRO_BATCH_WINDOW_MS} ms / {config.MICRO_BATCH_MAX_ROWS} rows")
+        if config.MODEL_WATCH_INTERVAL > 0:
+            MODEL_WATCHER = asyncio.create_task(REGISTRY.watch(config.MODEL_WATCH_INTERVAL))
+            logger.info(f"👀 Watching {config.MODEL_VERSIONS_DIR}/CURRENT every {config.MODEL_WATCH_INTERVAL}s")
         
-        logger.info("✅ Model and scaler loaded successfully")
+        logger.info(f"✅ Model {REGISTRY.active.version} and scaler loaded successfully")
         logger.info(f"📊 Expected features: {len(FEATURE_NAMES)}")
         logger.info(f"⚠️  NOTE: Using 17 features from scaler + 5 unscaled features")
         
@@ -72,21 +197,98 @@ async def startup_event():
     except Exception as e:
         logger.error(f"❌ Error loading model: {e}")
         raise
+    
+    try:
+        STORE_TABLE = StoreTable.from_csv(STORE_METADATA_PATH)
+        logger.info(f"✅ Store metadata loaded from {STORE_METADATA_PATH}")
+    except FileNotFoundError:
+        logger.warning(f"⚠️  Store metadata not found at {STORE_METADATA_PATH} - /predict_store disabled")
+    
+    try:
+        if read_table_manifest(config.FEATURE_TABLE_DIR) is not None:
+            FEATURE_STORE = FeatureStore.from_table(config.FEATURE_TABLE_DIR)
+            logger.info(f"✅ Feature store loaded from {config.FEATURE_TABLE_DIR}")
+        else:
+            FEATURE_STORE = FeatureStore.from_csv(HISTORY_PATH)
+            logger.info(f"✅ Feature store loaded from {HISTORY_PATH}")
+    except FileNotFoundError:
+        logger.warning(f"⚠️  Sales history not found at {HISTORY_PATH} - /predict_store disabled")
+    
+    # Served /predict_store predictions are joined with actuals posted to /monitor/actuals.
+    # Per-store drift baselines are learned from each store's first matched actuals; the
+    # overall baseline is the served version's store-day holdout score when it has one,
+    # otherwise it is learned from the first matched actuals too.
+    drift = StoreDriftMonitor.from_store_table(STORE_TABLE) if STORE_TABLE is not None else StoreDriftMonitor()
+    prediction_log = PredictionLog(config.PREDICTION_LOG_DIR) if config.PREDICTION_LOG_DIR else None
+    holdout = holdout_metrics(REGISTRY.active, "store-day")
+    baselines = ({"baseline_rmse": holdout["rmse"], "baseline_mape": holdout["mape"]}
+                 if holdout.get("rmse") and holdout.get("mape") else {})
+    MONITOR = PerformanceMonitor(capacity=config.MONITOR_CAPACITY, drift=drift, prediction_log=prediction_log,
+                                 **baselines)
+    SERVED = ServedPredictions(drift.n_stores, config.MONITOR_RETENTION_DAYS)
+    ACTUALS = ActualsIngestor(MONITOR, SERVED)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("🛑 API shutting down...")
+    if MODEL_WATCHER is not None:
+        MODEL_WATCHER.cancel()
+    if INFERENCE is not None:
+        INFERENCE.shutdown()
+    if ACTUALS is not None:
+        ACTUALS.shutdown()
+    if MONITOR is not None and MONITOR.prediction_log is not None:
+        MONITOR.prediction_log.close()
+    stop_logging()
+
+# INFERENCE WORKER POOL
+def current_bundle():
+    """The active model bundle; read it once per request and pass it along"""
+    bundle = REGISTRY.active
+    if bundle is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    return bundle
+
+async def run_inference(features_final, bundle, source="single"):
+    """Score a raw (N, 22) matrix on the worker pool, mapping backpressure to HTTP errors"""
+    BATCH_SIZE.observe(len(features_final), source)
+    try:
+        return await INFERENCE.predict(bundle.pipeline, features_final, bundle.package_dir)
+    except InferenceOverloaded as e:
+        logger.warning(f"⚠️ Inference queue full: {e}")
+        raise HTTPException(status_code=429, detail="Too many requests in flight, retry shortly",
+                            headers={"Retry-After": "1"})
+    except InferenceUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+async def predict_one(features_final, bundle):
+    """Score a single (1, 22) row via the cache, then the micro-batcher when enabled"""
+    key = None
+    if CACHE is not None:
+        key = CACHE.key(features_final, bundle.version)
+        cached = CACHE.get(key)
+        if cached is not None:
+            return cached
+    
+    if BATCHER is not None:
+        prediction = await BATCHER.submit(features_final, bundle)
+    else:
+        prediction = float((await run_inference(features_final, bundle))[0])
+    
+    # A reload may have cleared the cache while this request was in flight
+    if key is not None and bundle is REGISTRY.active:
+        CACHE.put(key, prediction)
+    return prediction
 
 # HEALTH CHECK ENDPOINT
 @app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """Check API health and model status"""
-    logger.info("📡 Health check requested")
     return {
         "status": "✅ Healthy",
         "timestamp": datetime.now().isoformat(),
-        "model_loaded": MODEL is not None,
+        "model_loaded": REGISTRY.active is not None,
         "api_version": "1.0.0"
     }
 
@@ -99,118 +301,194 @@ async def predict_sales(request: PredictionInput):
     Requires 22 features (17 scaled + 5 unscaled store features)
     """
     try:
-        if MODEL is None:
-            raise HTTPException(status_code=503, detail="Model not loaded")
-        
-        # First 17 features (to be scaled)
-        features_to_scale = np.array([[
-            request.DayOfWeek,
-            request.Month,
-            request.Quarter,
-            request.IsWeekend,
-            request.Promo,
-            request.SchoolHoliday,
-            request.Sales_Lag_1,
-            request.Sales_Lag_7,
-            request.Sales_Lag_14,
-            request.Sales_Lag_30,
-            request.Customers_Lag_1,
-            request.Customers_Lag_7,
-            request.Sales_Rolling_Mean_7,
-            request.Sales_Rolling_Mean_14,
-            request.Sales_Rolling_Std_7,
-            request.Sales_Rolling_Std_14,
-            request.SalesPerCustomer
-        ]])
-        
-        # Last 5 features (store-related, NOT scaled)
-        features_not_scaled = np.array([[
-            request.Store,
-            request.Open,
-            request.StoreType,
-            request.Assortment,
-            request.CompetitionDistance
-        ]])
-        
-        logger.info(f"📊 Features to scale: {features_to_scale.shape}")
-        logger.info(f"📊 Features NOT scaled: {features_not_scaled.shape}")
+        bundle = current_bundle()
         
-        # Scale the first 17 features
-        features_scaled = SCALER.transform(features_to_scale)
+        # All 22 features in FEATURE_NAMES order; scaling happens on the worker pool
+        with INFERENCE_STAGE.time("concatenation"):
+            features_final = build_feature_matrix([request])
         
-        # Combine scaled + unscaled features
-        features_final = np.concatenate([features_scaled, features_not_scaled], axis=1)
-        
-        logger.info(f"📊 Final feature shape: {features_final.shape}")
-        logger.info(f"📊 Final features (first 5): {features_final[0][:5]}")
+        # Sampled feature dumps - the level check keeps this free when DEBUG is off
+        if (config.LOG_FEATURE_SAMPLE_RATE and logger.isEnabledFor(logging.DEBUG)
+                and random.random() < config.LOG_FEATURE_SAMPLE_RATE):
+            logger.debug(f"📊 Raw features: {dict(zip(FEATURE_NAMES, features_final[0].tolist()))}")
         
         # Make prediction
-        prediction_array = MODEL.predict(features_final)
-        prediction_value = float(prediction_array[0])/1000
+        prediction_value = await predict_one(features_final, bundle)/1000
         confidence_value = 0.95
         
-        logger.info(f"✅ Raw prediction: {prediction_value}")
-        logger.info(f"✅ Formatted prediction: €{prediction_value:,.2f}")
-        
-        # Create response
-        response = {
+        return {
             "prediction": prediction_value,
             "confidence": confidence_value,
             "prediction_timestamp": datetime.now().isoformat(),
-            "model_version": "1.0.0"
+            "model_version": bundle.version
         }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Prediction error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+# STORE/DATE PREDICTION ENDPOINT
+@app.post("/predict_store", response_model=PredictionOutput)
+async def predict_store_sales(request: StorePredictionInput):
+    """
+    Make a single sales prediction from Store and Date
+    
+    Lag, rolling and store metadata features are looked up server-side.
+    They describe the store's latest recorded day, so Date must be the day
+    after it (see GET /stores/{store_id}); other dates return 422. Use
+    /forecast for dates further ahead.
+    """
+    try:
+        bundle = current_bundle()
+        if FEATURE_STORE is None or STORE_TABLE is None:
+            raise HTTPException(status_code=503, detail="Feature store not loaded")
+        with INFERENCE_STAGE.time("validation"):
+            store_known = STORE_TABLE.is_known(request.Store)
+            history_ready = store_known and FEATURE_STORE.has_history(request.Store)
+        if not store_known:
+            raise HTTPException(status_code=404, detail=f"Unknown store {request.Store}")
+        if not history_ready:
+            raise HTTPException(status_code=404, detail=f"No sales history for store {request.Store}")
+        next_date = FEATURE_STORE.next_date(request.Store)
+        if np.datetime64(request.Date, 'D') != next_date:
+            raise HTTPException(status_code=422, detail=f"Store {request.Store} history ends on {next_date - 1}; "
+                                                        f"Date must be {next_date} (use /forecast for later dates)")
+        
+        with INFERENCE_STAGE.time("concatenation"):
+            features_final = np.empty((1, N_FEATURES), dtype=np.float32)
+            features_final[:, :N_SCALED] = FEATURE_STORE.build_features(
+                request.Store, request.Date, request.Promo, request.SchoolHoliday
+            )
+            features_final[:, N_SCALED:] = STORE_TABLE.unscaled_block(request.Store, request.Open)
         
-        logger.info(f"📤 Final response: {response}")
+        # Actuals arrive in raw Sales units, so the raw model output is what gets joined
+        raw_prediction = await predict_one(features_final, bundle)
+        if SERVED is not None:
+            SERVED.record(request.Store, request.Date, raw_prediction, bundle.version)
         
-        return response
+        return {
+            "prediction": raw_prediction/1000,
+            "confidence": 0.95,
+            "prediction_timestamp": datetime.now().isoformat(),
+            "model_version": bundle.version
+        }
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Prediction error: {str(e)}", exc_info=True)
+        logger.error(f"❌ Store prediction error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+# STORE METADATA ENDPOINT
+@app.get("/stores/{store_id}", response_model=StoreInfoResponse)
+async def get_store_info(store_id: int):
+    """Get static metadata for one store"""
+    if STORE_TABLE is None:
+        raise HTTPException(status_code=503, detail="Store metadata not loaded")
+    if not STORE_TABLE.is_known(store_id):
+        raise HTTPException(status_code=404, detail=f"Unknown store {store_id}")
+    record = STORE_TABLE.as_dict(store_id)
+    if FEATURE_STORE is not None and FEATURE_STORE.has_history(store_id):
+        record["NextDate"] = str(FEATURE_STORE.next_date(store_id))
+    return record
+
+# MULTI-HORIZON FORECAST ENDPOINT
+@app.post("/forecast")
+async def forecast_sales(request: ForecastRequest):
+    """
+    Forecast several days ahead for many stores in one request
+    
+    All stores step forward together: each day's predictions are fed back
+    into the lag and rolling-window features of the next day, so a horizon
+    of H days costs H model calls whatever the number of stores.
+    
+    Forecasts roll out from the day after the latest history; stores whose
+    history ends earlier are skipped. start_date may not be before that
+    day (422). A later start_date forecasts the days in between too, which
+    count against FORECAST_MAX_HORIZON but are not returned.
+    """
+    try:
+        bundle = current_bundle()
+        if FEATURE_STORE is None or STORE_TABLE is None:
+            raise HTTPException(status_code=503, detail="Feature store not loaded")
+        if request.horizon > config.FORECAST_MAX_HORIZON:
+            raise HTTPException(status_code=422, detail=f"horizon must be at most {config.FORECAST_MAX_HORIZON} days")
+        
+        with INFERENCE_STAGE.time("validation"):
+            if request.Stores is None:
+                requested = np.flatnonzero(FEATURE_STORE.ready)
+            else:
+                requested = np.asarray(request.Stores, dtype=np.int64)
+            usable = np.array([STORE_TABLE.is_known(s) and FEATURE_STORE.has_history(s) for s in requested.tolist()],
+                              dtype=bool)
+            store_ids = requested[usable]
+        if len(store_ids) == 0:
+            raise HTTPException(status_code=404, detail="No requested store has sales history")
+        
+        # Stores share one rollout, so only those whose history ends on the latest day can join it
+        next_dates = FEATURE_STORE.next_date(store_ids)
+        origin = next_dates.max()
+        skipped = requested[~usable].tolist() + store_ids[next_dates != origin].tolist()
+        store_ids = store_ids[next_dates == origin]
+        start_date = np.datetime64(request.start_date or origin, 'D')
+        if start_date < origin:
+            raise HTTPException(status_code=422, detail=f"start_date must be on or after {origin}, "
+                                                        f"the day after the latest history")
+        gap = int((start_date - origin).astype(np.int64))
+        if gap + request.horizon > config.FORECAST_MAX_HORIZON:
+            raise HTTPException(status_code=422, detail=f"start_date is {gap} days after {origin}; gap plus "
+                                                        f"horizon must be at most {config.FORECAST_MAX_HORIZON} days")
+        forecast = RecursiveForecast(
+            FEATURE_STORE, STORE_TABLE, store_ids, start_date, request.horizon,
+            promo=request.Promo, school_holiday=request.SchoolHoliday, open_flags=request.Open
+        )
+        for step in range(forecast.steps):
+            predictions = None
+            if forecast.any_open(step):
+                with INFERENCE_STAGE.time("concatenation"):
+                    features_final = forecast.features(step)
+                predictions = await run_inference(features_final, bundle, source="forecast")
+            forecast.advance(step, predictions)
+        
+        return {
+            "stores": store_ids.tolist(),
+            "dates": [str(d) for d in forecast.dates],
+            "gap_days": forecast.gap,
+            "forecast": (forecast.forecast / 1000).tolist(),
+            "skipped": skipped,
+            "prediction_timestamp": datetime.now().isoformat(),
+            "model_version": bundle.version
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Forecast error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Forecast failed: {str(e)}")
+
 # BATCH PREDICTION ENDPOINT
 @app.post("/predict_batch")
 async def predict_batch(request: BatchPredictionRequest):
     """Make batch predictions for multiple records"""
     try:
-        if MODEL is None:
-            raise HTTPException(status_code=503, detail="Model not loaded")
+        bundle = current_bundle()
         
-        predictions = []
-        errors = []
+        # All rows in one (N, 22) float32 matrix -> one scaler call, one model call
+        with INFERENCE_STAGE.time("concatenation"):
+            features_final = build_feature_matrix(request.data)
         
-        for idx, item in enumerate(request.data):
-            try:
-                # First 17 features (scaled)
-                features_to_scale = np.array([[
-                    item.DayOfWeek, item.Month, item.Quarter, item.IsWeekend,
-                    item.Promo, item.SchoolHoliday, item.Sales_Lag_1,
-                    item.Sales_Lag_7, item.Sales_Lag_14, item.Sales_Lag_30,
-                    item.Customers_Lag_1, item.Customers_Lag_7,
-                    item.Sales_Rolling_Mean_7, item.Sales_Rolling_Mean_14,
-                    item.Sales_Rolling_Std_7, item.Sales_Rolling_Std_14,
-                    item.SalesPerCustomer
-                ]])
-                
-                # Last 5 features (not scaled)
-                features_not_scaled = np.array([[
-                    item.Store, item.Open, item.StoreType,
-                    item.Assortment, item.CompetitionDistance
-                ]])
-                
-                features_scaled = SCALER.transform(features_to_scale)
-                features_final = np.concatenate([features_scaled, features_not_scaled], axis=1)
-                
-                pred = float(MODEL.predict(features_final)[0])
-                predictions.append(pred)
-            
-            except Exception as e:
-                logger.warning(f"⚠️ Error predicting item {idx}: {str(e)}")
-                errors.append({"index": idx, "error": str(e)})
+        with INFERENCE_STAGE.time("validation"):
+            valid_mask, invalid_rows = validate_matrix(features_final)
+        errors = [{"index": idx, "error": message} for idx, message in invalid_rows]
+        if errors:
+            logger.warning(f"⚠️ {len(errors)} batch items failed validation (first: item {errors[0]['index']})")
+        
+        if errors:
+            features_final = features_final[valid_mask]
         
-        logger.info(f"✅ Batch predictions completed: {len(predictions)} successful, {len(errors)} errors")
+        predictions = (await run_inference(features_final, bundle, source="predict_batch")).astype(float).tolist()
         
         return {
             "batch_size": len(request.data),
@@ -219,7 +497,7 @@ async def predict_batch(request: BatchPredictionRequest):
             "predictions": predictions,
             "errors": errors,
             "timestamp": datetime.now().isoformat(),
-            "model_version": "1.0.0"
+            "model_version": bundle.version
         }
     
     except HTTPException:
@@ -228,22 +506,314 @@ async def predict_batch(request: BatchPredictionRequest):
         logger.error(f"❌ Batch prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# STREAMING (NDJSON) BATCH PREDICTION ENDPOINT
+class BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse for generators that are still reading the request body
+    
+    StreamingResponse listens for a client disconnect on ``receive`` while it
+    streams, which would take the body messages away from request.stream().
+    Here only the generator reads ``receive``; a client that disconnects
+    mid-upload ends the stream through ClientDisconnect instead.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+async def iter_ndjson_lines(body_stream):
+    """Yield complete lines from a streamed request body without buffering all of it"""
+    buffer = b""
+    async for piece in body_stream:
+        buffer += piece
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+async def score_stream_chunk(items, indices, bundle):
+    """Score one chunk of validated rows and return its NDJSON output lines"""
+    features_final = build_feature_matrix(items)
+    valid_mask, invalid_rows = validate_matrix(features_final)
+    lines = [json.dumps({"index": indices[pos], "error": message}) for pos, message in invalid_rows]
+    
+    valid_indices = [idx for idx, ok in zip(indices, valid_mask) if ok]
+    if valid_indices:
+        try:
+            predictions = await run_inference(features_final[valid_mask], bundle, source="predict_batch")
+        except HTTPException as e:
+            # Headers are already sent, so failures are reported per row
+            return lines + [json.dumps({"index": idx, "error": e.detail}) for idx in valid_indices]
+        lines += [
+            json.dumps({"index": idx, "prediction": float(pred)})
+            for idx, pred in zip(valid_indices, predictions)
+        ]
+    return lines
+
+async def stream_predictions(body_stream, chunk_rows, bundle):
+    """Parse NDJSON rows incrementally and emit results chunk by chunk"""
+    items, indices = [], []
+    index = 0
+    try:
+        async for line in iter_ndjson_lines(body_stream):
+            if not line.strip():
+                continue
+            try:
+                items.append(PredictionInput.model_validate_json(line))
+                indices.append(index)
+            except ValidationError as e:
+                first = e.errors()[0]
+                location = ".".join(str(part) for part in first["loc"])
+                yield json.dumps({"index": index, "error": f"{location}: {first['msg']}"}) + "\n"
+            index += 1
+            
+            if len(items) >= chunk_rows:
+                yield "\n".join(await score_stream_chunk(items, indices, bundle)) + "\n"
+                items, indices = [], []
+    except ClientDisconnect:
+        logger.warning(f"⚠️ Client disconnected after {index} streamed rows")
+        return
+    
+    if items:
+        yield "\n".join(await score_stream_chunk(items, indices, bundle)) + "\n"
+
+@app.post("/predict_batch/stream")
+async def predict_batch_stream(request: Request):
+    """
+    Make batch predictions from an NDJSON stream
+    
+    Request body: one PredictionInput JSON object per line. Response: one
+    line per input row, {"index": i, "prediction": p} or {"index": i, "error": msg},
+    written as each chunk of STREAM_CHUNK_ROWS rows is scored. Rows that fail
+    parsing are reported immediately, so lines are not strictly in index
+    order. Memory stays bounded by the chunk size regardless of batch size.
+    The whole stream is scored by the model version in X-Model-Version.
+    """
+    bundle = current_bundle()
+    return BodyStreamingResponse(
+        stream_predictions(request.stream(), config.STREAM_CHUNK_ROWS, bundle),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Model-Version": bundle.version}
+    )
+
+# BINARY BATCH PREDICTION ENDPOINT
+@app.post("/predict_batch/binary")
+async def predict_batch_binary(request: Request):
+    """
+    Make batch predictions from a packed float32 matrix
+    
+    Request body: N rows x 22 little-endian float32 values in FEATURE_NAMES
+    order (no header). Response body: N little-endian float32 predictions;
+    rows that fail the PredictionInput range checks come back as NaN.
+    """
+    try:
+        bundle = current_bundle()
+        
+        body = await request.body()
+        row_bytes = N_FEATURES * 4
+        if len(body) % row_bytes:
+            raise HTTPException(status_code=400, detail=f"Body must be a multiple of {row_bytes} bytes (22 float32 per row)")
+        n_rows = len(body) // row_bytes
+        if n_rows > config.BINARY_BATCH_MAX_ROWS:
+            raise HTTPException(status_code=413, detail=f"At most {config.BINARY_BATCH_MAX_ROWS} rows per request")
+        
+        # Zero-copy, read-only view of the request body
+        features = np.frombuffer(body, dtype='<f4').reshape(n_rows, N_FEATURES)
+        
+        with INFERENCE_STAGE.time("validation"):
+            valid_mask = valid_rows(features, FEATURE_RANGES)
+        n_failed = int(n_rows - np.count_nonzero(valid_mask))
+        
+        predictions = np.full(n_rows, np.nan, dtype='<f4')
+        if n_failed < n_rows:
+            # The boolean gather copies the rows, so in-place scaling never writes to the body
+            predictions[valid_mask] = await run_inference(features[valid_mask], bundle, source="predict_batch")
+        
+        return Response(
+            content=predictions.tobytes(),
+            media_type=BINARY_MEDIA_TYPE,
+            headers={
+                "X-Batch-Size": str(n_rows),
+                "X-Failed-Rows": str(n_failed),
+                "X-Model-Version": bundle.version
+            }
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Binary batch prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# RUNTIME STATS ENDPOINT
+@app.get("/stats")
+async def get_runtime_stats():
+    """Get inference pool, micro-batching and prediction cache statistics"""
+    return {
+        "uptime_seconds": time.time() - PROCESS_START_TIME,
+        "inference_pending": INFERENCE.pending if INFERENCE is not None else 0,
+        "micro_batching": BATCHER.stats() if BATCHER is not None else {"enabled": False},
+        "prediction_cache": CACHE.stats() if CACHE is not None else {"enabled": False}
+    }
+
+# PROMETHEUS METRICS ENDPOINT
+Gauge("inference_pending_jobs", "Inference jobs queued or running",
+      callback=lambda: INFERENCE.pending if INFERENCE is not None else 0)
+Gauge("micro_batch_queue_wait_seconds_total", "Total time rows waited in the micro-batch queue",
+      callback=lambda: BATCHER.queue_wait_total if BATCHER is not None else 0, kind="counter")
+for _counter in ("hits", "misses", "evictions", "expirations", "invalidations"):
+    Gauge(f"prediction_cache_{_counter}_total", f"Prediction cache {_counter}",
+          callback=lambda name=_counter: getattr(CACHE, name) if CACHE is not None else 0, kind="counter")
+Gauge("prediction_cache_bytes", "Estimated prediction cache size in bytes",
+      callback=lambda: CACHE.bytes if CACHE is not None else 0)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition of request, inference and cache metrics"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # MODEL METADATA ENDPOINT
+def holdout_metrics(bundle, level="chain daily"):
+    """The bundle's own holdout metrics from its manifest evaluation (see src/train.py), or {}"""
+    for row in bundle.manifest.get("evaluation", []):
+        if row.get("Model") == f"{bundle.version} ({level})":
+            return {name.lower(): row.get(name) for name in ("RMSE", "MAE", "MAPE", "R2")}
+    return {}
+
 @app.get("/model/info", response_model=ModelInfoResponse)
 async def get_model_info():
-    """Get model metadata and performance statistics"""
+    """Get model metadata and the holdout performance recorded when the version was trained"""
+    bundle = current_bundle()
     return {
         "model_name": "XGBoost Forecaster",
-        "version": "1.0.0",
+        "version": bundle.version,
         "status": "Production",
-        "performance_metrics": {
-            "rmse": 147015.0,
-            "mae": 72390.0,
-            "mape": 1.65,
-            "r2": 0.9979
-        },
+        "performance_metrics": holdout_metrics(bundle),
         "features_count": 22,
-        "last_updated": "2025-11-16T22:00:00"
+        "last_updated": bundle.last_updated
+    }
+
+# FEATURE STORE INGESTION
+@app.post("/features/daily")
+async def ingest_daily_history(request: DailyHistory):
+    """
+    Append one day of observed Sales and Customers to the served feature store
+    
+    Only stores whose NextDate is Date advance; the rest (already ingested,
+    a gap in their history, or unknown) are returned as skipped. After a
+    store advances, /predict_store and /forecast serve the following day.
+    """
+    if FEATURE_STORE is None:
+        raise HTTPException(status_code=503, detail="Feature store not loaded")
+    day = np.datetime64(request.Date, 'D')
+    store_ids = np.asarray(request.Store, dtype=np.int64)
+    due = (store_ids > 0) & (store_ids <= FEATURE_STORE.n_stores)
+    due[due] = FEATURE_STORE.next_date(store_ids[due]) == day
+    if due.any():
+        # No await in between: requests never see a half-appended day
+        FEATURE_STORE.append_day(
+            store_ids[due],
+            np.asarray(request.Sales, dtype=np.float64)[due],
+            np.asarray(request.Customers, dtype=np.float64)[due],
+            day,
+        )
+    return {
+        "date": str(day),
+        "appended": store_ids[due].tolist(),
+        "skipped": store_ids[~due].tolist(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# MONITORING ENDPOINTS
+@app.post("/monitor/actuals", status_code=202,
+          openapi_extra={"requestBody": {"required": True, "content": {
+              "application/json": {"schema": ActualsBatch.model_json_schema()}}}})
+async def ingest_actuals(request: Request):
+    """
+    Submit observed sales for previously served predictions
+    
+    Request body: an ActualsBatch. Rows are joined with the /predict_store
+    predictions the active model version served for the same (Store, Date)
+    within the last MONITOR_RETENTION_DAYS days and logged to the performance
+    monitor in one operation. Predictions from other versions are not matched.
+    The join runs after the response is sent; GET /monitor/report shows how
+    many rows matched.
+    """
+    if ACTUALS is None:
+        raise HTTPException(status_code=503, detail="Monitoring not initialized")
+    body = await request.body()
+    # Validating up to ACTUALS_MAX_ROWS rows takes long enough to stall other requests
+    try:
+        batch = await asyncio.to_thread(ActualsBatch.model_validate_json, body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    n_rows = len(batch.Store)
+    if n_rows > config.ACTUALS_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {config.ACTUALS_MAX_ROWS} rows per request")
+    ACTUALS.submit(batch.Store, batch.Date, batch.Sales, current_bundle().version)
+    return {
+        "accepted": n_rows,
+        "pending_batches": ACTUALS.submitted - ACTUALS.completed,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/monitor/report")
+async def get_monitor_report():
+    """Get live model performance from ingested actuals, with per-store drift"""
+    if MONITOR is None:
+        raise HTTPException(status_code=503, detail="Monitoring not initialized")
+    # Run on the ingestion thread: off the event loop and never mid-update
+    report = await asyncio.wrap_future(ACTUALS.call(MONITOR.generate_report))
+    status = await asyncio.wrap_future(ACTUALS.call(MONITOR.check_model_performance))
+    return {
+        "report": report,
+        "status": status,
+        "ingestion": ACTUALS.stats()
+    }
+
+# MODEL ADMIN ENDPOINTS
+def check_admin_token(token):
+    if config.ADMIN_TOKEN is not None and token != config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/admin/reload", response_model=ReloadResponse)
+async def reload_model(request: Optional[ReloadRequest] = None,
+                       x_admin_token: Optional[str] = Header(None)):
+    """
+    Load a model version in the background and swap it in atomically
+    
+    Requests keep being served by the current model while the new one loads
+    and warms up; if loading fails the current model stays active.
+    """
+    check_admin_token(x_admin_token)
+    version = request.version if request is not None else None
+    try:
+        old, bundle = await REGISTRY.reload(version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Model reload failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
+    
+    return {
+        "previous_version": old.version if old is not None else None,
+        "version": bundle.version,
+        "load_seconds": bundle.load_seconds,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/admin/models")
+async def list_models(x_admin_token: Optional[str] = Header(None)):
+    """Get the active model version and the versions available to reload"""
+    check_admin_token(x_admin_token)
+    bundle = REGISTRY.active
+    return {
+        "active": bundle.version if bundle is not None else None,
+        "backend": bundle.backend if bundle is not None else None,
+        "active_manifest": bundle.manifest if bundle is not None else None,
+        "current_file": REGISTRY.current_version(),
+        "available": REGISTRY.available_versions()
     }
 
 # FEATURES ENDPOINT
@@ -269,9 +839,20 @@ def root():
         "endpoints": {
             "/health": "GET - Health check",
             "/predict": "POST - Single prediction",
+            "/predict_store": "POST - Single prediction from Store and Date",
             "/predict_batch": "POST - Batch predictions",
+            "/predict_batch/binary": "POST - Batch predictions from packed float32 (N, 22) rows",
+            "/predict_batch/stream": "POST - Streaming NDJSON batch predictions",
+            "/forecast": "POST - Multi-day forecast for many stores",
+            "/stores/{store_id}": "GET - Store metadata",
+            "/monitor/actuals": "POST - Submit actual sales for served predictions",
+            "/monitor/report": "GET - Live performance and per-store drift",
+            "/stats": "GET - Inference pool, micro-batching and cache statistics",
+            "/metrics": "GET - Prometheus metrics",
             "/model/info": "GET - Model information",
             "/model/features": "GET - Feature list",
+            "/admin/reload": "POST - Hot-reload a model version",
+            "/admin/models": "GET - Active and available model versions",
             "/docs": "GET - Swagger UI documentation",
             "/redoc": "GET - ReDoc documentation"
         },
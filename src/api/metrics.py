@@ -0,0 +1,152 @@
+"""Minimal Prometheus-style metrics (counters, gauges, histograms) rendered as text exposition format"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 5000, 10000, 50000, 100000)
+
+PROCESS_START_TIME = time.time()
+
+_REGISTRY = []
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {value}" for labels, value in items]
+
+
+class Gauge(_Metric):
+    """Value that is either set directly or read from ``callback`` at scrape time
+
+    ``kind="counter"`` exposes a callback over an existing monotonic counter
+    (e.g. cache hits) without double bookkeeping.
+    """
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback=None, kind="gauge"):
+        super().__init__(name, documentation)
+        self.value = 0.0
+        self.callback = callback
+        self.kind = kind
+
+    def set(self, value):
+        self.value = value
+
+    def _samples(self):
+        value = self.callback() if self.callback is not None else self.value
+        return [f"{self.name} {value}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._counts = {}
+        self._sums = {}
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _samples(self):
+        with self._lock:
+            series = [(labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items()]
+        lines = []
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, ("le", bound))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {total}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+def render_metrics():
+    """All registered metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# API METRICS
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by method, route and status",
+    ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    LATENCY_BUCKETS, ("route",)
+)
+INFERENCE_STAGE = Histogram(
+    "inference_stage_seconds", "Time spent per inference stage (validation, concatenation, scaling, predict)",
+    STAGE_BUCKETS, ("stage",)
+)
+BATCH_SIZE = Histogram(
+    "prediction_batch_rows", "Rows per model call by source (predict_batch, micro_batch, forecast, single)",
+    BATCH_SIZE_BUCKETS, ("source",)
+)
+MODEL_LOAD_SECONDS = Gauge("model_load_seconds", "Time taken to load the model and scaler at startup")
+UPTIME_SECONDS = Gauge("process_uptime_seconds", "Seconds since the API process started",
+                       callback=lambda: time.time() - PROCESS_START_TIME)
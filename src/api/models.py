@@ -1,7 +1,8 @@
 """Pydantic models for API requests and responses - 22 FEATURES"""
 
-from pydantic import BaseModel, Field
-from typing import List, Dict
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Dict, Optional
+from datetime import date
 
 class PredictionInput(BaseModel):
     """Single prediction request schema - 22 features to match model"""
@@ -69,6 +70,40 @@ class PredictionInput(BaseModel):
             }
         }
 
+class StorePredictionInput(BaseModel):
+    """Store/date prediction request - all other features are filled in server-side"""
+    
+    Store: int = Field(..., ge=1, description="Store ID")
+    Date: date = Field(..., description="Date to predict (YYYY-MM-DD), the day after the store's latest history")
+    Promo: float = Field(..., ge=0, le=1, description="Promotion active (0/1)")
+    SchoolHoliday: int = Field(..., ge=0, le=1, description="School holiday (0/1)")
+    Open: int = Field(1, ge=0, le=1, description="Store is open (0/1)")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "Store": 1,
+                "Date": "2015-08-01",
+                "Promo": 1.0,
+                "SchoolHoliday": 0,
+                "Open": 1
+            }
+        }
+
+class StoreInfoResponse(BaseModel):
+    """Static store metadata from store.csv (categoricals encoded as the model expects)"""
+    Store: int
+    StoreType: int
+    Assortment: int
+    CompetitionDistance: float
+    CompetitionOpenSinceMonth: int
+    CompetitionOpenSinceYear: int
+    Promo2: int
+    Promo2SinceWeek: int
+    Promo2SinceYear: int
+    PromoInterval: int
+    NextDate: Optional[date] = Field(None, description="The Date /predict_store accepts for this store")
+
 class PredictionOutput(BaseModel):
     """Prediction response schema"""
     prediction: float = Field(..., description="Predicted sales value")
@@ -102,6 +137,64 @@ class ModelInfoResponse(BaseModel):
     model_name: str
     version: str
     status: str
-    performance_metrics: Dict[str, float]
+    performance_metrics: Dict[str, Optional[float]] = Field(
+        ..., description="Chain daily holdout metrics from the version's manifest (empty if it has none)"
+    )
     features_count: int
-    last_updated: str
\ No newline at end of file
+    last_updated: str
+
+
+class ReloadRequest(BaseModel):
+    """Model reload request"""
+    version: Optional[str] = Field(None, description="Version directory to load (default: the one named in CURRENT)")
+
+class ReloadResponse(BaseModel):
+    """Model reload response"""
+    previous_version: Optional[str]
+    version: str
+    load_seconds: float
+    timestamp: str
+
+class ActualsBatch(BaseModel):
+    """Observed sales for served predictions, as parallel arrays"""
+    Store: List[int] = Field(..., description="Store IDs")
+    Date: List[date] = Field(..., description="Dates the predictions were made for")
+    Sales: List[float] = Field(..., description="Actual sales")
+
+    @model_validator(mode='after')
+    def check_lengths(self):
+        if not len(self.Store) == len(self.Date) == len(self.Sales):
+            raise ValueError("Store, Date and Sales must have the same length")
+        return self
+
+class DailyHistory(BaseModel):
+    """One observed day of Sales and Customers per store, as parallel arrays"""
+    Date: date = Field(..., description="Day the observations are for")
+    Store: List[int] = Field(..., description="Store IDs")
+    Sales: List[float] = Field(..., description="Observed sales")
+    Customers: List[float] = Field(..., description="Observed customers")
+
+    @model_validator(mode='after')
+    def check_lengths(self):
+        if not len(self.Store) == len(self.Sales) == len(self.Customers):
+            raise ValueError("Store, Sales and Customers must have the same length")
+        if len(set(self.Store)) != len(self.Store):
+            raise ValueError("Each store may appear only once per day")
+        return self
+
+class ForecastRequest(BaseModel):
+    """Multi-day forecast for a set of stores"""
+    Stores: Optional[List[int]] = Field(None, description="Store IDs (default: every store with full history)")
+    horizon: int = Field(42, ge=1, description="Days to forecast")
+    start_date: Optional[date] = Field(None, description="First forecast day (default: day after the latest history)")
+    Promo: Optional[List[float]] = Field(None, description="Promo flag per forecast day, shared by all stores (default 0)")
+    SchoolHoliday: Optional[List[int]] = Field(None, description="School holiday flag per forecast day (default 0)")
+    Open: Optional[List[int]] = Field(None, description="Open flag per forecast day (default 1)")
+
+    @model_validator(mode='after')
+    def check_lengths(self):
+        for name in ("Promo", "SchoolHoliday", "Open"):
+            values = getattr(self, name)
+            if values is not None and len(values) != self.horizon:
+                raise ValueError(f"{name} must have one value per forecast day ({self.horizon})")
+        return self
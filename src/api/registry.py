@@ -0,0 +1,191 @@
+"""Versioned model bundles with background loading, warm-up and atomic swap
+
+Layout:
+    models/versions/<version>/   packaged artifacts (see src/api/artifacts.py)
+    models/versions/CURRENT      name of the version to serve
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from .artifacts import (
+    MANIFEST_FILE, PACKAGE_DIR, is_packaged, load_packaged, load_serving_artifacts, probe_matrix
+)
+from .inference import InferencePipeline, scale_in_place
+from .tree_engine import compile_model
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = "models/versions"
+CURRENT_FILE = "CURRENT"
+
+
+class ModelBundle:
+    """A (model, scaler, version) triple that is always served together
+
+    Request handlers read the registry's active bundle once and use only that
+    object, so a swap never mixes the scaler of one version with the model
+    of another.
+    """
+
+    def __init__(self, model, scaler, version, package_dir=None, manifest=None, load_seconds=0.0,
+                 backend="xgboost"):
+        self.model = model
+        self.scaler = scaler
+        self.version = version
+        self.backend = backend
+        self.pipeline = InferencePipeline(model, scaler)
+        self.package_dir = package_dir
+        self.manifest = manifest or {}
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.now().isoformat()
+        self.warmed = False
+
+    @property
+    def last_updated(self):
+        return self.manifest.get("exported_at", self.loaded_at)
+
+
+def read_manifest(package_dir):
+    with open(os.path.join(package_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def activate_version(versions_dir, version):
+    """Point CURRENT at a version; the rename is atomic so watchers never see a partial file"""
+    path = os.path.join(versions_dir, CURRENT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(version + "\n")
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """Holds the active ModelBundle and replaces it without interrupting requests"""
+
+    def __init__(self, versions_dir=VERSIONS_DIR, fallback_dir=PACKAGE_DIR, default_version="1.0.0",
+                 backend="xgboost"):
+        self.versions_dir = versions_dir
+        self.fallback_dir = fallback_dir
+        self.default_version = default_version
+        self.backend = backend
+        self.active = None
+        self._on_swap = []
+        self._reload_lock = asyncio.Lock()
+        self._current_mtime = self._current_file_mtime()
+
+    def on_swap(self, callback):
+        """Register callback(old_bundle, new_bundle), run right after each swap"""
+        self._on_swap.append(callback)
+
+    def _current_file_mtime(self):
+        try:
+            return os.stat(os.path.join(self.versions_dir, CURRENT_FILE)).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def current_version(self):
+        """Version named in CURRENT, or None when there is no versioned directory"""
+        try:
+            with open(os.path.join(self.versions_dir, CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def available_versions(self):
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if is_packaged(os.path.join(self.versions_dir, name))
+        )
+
+    def load_bundle(self, version=None, warm=True):
+        """Load and warm a bundle (blocking - run it off the event loop)
+
+        With no version, CURRENT is used; without CURRENT, the unversioned
+        packaged directory or pickles are loaded as ``default_version``.
+
+        ``warm=False`` makes no model call at all: no flat-backend check and
+        no warm-up, which would start XGBoost's OpenMP threads. A server
+        that loads before forking its workers does that, and each worker
+        then calls ``warm`` on the bundle it inherited.
+        """
+        start = time.perf_counter()
+        version = version or self.current_version()
+
+        if version is not None:
+            package_dir = os.path.join(self.versions_dir, version)
+            if not is_packaged(package_dir):
+                raise FileNotFoundError(f"No packaged model for version {version} in {self.versions_dir}")
+            model, scaler = load_packaged(package_dir)
+            manifest = read_manifest(package_dir)
+        else:
+            package_dir = self.fallback_dir if is_packaged(self.fallback_dir) else None
+            model, scaler = load_serving_artifacts(self.fallback_dir)
+            manifest = read_manifest(package_dir) if package_dir else {}
+            version = manifest.get("version", self.default_version)
+
+        bundle = ModelBundle(model, scaler, version, package_dir, manifest)
+        if warm:
+            self.warm(bundle)
+        bundle.load_seconds = time.perf_counter() - start
+        logger.info(f"📦 Model {version} ({bundle.backend}) loaded{' and warmed' if warm else ''} "
+                    f"in {bundle.load_seconds:.3f}s")
+        return bundle
+
+    def warm(self, bundle):
+        """Switch ``bundle`` to the configured backend and pay first-call costs, once"""
+        if bundle.warmed:
+            return
+        if self.backend == "flat":
+            model, bundle.backend = self._flatten(bundle.model, bundle.scaler)
+            bundle.model = model
+            bundle.pipeline = InferencePipeline(model, bundle.scaler)
+        probe = probe_matrix(bundle.scaler)
+        bundle.pipeline.predict(probe[:1])
+        bundle.pipeline.predict(probe)
+        bundle.warmed = True
+
+    @staticmethod
+    def _flatten(model, scaler):
+        """Swap in the flattened-tree engine, keeping the booster if it does not reproduce it"""
+        check_rows = probe_matrix(scaler, n_rows=256, seed=1)
+        scale_in_place(check_rows, scaler)
+        try:
+            forest, _ = compile_model(model, check_rows)
+        except Exception as e:
+            logger.error(f"❌ Flat tree backend unavailable, using xgboost: {e}")
+            return model, "xgboost"
+        return forest, "flat"
+
+    def swap(self, bundle):
+        """Make ``bundle`` the active one (a single reference assignment)"""
+        old, self.active = self.active, bundle
+        for callback in self._on_swap:
+            callback(old, bundle)
+        logger.info(f"🔄 Serving model {bundle.version}" + (f" (was {old.version})" if old else ""))
+        return old
+
+    async def reload(self, version=None):
+        """Load a version on a background thread, then swap it in; requests keep using the old bundle meanwhile"""
+        async with self._reload_lock:
+            bundle = await asyncio.to_thread(self.load_bundle, version)
+            return self.swap(bundle), bundle
+
+    async def watch(self, interval):
+        """Reload whenever CURRENT changes; errors are logged and the old model keeps serving"""
+        while True:
+            await asyncio.sleep(interval)
+            mtime = self._current_file_mtime()
+            if mtime is None or mtime == self._current_mtime:
+                continue
+            self._current_mtime = mtime
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"❌ Model reload from {CURRENT_FILE} failed: {e}")
@@ -0,0 +1,144 @@
+"""Flattened-array tree inference - scores the XGBoost ensemble with plain numpy indexing
+
+XGBoost's own predict builds a DMatrix and spins up its thread pool on every
+call, which dominates single-row latency. FlatForest copies every tree into
+contiguous node arrays once and then walks all trees for all rows together,
+one depth level per step, with no per-call setup beyond a few small arrays.
+"""
+
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows x trees node indices held at once while walking large batches
+MAX_WALK_CELLS = 1 << 22
+
+
+def _parse_base_score(value):
+    # Newer XGBoost releases store a per-target vector, e.g. "[5E-1]"
+    return float(str(value).strip("[]").split(",")[0])
+
+
+class FlatForest:
+    """All trees of a gbtree booster as flat node arrays
+
+    Node ``i`` splits on ``feature[i]`` at ``threshold[i]``: rows with
+    ``x < threshold`` go to ``left[i]``, others to ``right[i]`` and NaNs to
+    ``default[i]``. Leaves point to themselves, so walking ``depth`` steps
+    from every root lands each row on a leaf in every tree.
+    """
+
+    def __init__(self, roots, feature, threshold, left, right, default, value, depth, base_score):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default = default
+        self.value = value
+        self.depth = depth
+        self.base_score = base_score
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile an XGBRegressor (or Booster) from its JSON model dump"""
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+        gbm = learner["gradient_booster"]
+        if gbm.get("name") != "gbtree":
+            raise ValueError(f"Only gbtree boosters can be flattened, got {gbm.get('name')}")
+        trees = gbm["model"]["trees"]
+
+        # XGBRegressor.predict stops at the early-stopping iteration
+        best_iteration = getattr(model, "best_iteration", None)
+        if best_iteration is not None:
+            per_round = int(gbm["model"]["gbtree_model_param"].get("num_parallel_tree", 1) or 1)
+            trees = trees[:(best_iteration + 1) * per_round]
+
+        sizes = [len(tree["left_children"]) for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        n_nodes = int(sum(sizes))
+
+        feature = np.zeros(n_nodes, dtype=np.int64)
+        threshold = np.zeros(n_nodes, dtype=np.float32)
+        left = np.arange(n_nodes, dtype=np.int64)
+        right = left.copy()
+        default = left.copy()
+        value = np.zeros(n_nodes, dtype=np.float32)
+        depth = 0
+
+        for tree, offset in zip(trees, offsets):
+            if any(tree.get("split_type", ())):
+                raise ValueError("Categorical splits are not supported")
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            nodes = slice(offset, offset + len(lc))
+            is_leaf = lc == -1
+
+            feature[nodes] = np.where(is_leaf, 0, tree["split_indices"])
+            threshold[nodes] = conditions
+            value[nodes] = np.where(is_leaf, conditions, 0)
+            split = ~is_leaf
+            left[nodes][split] = lc[split] + offset
+            right[nodes][split] = rc[split] + offset
+            default_left = np.asarray(tree["default_left"], dtype=bool)
+            default[nodes][split] = np.where(default_left, lc, rc)[split] + offset
+            depth = max(depth, cls._tree_depth(lc, rc))
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        return cls(offsets, feature, threshold, left, right, default, value, depth, base_score)
+
+    @staticmethod
+    def _tree_depth(left_children, right_children):
+        depth, level = 0, [0]
+        while True:
+            level = [child for node in level if left_children[node] != -1
+                     for child in (left_children[node], right_children[node])]
+            if not level:
+                return depth
+            depth += 1
+
+    def _leaves(self, X, has_nan):
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.depth):
+            x = X[rows, self.feature[nodes]]
+            nodes = np.where(x < self.threshold[nodes], self.left[nodes], self.right[nodes])
+            if has_nan:
+                nodes = np.where(np.isnan(x), self.default[nodes], nodes)
+        return nodes
+
+    def predict(self, X):
+        """Predict like XGBRegressor.predict for an (N, n_features) float matrix"""
+        X = np.asarray(X, dtype=np.float32)
+        has_nan = bool(np.isnan(X).any())
+        out = np.empty(len(X), dtype=np.float32)
+        step = max(1, MAX_WALK_CELLS // max(self.n_trees, 1))
+        for start in range(0, len(X), step):
+            leaves = self._leaves(X[start:start + step], has_nan)
+            out[start:start + step] = self.value[leaves].sum(axis=1, dtype=np.float64) + self.base_score
+        return out
+
+
+def compile_model(model, check_rows, rtol=1e-4, atol=1e-2):
+    """Flatten ``model`` and verify it against model.predict on ``check_rows``
+
+    ``check_rows`` are already scaled (N, 22) rows. Returns the FlatForest and
+    the largest absolute difference; raises ValueError if it is out of tolerance.
+    """
+    forest = FlatForest.from_model(model)
+    expected = np.asarray(model.predict(check_rows), dtype=np.float64)
+    actual = forest.predict(check_rows).astype(np.float64)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    if not np.allclose(actual, expected, rtol=rtol, atol=atol):
+        raise ValueError(f"Flattened trees disagree with model.predict (max abs diff {max_diff:.6g})")
+    logger.info(f"🌲 Flattened {forest.n_trees} trees (depth {forest.depth}), max abs diff {max_diff:.6g}")
+    return forest, max_diff
@@ -0,0 +1,387 @@
+"""Rolling-origin backtesting - re-run the model comparison of Data/milestone3_model_results.csv
+
+Usage:
+    python -m src.backtest run [--folds 4] [--horizon-weeks 6] [--step-weeks 6] [--workers N]
+                               [--models XGBoost "Random Forest" Naive ...]
+                               [--results Data/backtest/model_results.csv]
+                               [--summary Data/backtest/summary.json]
+
+Each fold trains on every day before its cutoff and forecasts the next
+--horizon-weeks weeks; cutoffs step back --step-weeks from the end of the
+history. Every (model, fold) pair is a task in one process pool. The
+per-store time series baselines (Naive, Seasonal Naive, Moving Average,
+ARIMA) are further split into store ranges, so ARIMA's per-store fits use
+every core.
+
+Every model forecasts the whole horizon from the cutoff, using only sales
+before it. Feature models (XGBoost, Random Forest) are fitted on the
+feature table and rolled forward recursively, as /forecast does (see
+src/features/forecast.py). Each day's predictions feed the next day's lag
+and rolling features. Promo, SchoolHoliday and Open are taken as known.
+Stores that cannot join the rollout (too little history, or history
+ending before the cutoff) fall back to one-step predictions from observed
+lags, and a warning is logged. Series baselines forecast each store's
+trailing daily sales.
+
+Metrics are computed over open days with sales. They are pooled across
+folds for chain-wide daily totals, which is the scale of the milestone 3
+results file, and for store-days. Fold train/test matrices are cached under
+--cache, keyed by the feature table build and the fold layout.
+Prophet and LSTM from the original comparison are not dependencies of
+this project and are not run. Results go to Data/backtest/ by default, so
+the committed milestone 3 files are left as they are.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import xgboost as xgb
+from sklearn.ensemble import RandomForestRegressor
+
+from .api.inference import FEATURE_NAMES, N_FEATURES, N_SCALED
+from .evaluation import daily_totals, regression_metrics, results_frame
+from .features.feature_store import HISTORY_DEPTH, FeatureStore
+from .features.forecast import RecursiveForecast
+from .features.pipeline import TABLE_DIR, build_feature_table, load_feature_table, recent_history
+from .features.store_table import StoreTable
+from .train import XGB_PARAMS
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "Data/backtest_cache"
+RESULTS_PATH = "Data/backtest/model_results.csv"
+SUMMARY_PATH = "Data/backtest/summary.json"
+
+SERIES_HISTORY_DAYS = 365  # trailing days each per-store series model sees
+STORE_CHUNKS_PER_WORKER = 4
+SEED = 42
+
+_TABLE = None  # Store/Date/Sales columns, memory-mapped once per worker
+
+
+# FOLDS
+def fold_cutoffs(last_date, folds, horizon_days, step_days):
+    """Cutoff dates, oldest first; fold k tests [cutoff, cutoff + horizon_days)"""
+    last_cutoff = last_date - np.timedelta64(horizon_days - 1, 'D')
+    return [last_cutoff - np.timedelta64(step_days * k, 'D') for k in reversed(range(folds))]
+
+
+def cache_key(manifest, cutoffs, horizon_days):
+    stamp = json.dumps([manifest["built_at"], manifest["rows"], [str(c) for c in cutoffs], horizon_days])
+    return hashlib.sha1(stamp.encode()).hexdigest()[:12]
+
+
+def build_folds(table_dir, cutoffs, horizon_days, cache_dir):
+    """Write (or reuse) each fold's train/test arrays as .npy files; returns the fold directories"""
+    fold_dirs = [os.path.join(cache_dir, f"fold-{cutoff}") for cutoff in cutoffs]
+    if all(os.path.exists(os.path.join(d, "done")) for d in fold_dirs):
+        print(f"✔ Reusing cached fold matrices in {cache_dir}")
+        return fold_dirs
+
+    columns = load_feature_table(table_dir, set(FEATURE_NAMES) | {'Date', 'Sales'})
+    dates = np.asarray(columns['Date'])
+    sales = np.asarray(columns['Sales'])
+    usable = (np.asarray(columns['Open']) == 1) & (sales > 0)
+    for name in FEATURE_NAMES[:N_SCALED]:
+        usable &= ~np.isnan(columns[name])
+
+    def gather(rows):
+        X = np.empty((len(rows), N_FEATURES), dtype=np.float32)
+        for col, name in enumerate(FEATURE_NAMES):
+            X[:, col] = columns[name][rows]
+        return X
+
+    for cutoff, fold_dir in zip(cutoffs, fold_dirs):
+        end = cutoff + np.timedelta64(horizon_days, 'D')
+        train_rows = np.flatnonzero(usable & (dates < cutoff))
+        test_rows = np.flatnonzero(usable & (dates >= cutoff) & (dates < end))
+        os.makedirs(fold_dir, exist_ok=True)
+        np.save(os.path.join(fold_dir, "X_train.npy"), gather(train_rows))
+        np.save(os.path.join(fold_dir, "y_train.npy"), sales[train_rows].astype(np.float64))
+        np.save(os.path.join(fold_dir, "X_test.npy"), gather(test_rows))
+        np.save(os.path.join(fold_dir, "y_test.npy"), sales[test_rows].astype(np.float64))
+        np.save(os.path.join(fold_dir, "store_test.npy"), np.asarray(columns['Store'])[test_rows].astype(np.int64))
+        np.save(os.path.join(fold_dir, "date_test.npy"), dates[test_rows])
+        open(os.path.join(fold_dir, "done"), 'w').close()
+        print(f"✔ Fold {cutoff}: {len(train_rows):,} train / {len(test_rows):,} test rows cached")
+    return fold_dirs
+
+
+def load_fold(fold_dir, *names):
+    return [np.load(os.path.join(fold_dir, f"{name}.npy"), mmap_mode='r') for name in names]
+
+
+# FEATURE MODELS - fit on the fold's training rows, then rolled over its test window
+def fit_xgboost(X_train, y_train, threads):
+    model = xgb.XGBRegressor(**{**XGB_PARAMS, "n_jobs": threads})
+    return model.fit(X_train, y_train)
+
+
+def fit_random_forest(X_train, y_train, threads):
+    model = RandomForestRegressor(n_estimators=100, max_depth=20, min_samples_leaf=2,
+                                  max_samples=min(200_000, len(y_train)), n_jobs=threads, random_state=SEED)
+    return model.fit(X_train, y_train)
+
+
+FEATURE_MODELS = {
+    "XGBoost": fit_xgboost,
+    "Random Forest": fit_random_forest,
+}
+
+
+def recursive_predictions(model, table_dir, stores_path, cutoff, horizon_days, store_test, date_test):
+    """Forecast the fold's test rows by rolling ``model`` forward from the history before ``cutoff``
+
+    Rows of stores that cannot join the rollout are left NaN.
+    """
+    feature_store = FeatureStore.from_frame(recent_history(table_dir, HISTORY_DEPTH, before=cutoff))
+    stores = np.unique(store_test)
+    stores = stores[stores <= feature_store.n_stores]
+    stores = stores[feature_store.ready[stores] & (feature_store.next_date(stores) == cutoff)]
+    predictions = np.full(len(store_test), np.nan)
+    if len(stores) == 0:
+        return predictions
+
+    # Known inputs of every day in the window; days missing from the history count as closed
+    window = load_feature_table(table_dir, ['Store', 'Date', 'Open', 'Promo', 'SchoolHoliday'])
+    table_stores = np.asarray(window['Store'], dtype=np.int64)
+    offsets = (np.asarray(window['Date']) - cutoff).astype(np.int64)
+    rows = np.flatnonzero((offsets >= 0) & (offsets < horizon_days) & np.isin(table_stores, stores))
+    grid_rows, grid_cols = np.searchsorted(stores, table_stores[rows]), offsets[rows]
+    inputs = {}
+    for name in ('Open', 'Promo', 'SchoolHoliday'):
+        inputs[name] = np.zeros((len(stores), horizon_days))
+        inputs[name][grid_rows, grid_cols] = window[name][rows]
+
+    forecast = RecursiveForecast(
+        feature_store, StoreTable.from_csv(stores_path), stores, cutoff, horizon_days,
+        promo=inputs['Promo'], school_holiday=inputs['SchoolHoliday'], open_flags=inputs['Open']
+    )
+    forecast.run(model.predict)
+
+    joined = np.isin(store_test, stores)
+    predictions[joined] = forecast.forecast[np.searchsorted(stores, store_test[joined]),
+                                            (date_test[joined] - cutoff).astype(np.int64)]
+    return predictions
+
+
+# SERIES MODELS - one store's trailing daily sales -> the next ``horizon`` days
+def naive(history, horizon):
+    return np.full(horizon, history[-1])
+
+
+def seasonal_naive(history, horizon):
+    return np.resize(history[-7:], horizon)
+
+
+def moving_average(history, horizon):
+    return np.full(horizon, history[-7:].mean())
+
+
+def arima(history, horizon):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return np.asarray(ARIMA(history, order=(2, 0, 3)).fit().forecast(horizon))
+    except (ValueError, np.linalg.LinAlgError):
+        return moving_average(history, horizon)
+
+
+SERIES_MODELS = {
+    "Naive": naive,
+    "Seasonal Naive": seasonal_naive,
+    "Moving Average": moving_average,
+    "ARIMA(2, 0, 3)": arima,
+}
+
+# Averages of other models' predictions, formed after all tasks finish
+ENSEMBLES = {"Ensemble": ("XGBoost", "Random Forest")}
+
+
+# WORKER TASKS
+def _init_worker(table_dir):
+    global _TABLE
+    _TABLE = load_feature_table(table_dir, ['Store', 'Date', 'Sales'])
+
+
+def run_feature_task(name, fold, fold_dir, cutoff, horizon_days, table_dir, stores_path, threads):
+    """Fit on the fold's training rows and forecast its test window recursively from ``cutoff``"""
+    X_train, y_train, X_test, store_test, date_test = load_fold(
+        fold_dir, "X_train", "y_train", "X_test", "store_test", "date_test"
+    )
+    start = time.perf_counter()
+    model = FEATURE_MODELS[name](X_train, y_train, threads)
+    predictions = recursive_predictions(model, table_dir, stores_path, cutoff, horizon_days, store_test, date_test)
+    missing = np.isnan(predictions)
+    if missing.any():
+        predictions[missing] = model.predict(np.asarray(X_test[missing]))
+        logger.warning(f"⚠️  {name} fold {cutoff}: {int(np.count_nonzero(missing)):,} test rows of stores "
+                       f"outside the rollout scored one step ahead")
+    return name, fold, None, np.clip(predictions, 0, None), time.perf_counter() - start
+
+
+def run_series_task(name, fold, fold_dir, cutoff, horizon_days, store_range):
+    """Forecast every test row of stores in [lo, hi) from each store's history before ``cutoff``"""
+    start = time.perf_counter()
+    store_test, date_test = load_fold(fold_dir, "store_test", "date_test")
+    lo, hi = store_range
+    positions = np.flatnonzero((store_test >= lo) & (store_test < hi))
+    predictions = np.empty(len(positions), dtype=np.float64)
+
+    table_stores = _TABLE['Store']
+    model = SERIES_MODELS[name]
+    offsets = (date_test[positions] - cutoff).astype(np.int64)
+    stores = store_test[positions]
+    for store in np.unique(stores):
+        first, last = np.searchsorted(table_stores, [store, store + 1])
+        end = first + np.searchsorted(_TABLE['Date'][first:last], cutoff)
+        history = np.asarray(_TABLE['Sales'][max(first, end - SERIES_HISTORY_DAYS):end], dtype=np.float64)
+        mine = stores == store
+        if len(history) == 0:
+            predictions[mine] = 0.0
+            continue
+        forecast = model(history, horizon_days)
+        predictions[mine] = forecast[offsets[mine]]
+    return name, fold, positions, np.clip(predictions, 0, None), time.perf_counter() - start
+
+
+def store_ranges(n_stores, n_chunks):
+    edges = np.linspace(1, n_stores + 1, n_chunks + 1).astype(np.int64)
+    return [(int(lo), int(hi)) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+
+# HARNESS
+def backtest(args):
+    start = time.perf_counter()
+    manifest = build_feature_table(args.history, args.stores, args.table, args.workers)
+    workers = args.workers or os.cpu_count() or 1
+    last_date = np.datetime64(manifest["last_date"], 'D')
+    horizon_days = 7 * args.horizon_weeks
+    cutoffs = fold_cutoffs(last_date, args.folds, horizon_days, 7 * args.step_weeks)
+    cache_dir = os.path.join(args.cache, cache_key(manifest, cutoffs, horizon_days))
+    fold_dirs = build_folds(args.table, cutoffs, horizon_days, cache_dir)
+
+    models = args.models or list(FEATURE_MODELS) + list(SERIES_MODELS) + list(ENSEMBLES)
+    unknown = [m for m in models if m not in FEATURE_MODELS and m not in SERIES_MODELS and m not in ENSEMBLES]
+    if unknown:
+        print(f"✘ Unknown models: {', '.join(unknown)}")
+        return 1
+    ensembles = {name: parts for name, parts in ENSEMBLES.items() if name in models}
+    needed = set(models) | {part for parts in ensembles.values() for part in parts}
+
+    y_tests = [load_fold(d, "y_test")[0] for d in fold_dirs]
+    predictions = {name: [np.zeros(len(y)) for y in y_tests] for name in needed - set(ensembles)}
+    seconds = {name: 0.0 for name in predictions}
+    n_stores = int(np.max([load_fold(d, "store_test")[0].max(initial=0) for d in fold_dirs]))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    print(f"🔄 {len(cutoffs)} folds x {len(needed)} models on {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(args.table,)) as pool:
+        futures = []
+        for fold, (cutoff, fold_dir) in enumerate(zip(cutoffs, fold_dirs)):
+            for name in sorted(needed - set(ensembles)):
+                if name in FEATURE_MODELS:
+                    futures.append(pool.submit(run_feature_task, name, fold, fold_dir, cutoff, horizon_days,
+                                               args.table, args.stores, threads))
+                else:
+                    for store_range in store_ranges(n_stores, workers * STORE_CHUNKS_PER_WORKER):
+                        futures.append(pool.submit(run_series_task, name, fold, fold_dir, cutoff,
+                                                   horizon_days, store_range))
+        for future in as_completed(futures):
+            name, fold, positions, values, elapsed = future.result()
+            if positions is None:
+                predictions[name][fold][:] = values
+            else:
+                predictions[name][fold][positions] = values
+            seconds[name] += elapsed
+
+    for name, parts in ensembles.items():
+        predictions[name] = [np.mean([predictions[p][fold] for p in parts], axis=0) for fold in range(len(cutoffs))]
+
+    date_tests = [load_fold(d, "date_test")[0] for d in fold_dirs]
+    chain_rows, store_rows, per_fold = [], [], {}
+    for name in models:
+        actual_totals, predicted_totals = [], []
+        per_fold[name] = []
+        for fold, cutoff in enumerate(cutoffs):
+            _, actual_total, predicted_total = daily_totals(date_tests[fold], y_tests[fold], predictions[name][fold])
+            actual_totals.append(actual_total)
+            predicted_totals.append(predicted_total)
+            per_fold[name].append({"cutoff": str(cutoff), **regression_metrics(actual_total, predicted_total)})
+        chain_rows.append({"Model": name, **regression_metrics(np.concatenate(actual_totals),
+                                                                np.concatenate(predicted_totals))})
+        store_rows.append({"Model": name, **regression_metrics(np.concatenate(y_tests),
+                                                                np.concatenate(predictions[name]))})
+
+    results = results_frame(chain_rows).sort_values('RMSE', kind='stable').reset_index(drop=True)
+    os.makedirs(os.path.dirname(args.results) or ".", exist_ok=True)
+    results.to_csv(args.results, index=False)
+    best = results.iloc[0]
+    summary = {
+        "best_model": best['Model'],
+        "rmse": best['RMSE'],
+        "mae": best['MAE'],
+        "mape": best['MAPE'],
+        "r2": best['R2'],
+        "timestamp": datetime.now().isoformat(),
+        "all_results": json.loads(results.to_json()),
+        "backtest": {
+            "cutoffs": [str(c) for c in cutoffs],
+            "horizon_days": horizon_days,
+            "evaluated_on": "chain-wide daily totals of open days with sales, pooled over folds",
+            "feature_models": "recursive rollout over the horizon from each cutoff",
+            "per_fold": per_fold,
+            "store_day": results_frame(store_rows).set_index('Model').to_dict(orient='index'),
+            "fit_seconds": {name: round(value, 1) for name, value in seconds.items()},
+            "feature_table": manifest["built_at"],
+        },
+    }
+    os.makedirs(os.path.dirname(args.summary) or ".", exist_ok=True)
+    with open(args.summary, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(results.to_string(index=False))
+    print(f"✔ Results written to {args.results} and {args.summary}")
+    print(f"📊 Total wall time {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.backtest", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="Backtest every registered model over rolling cutoffs")
+    run_cmd.add_argument("--history", default="Data/train.csv")
+    run_cmd.add_argument("--stores", default="Data/store.csv")
+    run_cmd.add_argument("--table", default=TABLE_DIR)
+    run_cmd.add_argument("--cache", default=CACHE_DIR, help="Fold matrix cache directory")
+    run_cmd.add_argument("--folds", type=int, default=4)
+    run_cmd.add_argument("--horizon-weeks", type=int, default=6)
+    run_cmd.add_argument("--step-weeks", type=int, default=6)
+    run_cmd.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    run_cmd.add_argument("--models", nargs="+", default=None,
+                         help="Model names, quoted where they contain spaces (default: all)")
+    run_cmd.add_argument("--results", default=RESULTS_PATH)
+    run_cmd.add_argument("--summary", default=SUMMARY_PATH)
+    return parser
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = build_parser().parse_args(argv)
+    return backtest(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
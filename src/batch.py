@@ -0,0 +1,123 @@
+"""Bulk scoring CLI - score Data/test.csv into a submission file
+
+Usage:
+    python -m src.batch score [--test Data/test.csv] [--output Data/submission.csv]
+
+test.csv covers several weeks after the end of train.csv, so lag and rolling
+features are not known for most of its rows. The test window is forecast
+recursively (src/features/forecast.py): every store steps forward one day
+at a time on its own predictions, one model call per day. Sales are
+written in raw units, as the submission expects (/predict and
+/predict_store divide by 1000).
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from .api.inference import MODEL_PATH, SCALER_PATH, load_artifacts, predict_matrix
+from .features.feature_store import FeatureStore
+from .features.forecast import RecursiveForecast
+from .features.store_table import StoreTable
+
+TEST_COLUMNS = ['Id', 'Store', 'Date', 'Open', 'Promo', 'SchoolHoliday']
+
+
+def test_grid(test, store_ids, start_date, horizon):
+    """(stores, horizon) Promo, SchoolHoliday and Open arrays for ``store_ids`` plus each test row's grid position
+
+    Days missing from test.csv for a store are treated as closed.
+    """
+    rows = np.searchsorted(store_ids, test['Store'].to_numpy(dtype=np.int64))
+    cols = (pd.to_datetime(test['Date']).to_numpy(dtype='datetime64[D]') - start_date).astype(np.int64)
+    grid = {}
+    # A handful of test rows have no Open flag; treat them as open, and missing Promo/SchoolHoliday as 0
+    for name, fill in (('Promo', 0.0), ('SchoolHoliday', 0.0), ('Open', 1.0)):
+        values = np.zeros((len(store_ids), horizon))
+        values[rows, cols] = test[name].fillna(fill).to_numpy(dtype=np.float64)
+        grid[name] = values
+    return grid, rows, cols
+
+
+def score_test(test, model, scaler, feature_store, store_table):
+    """Forecast every test.csv row recursively from the end of the history
+
+    Stores without enough history, or whose history ends before the others',
+    are written as 0 sales. Returns (ids, sales, n_skipped).
+    """
+    test_stores = np.unique(test['Store'].to_numpy(dtype=np.int64))
+    store_ids = test_stores[feature_store.ready[test_stores]]
+    next_dates = feature_store.next_date(store_ids)
+    store_ids = store_ids[next_dates == next_dates.max()]
+
+    scoreable = np.isin(test['Store'].to_numpy(dtype=np.int64), store_ids)
+    scored = test[scoreable]
+    dates = pd.to_datetime(scored['Date']).to_numpy(dtype='datetime64[D]')
+    start_date, end_date = dates.min(), dates.max()
+    horizon = int((end_date - start_date).astype(np.int64)) + 1
+    grid, rows, cols = test_grid(scored, store_ids, start_date, horizon)
+
+    forecast = RecursiveForecast(
+        feature_store, store_table, store_ids, start_date, horizon,
+        promo=grid['Promo'], school_holiday=grid['SchoolHoliday'], open_flags=grid['Open']
+    )
+    forecast.run(lambda matrix: predict_matrix(model, scaler, matrix))
+
+    sales = np.zeros(len(test), dtype=np.float64)
+    sales[scoreable] = forecast.forecast[rows, cols]
+    open_rows = test['Open'].fillna(1).to_numpy() == 1
+    n_skipped = int(np.count_nonzero(~scoreable & open_rows))
+    return test['Id'].to_numpy(), sales, n_skipped
+
+
+def score(args):
+    """Forecast test.csv and write Id,Sales rows"""
+    start = time.perf_counter()
+
+    model, scaler = load_artifacts(args.model, args.scaler)
+    store_table = StoreTable.from_csv(args.stores)
+    feature_store = FeatureStore.from_csv(args.history)
+    test = pd.read_csv(args.test, usecols=TEST_COLUMNS)
+    load_time = time.perf_counter() - start
+    print(f"✔ Artifacts, store table, history and {len(test):,} test rows loaded in {load_time:.2f}s")
+
+    score_start = time.perf_counter()
+    ids, sales, n_skipped = score_test(test, model, scaler, feature_store, store_table)
+    with open(args.output, 'w') as out:
+        out.write('Id,Sales\n')
+        np.savetxt(out, np.column_stack([ids, sales]), fmt=['%d', '%.2f'], delimiter=',')
+
+    score_time = time.perf_counter() - score_start
+    total_time = time.perf_counter() - start
+    print(f"✔ Scored {len(ids):,} rows -> {args.output}")
+    if n_skipped:
+        print(f"⚠️  {n_skipped:,} open rows had no usable store history and were written as 0")
+    print(f"📊 {len(ids) / score_time:,.0f} rows/sec | scoring {score_time:.2f}s | total wall time {total_time:.2f}s")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.batch", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score_cmd = commands.add_parser("score", help="Score test.csv into a submission file")
+    score_cmd.add_argument("--test", default="Data/test.csv", help="Rows to score")
+    score_cmd.add_argument("--stores", default="Data/store.csv", help="Store metadata")
+    score_cmd.add_argument("--history", default="Data/train.csv", help="Sales history for lag features")
+    score_cmd.add_argument("--model", default=MODEL_PATH)
+    score_cmd.add_argument("--scaler", default=SCALER_PATH)
+    score_cmd.add_argument("--output", default="Data/submission.csv", help="Where to write Id,Sales")
+    score_cmd.set_defaults(func=score)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""API load and latency benchmark - throughput, p50/p95/p99 latency and RSS as JSON
+
+Usage:
+    python -m src.benchmark run [--url http://127.0.0.1:8000] [--concurrency 8] [--requests 2000]
+                               [--batch-sizes 1,10,100,1000,10000] [--output benchmarks/<commit>.json]
+    python -m src.benchmark compare benchmarks/old.json benchmarks/new.json
+
+Without --url the app is driven in-process through its ASGI interface, so
+no server or HTTP client library is needed. With --url requests go to a
+running uvicorn; pass --pid to also sample that server's RSS. Payloads
+are real rows from Data/test.csv with features built from Data/train.csv
+and Data/store.csv. Set PREDICTION_CACHE=0 on the server to measure
+uncached /predict latency.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .api.inference import FEATURE_NAMES, N_FEATURES, N_SCALED
+from .features.feature_store import FeatureStore
+from .features.store_table import StoreTable
+
+PAYLOAD_ROWS = 10_000
+
+
+# PAYLOADS
+def build_payload_rows(test_path, stores_path, history_path, n_rows=PAYLOAD_ROWS, seed=0):
+    """Real /predict request bodies (dicts in FEATURE_NAMES order) built from test.csv rows"""
+    from .api.models import PredictionInput
+
+    test = pd.read_csv(test_path, dtype={'StateHoliday': str})
+    test = test[test['Open'].fillna(1) == 1]
+    store_table = StoreTable.from_csv(stores_path)
+    feature_store = FeatureStore.from_csv(history_path)
+    test = test[feature_store.ready[test['Store'].to_numpy()]]
+    test = test.sample(n=min(n_rows, len(test)), random_state=seed)
+
+    store_ids = test['Store'].to_numpy(dtype=np.int64)
+    features = np.empty((len(test), N_FEATURES), dtype=np.float64)
+    features[:, :N_SCALED] = feature_store.build_features(
+        store_ids, pd.to_datetime(test['Date']).to_numpy(dtype='datetime64[D]'),
+        test['Promo'].to_numpy(), test['SchoolHoliday'].to_numpy()
+    )
+    features[:, N_SCALED:] = store_table.unscaled_block(store_ids, 1)
+
+    # Keep only rows that pass the request schema's bounds
+    integer = [PredictionInput.model_fields[name].annotation is int for name in FEATURE_NAMES]
+    rows = []
+    for values in features.tolist():
+        row = {name: int(v) if is_int else v for name, v, is_int in zip(FEATURE_NAMES, values, integer)}
+        try:
+            PredictionInput(**row)
+        except ValueError:
+            continue
+        rows.append(row)
+    return rows
+
+
+def build_scenarios(rows, batch_sizes):
+    """(name, method, path, rows per request, [encoded bodies]) for every benchmarked route"""
+    scenarios = [("health", "GET", "/health", 1, [b""])]
+    scenarios.append(("predict", "POST", "/predict", 1, [json.dumps(row).encode() for row in rows]))
+    for size in batch_sizes:
+        size = min(size, len(rows))
+        bodies = [
+            json.dumps({"data": rows[start:start + size]}).encode()
+            for start in range(0, len(rows) - size + 1, size)
+        ][:50]
+        scenarios.append((f"predict_batch_{size}", "POST", "/predict_batch", size, bodies))
+    return scenarios
+
+
+# CLIENTS
+class InProcessClient:
+    """Calls the FastAPI app directly with ASGI messages"""
+
+    def __init__(self):
+        from .api.main import app
+        self.app = app
+
+    async def start(self):
+        await self.app.router.startup()
+
+    async def stop(self):
+        await self.app.router.shutdown()
+
+    async def request(self, method, path, body):
+        done = asyncio.Event()
+        body_sent = False
+        status = 0
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                done.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": b"", "root_path": "",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+        }
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # Starlette re-raises after sending its 500; count it like any other failed request
+            return status if status >= 400 else 500
+        finally:
+            done.set()
+        return status
+
+
+class HttpClient:
+    """Blocking requests.Session per worker thread, driven from the event loop"""
+
+    def __init__(self, url, concurrency):
+        import requests
+        self._requests = requests
+        self.url = url.rstrip("/")
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench")
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        self._pool.shutdown(wait=True)
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        return session
+
+    def _send(self, method, path, body):
+        headers = {"Content-Type": "application/json"}
+        return self._session().request(method, self.url + path, data=body or None, headers=headers).status_code
+
+    async def request(self, method, path, body):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self._send, method, path, body)
+
+
+# MEASUREMENT
+def rss_mb(pid=None):
+    """Current resident set size in MB (Linux /proc), or None if unavailable"""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def latency_summary(latencies):
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99),
+            "mean": float(ms.mean()), "max": float(ms.max())}
+
+
+async def run_scenario(client, scenario, n_requests, concurrency, warmup):
+    """Fire ``n_requests`` with ``concurrency`` in flight and time each one"""
+    name, method, path, rows_per_request, bodies = scenario
+    for i in range(warmup):
+        await client.request(method, path, bodies[i % len(bodies)])
+
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < n_requests:
+            body = bodies[next_index % len(bodies)]
+            next_index += 1
+            start = time.perf_counter()
+            status = await client.request(method, path, body)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "method": method,
+        "path": path,
+        "batch_size": rows_per_request,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "rows_per_second": len(latencies) * rows_per_request / elapsed,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def benchmark(args):
+    rows = build_payload_rows(args.test, args.stores, args.history, seed=args.seed)
+    print(f"✔ {len(rows)} payload rows built from {args.test}")
+    scenarios = build_scenarios(rows, args.batch_sizes)
+    if args.only:
+        scenarios = [s for s in scenarios if any(s[0].startswith(prefix) for prefix in args.only)]
+
+    client = HttpClient(args.url, args.concurrency) if args.url else InProcessClient()
+    server_pid = args.pid if args.url else None
+    await client.start()
+    results = []
+    try:
+        for scenario in scenarios:
+            # Large batches get fewer requests so every scenario finishes in similar time
+            n_requests = max(args.concurrency, args.requests // scenario[3])
+            result = await run_scenario(client, scenario, n_requests, args.concurrency, args.warmup)
+            result["rss_mb"] = rss_mb(server_pid)
+            results.append(result)
+            lat = result["latency_ms"]
+            print(f"  {result['name']:<22} {result['throughput_rps']:>9.1f} req/s  "
+                  f"p50 {lat['p50']:7.2f} ms  p95 {lat['p95']:7.2f} ms  p99 {lat['p99']:7.2f} ms  "
+                  f"errors {result['errors']}")
+    finally:
+        await client.stop()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "mode": "http" if args.url else "in-process",
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "peak_rss_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024) if not args.url else None,
+        "scenarios": results,
+    }
+
+
+def compare(old_path, new_path):
+    """Print per-scenario throughput and p99 changes between two result files"""
+    with open(old_path) as f:
+        old = {s["name"]: s for s in json.load(f)["scenarios"]}
+    with open(new_path) as f:
+        new = json.load(f)["scenarios"]
+
+    print(f"{'scenario':<22} {'req/s':>10} {'change':>8} {'p99 ms':>9} {'change':>8}")
+    for scenario in new:
+        before = old.get(scenario["name"])
+        rps, p99 = scenario["throughput_rps"], scenario["latency_ms"]["p99"]
+        if before is None:
+            print(f"{scenario['name']:<22} {rps:>10.1f} {'new':>8} {p99:>9.2f} {'new':>8}")
+            continue
+        rps_change = 100 * (rps / before["throughput_rps"] - 1)
+        p99_change = 100 * (p99 / before["latency_ms"]["p99"] - 1)
+        print(f"{scenario['name']:<22} {rps:>10.1f} {rps_change:>+7.1f}% {p99:>9.2f} {p99_change:>+7.1f}%")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="Benchmark /health, /predict and /predict_batch")
+    run_cmd.add_argument("--url", default=None, help="Running server (default: drive the app in-process)")
+    run_cmd.add_argument("--pid", type=int, default=None, help="Server PID for RSS sampling with --url")
+    run_cmd.add_argument("--concurrency", type=int, default=8)
+    run_cmd.add_argument("--requests", type=int, default=2000, help="Requests per single-row scenario")
+    run_cmd.add_argument("--warmup", type=int, default=20)
+    run_cmd.add_argument("--batch-sizes", default="1,10,100,1000,10000",
+                         type=lambda value: [int(v) for v in value.split(",") if v])
+    run_cmd.add_argument("--only", nargs="*", default=None, help="Scenario name prefixes to run")
+    run_cmd.add_argument("--test", default="Data/test.csv")
+    run_cmd.add_argument("--stores", default="Data/store.csv")
+    run_cmd.add_argument("--history", default="Data/train.csv")
+    run_cmd.add_argument("--seed", type=int, default=0)
+    run_cmd.add_argument("--output", default=None, help="JSON results path (default: benchmarks/<commit>.json)")
+
+    compare_cmd = commands.add_parser("compare", help="Compare two result files")
+    compare_cmd.add_argument("old")
+    compare_cmd.add_argument("new")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "compare":
+        compare(args.old, args.new)
+        return 0
+
+    results = asyncio.run(benchmark(args))
+    output = args.output or os.path.join("benchmarks", f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✔ Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Forecast accuracy metrics in the format of Data/milestone3_model_results.csv"""
+
+import numpy as np
+import pandas as pd
+
+RESULT_COLUMNS = ['Model', 'RMSE', 'MAE', 'MAPE', 'R2']
+
+
+def regression_metrics(actual, predicted):
+    """RMSE, MAE, MAPE (%, over rows with actual > 0) and R2, rounded like the milestone 3 results"""
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    error = predicted - actual
+    positive = actual > 0
+    total = np.sum((actual - actual.mean()) ** 2)
+    return {
+        'RMSE': round(float(np.sqrt(np.mean(error ** 2))), 0),
+        'MAE': round(float(np.mean(np.abs(error))), 0),
+        'MAPE': round(float(np.mean(np.abs(error[positive]) / actual[positive]) * 100), 2) if positive.any() else None,
+        'R2': round(float(1 - np.sum(error ** 2) / total), 4) if total > 0 else None,
+    }
+
+
+def daily_totals(dates, actual, predicted):
+    """Chain-wide (sum over stores) actual and predicted sales per date, as milestone 3 evaluated them"""
+    days, inverse = np.unique(np.asarray(dates, dtype='datetime64[D]'), return_inverse=True)
+    return (days, np.bincount(inverse, weights=actual, minlength=len(days)),
+            np.bincount(inverse, weights=predicted, minlength=len(days)))
+
+
+def results_frame(rows):
+    """DataFrame with RESULT_COLUMNS from {'Model': name, **metrics} dicts"""
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
@@ -0,0 +1,2 @@
+"""Server-side feature engineering and lookup"""
+__version__ = "1.0.0"
\ No newline at end of file
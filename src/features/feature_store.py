@@ -0,0 +1,189 @@
+"""In-process feature store backed by per-store ring buffers of recent history"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .rolling import RollingWindowStats
+
+logger = logging.getLogger(__name__)
+
+# Longest lag in FEATURE_NAMES is Sales_Lag_30
+HISTORY_DEPTH = 30
+SALES_LAGS = (1, 7, 14, 30)
+CUSTOMER_LAGS = (1, 7)
+ROLLING_WINDOWS = (7, 14)
+
+# Columns 6-16 of FEATURE_NAMES, in the same order
+HISTORY_FEATURES = [
+    'Sales_Lag_1', 'Sales_Lag_7', 'Sales_Lag_14', 'Sales_Lag_30',
+    'Customers_Lag_1', 'Customers_Lag_7', 'Sales_Rolling_Mean_7',
+    'Sales_Rolling_Mean_14', 'Sales_Rolling_Std_7', 'Sales_Rolling_Std_14',
+    'SalesPerCustomer'
+]
+
+
+def calendar_features(dates, promo, school_holiday):
+    """Build columns 0-5 of FEATURE_NAMES (DayOfWeek..SchoolHoliday) for an array of dates"""
+    days = np.atleast_1d(np.asarray(dates, dtype='datetime64[D]'))
+    # 1970-01-01 was a Thursday; Rossmann encodes Monday=1 .. Sunday=7
+    day_of_week = (days.astype(np.int64) + 3) % 7 + 1
+    month = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    quarter = (month - 1) // 3 + 1
+    is_weekend = day_of_week >= 6
+
+    out = np.empty((len(days), 6), dtype=np.float32)
+    out[:, 0] = day_of_week
+    out[:, 1] = month
+    out[:, 2] = quarter
+    out[:, 3] = is_weekend
+    out[:, 4] = promo
+    out[:, 5] = school_holiday
+    return out
+
+
+class FeatureStore:
+    """Recent daily Sales/Customers per store in contiguous arrays indexed by store ID
+
+    Row ``s`` of each buffer holds the last ``depth`` days on record for store
+    ``s`` as a ring buffer. The 11 history features are kept up to date as
+    the buffers change, so a lookup is a single row gather. History features
+    always describe the most recent days on record.
+
+    Rolling means and standard deviations are maintained incrementally (see
+    rolling.py): appending a day updates each affected store in O(1), so a
+    daily refresh of every store is a few vectorized operations over the
+    store axis instead of a recompute over the whole window.
+    """
+
+    def __init__(self, n_stores, depth=HISTORY_DEPTH):
+        self.depth = depth
+        self.sales = np.full((n_stores + 1, depth), np.nan)
+        self.customers = np.full((n_stores + 1, depth), np.nan)
+        self.head = np.zeros(n_stores + 1, dtype=np.int64)  # next slot to write
+        self.count = np.zeros(n_stores + 1, dtype=np.int64)
+        self.last_date = np.full(n_stores + 1, np.datetime64('NaT'), dtype='datetime64[D]')
+        self.features = np.full((n_stores + 1, len(HISTORY_FEATURES)), np.nan, dtype=np.float32)
+        self.ready = np.zeros(n_stores + 1, dtype=bool)
+        self.rolling = RollingWindowStats(n_stores + 1, ROLLING_WINDOWS)
+
+    @classmethod
+    def from_csv(cls, path="Data/train.csv", depth=HISTORY_DEPTH):
+        """Load the last ``depth`` days per store from a Rossmann train.csv-style file"""
+        df = pd.read_csv(path, usecols=['Store', 'Date', 'Sales', 'Customers'], parse_dates=['Date'])
+        df = df.sort_values(['Store', 'Date'], kind='stable')
+        return cls.from_frame(df, depth)
+
+    @classmethod
+    def from_table(cls, directory, depth=HISTORY_DEPTH):
+        """Load the last ``depth`` days per store from a memory-mapped feature table (see pipeline.py)"""
+        from .pipeline import recent_history
+        return cls.from_frame(recent_history(directory, depth), depth)
+
+    @classmethod
+    def from_frame(cls, df, depth=HISTORY_DEPTH):
+        """Build a store from a frame sorted by (Store, Date)"""
+        recent = df.groupby('Store', sort=False).tail(depth)
+        store_ids = recent['Store'].to_numpy(dtype=np.int64)
+        slots = recent.groupby('Store', sort=False).cumcount().to_numpy()
+
+        store = cls(int(store_ids.max()), depth)
+        store.sales[store_ids, slots] = recent['Sales'].to_numpy(dtype=np.float64)
+        store.customers[store_ids, slots] = recent['Customers'].to_numpy(dtype=np.float64)
+        counts = np.bincount(store_ids, minlength=len(store.head))
+        store.count[:] = counts
+        store.head[:] = counts % depth
+        latest = recent.groupby('Store', sort=False)['Date'].max()
+        store.last_date[latest.index.to_numpy()] = latest.to_numpy(dtype='datetime64[D]')
+        store.refresh()
+
+        logger.info(f"📦 Feature store built: {int(store.ready.sum())} stores with {depth} days of history")
+        return store
+
+    @property
+    def n_stores(self):
+        return len(self.head) - 1
+
+    def chronological(self, buffer, rows=None):
+        """Unroll a ring buffer into oldest-to-newest column order (every store, or only ``rows``)"""
+        rows = slice(None) if rows is None else np.asarray(rows, dtype=np.int64)
+        columns = (self.head[rows, None] + np.arange(self.depth)) % self.depth
+        return np.take_along_axis(buffer[rows], columns, axis=1)
+
+    def refresh(self, rows=None):
+        """Recompute the 11 history features exactly from the ring buffers (every store, or only ``rows``)"""
+        rows = np.arange(len(self.head)) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.rolling.reset(rows, self.chronological(self.sales, rows))
+        self._write_features(rows)
+
+    def _write_features(self, rows):
+        """Copy lags from the ring buffers and rolling stats from self.rolling into self.features"""
+        out = self.features
+        newest = self.head[rows]
+        for col, lag in enumerate(SALES_LAGS):
+            out[rows, col] = self.sales[rows, (newest - lag) % self.depth]
+        for col, lag in enumerate(CUSTOMER_LAGS, start=len(SALES_LAGS)):
+            out[rows, col] = self.customers[rows, (newest - lag) % self.depth]
+        n_windows = len(ROLLING_WINDOWS)
+        out[rows, 6:6 + n_windows] = self.rolling.mean[rows]
+        out[rows, 6 + n_windows:6 + 2 * n_windows] = self.rolling.std(rows)
+
+        # Same rule as the notebook: no customers -> SalesPerCustomer = 0
+        last_sales = self.sales[rows, (newest - 1) % self.depth]
+        last_customers = self.customers[rows, (newest - 1) % self.depth]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_customer = last_sales / last_customers
+        out[rows, 10] = np.where(last_customers > 0, per_customer, 0.0)
+
+        self.ready[rows] = self.count[rows] >= self.depth
+
+    def append_day(self, store_ids, sales, customers, date):
+        """Push one day of actuals (one row per store) into the ring buffers
+
+        Stores whose windows were already full slide their rolling stats
+        in O(1); the rest (and any due for an exact resync) are recomputed.
+        """
+        store_ids = np.asarray(store_ids, dtype=np.int64)
+        sales = np.broadcast_to(np.asarray(sales, dtype=np.float64), store_ids.shape)
+        slots = self.head[store_ids]
+        full = self.count[store_ids] >= self.depth
+        # Oldest day of each rolling window, about to leave it
+        removed = self.sales[store_ids[:, None], (slots[:, None] - self.rolling.windows) % self.depth]
+
+        self.sales[store_ids, slots] = sales
+        self.customers[store_ids, slots] = customers
+        self.head[store_ids] = (slots + 1) % self.depth
+        self.count[store_ids] += 1
+        self.last_date[store_ids] = np.datetime64(date, 'D')
+
+        sliding = store_ids[full]
+        self.rolling.slide(sliding, sales[full], removed[full])
+        exact = np.union1d(store_ids[~full], self.rolling.stale_rows(sliding))
+        if len(exact):
+            self.rolling.reset(exact, self.chronological(self.sales, exact))
+        self._write_features(store_ids)
+
+    def has_history(self, store_id):
+        """True if the store has enough history for every lag feature"""
+        return 0 < store_id <= self.n_stores and bool(self.ready[store_id])
+
+    def next_date(self, store_id):
+        """The only date whose lag and rolling features the history describes: the day after its last"""
+        return self.last_date[store_id] + 1
+
+    def lookup(self, store_ids):
+        """Gather the 11 history features for an array of store IDs"""
+        return self.features[np.asarray(store_ids, dtype=np.int64)]
+
+    def build_features(self, store_ids, dates, promo, school_holiday):
+        """Assemble the 17 scaled-block features (unscaled values) for each request row
+
+        History features are those of each store's latest day, so they are
+        only correct for ``dates`` equal to ``next_date(store)``.
+        """
+        store_ids = np.atleast_1d(np.asarray(store_ids, dtype=np.int64))
+        out = np.empty((len(store_ids), 6 + len(HISTORY_FEATURES)), dtype=np.float32)
+        out[:, :6] = calendar_features(dates, promo, school_holiday)
+        out[:, 6:] = self.lookup(store_ids)
+        return out
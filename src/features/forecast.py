@@ -0,0 +1,131 @@
+"""Multi-horizon recursive forecasting - every store steps forward together, one model call per day"""
+
+import numpy as np
+
+from .feature_store import CUSTOMER_LAGS, HISTORY_FEATURES, ROLLING_WINDOWS, SALES_LAGS, calendar_features
+from .store_table import OPEN_COLUMN
+
+N_SCALED = 6 + len(HISTORY_FEATURES)
+
+
+def history_origin(feature_store, store_ids):
+    """First day a forecast for ``store_ids`` can roll out from: the day after their shared last history day
+
+    Raises ValueError if the stores' histories end on different days.
+    """
+    next_dates = feature_store.next_date(np.asarray(store_ids, dtype=np.int64))
+    origin = next_dates.max()
+    behind = next_dates != origin
+    if behind.any():
+        raise ValueError(f"{int(np.count_nonzero(behind))} stores have history ending before {origin - 1}")
+    return origin
+
+
+class RecursiveForecast:
+    """Rolls a copy of the feature store history forward on its own predictions
+
+    All requested stores share one ring-buffer head, so each step is a
+    handful of column gathers over a (stores, depth) array, and their
+    histories must end on the same day (see ``history_origin``). Future
+    customer counts are unknown, so each day reuses the count from the same
+    weekday a week earlier (seasonal naive). Customers_Lag_* and
+    SalesPerCustomer are derived from that estimate. Closed days
+    (``open_flags`` = 0) are forecast as zero sales and zero customers, as
+    in the training data.
+
+    ``promo``, ``school_holiday`` and ``open_flags`` give one value per
+    forecast day shared by all stores, or one row per store (stores, horizon).
+    When ``start_date`` is after the day following the history, the gap days
+    are forecast first (open, no promotion or school holiday) so the lags
+    reach ``start_date``. They are not part of ``dates`` or ``forecast``;
+    ``steps`` counts them, so loop over ``range(steps)``.
+    """
+
+    def __init__(self, feature_store, store_table, store_ids, start_date, horizon,
+                 promo=None, school_holiday=None, open_flags=None):
+        self.store_ids = np.asarray(store_ids, dtype=np.int64)
+        self.horizon = horizon
+        self.origin = history_origin(feature_store, self.store_ids)
+        start = np.datetime64(start_date, 'D')
+        if start < self.origin:
+            raise ValueError(f"start_date {start} is before the day after the history ({self.origin})")
+        self.gap = int((start - self.origin).astype(np.int64))
+        self.steps = self.gap + horizon
+        self.dates = start + np.arange(horizon)
+        self.promo = self._per_store(promo, 0.0)
+        self.school_holiday = self._per_store(school_holiday, 0.0)
+        self.open_flags = self._per_store(open_flags, 1.0)
+
+        # Oldest-to-newest copies, so slot 0 is the next one to overwrite
+        self.depth = feature_store.depth
+        self.sales = feature_store.chronological(feature_store.sales)[self.store_ids]
+        self.customers = feature_store.chronological(feature_store.customers)[self.store_ids]
+        self.head = 0
+        self.unscaled = store_table.unscaled_block(self.store_ids)
+        self.forecast = np.zeros((len(self.store_ids), horizon), dtype=np.float64)
+
+    def _per_store(self, values, default):
+        """(stores, steps) array of a per-day input, with ``default`` on the gap days"""
+        out = np.full((len(self.store_ids), self.steps), default, dtype=np.float64)
+        if values is not None:
+            out[:, self.gap:] = np.asarray(values, dtype=np.float64)
+        return out
+
+    def _recent(self, buffer, lag):
+        return buffer[:, (self.head - lag) % self.depth]
+
+    def any_open(self, step):
+        """True if any store is open on ``step``, i.e. the step needs a model call"""
+        return bool((self.open_flags[:, step] == 1).any())
+
+    def features(self, step):
+        """Raw (n_stores, 22) matrix for step ``step`` (counting gap days)"""
+        n_stores = len(self.store_ids)
+        matrix = np.empty((n_stores, N_SCALED + self.unscaled.shape[1]), dtype=np.float32)
+        matrix[:, :6] = calendar_features(
+            np.repeat(self.origin + step, n_stores), self.promo[:, step], self.school_holiday[:, step]
+        )
+
+        col = 6
+        for lag in SALES_LAGS:
+            matrix[:, col] = self._recent(self.sales, lag)
+            col += 1
+        for lag in CUSTOMER_LAGS:
+            matrix[:, col] = self._recent(self.customers, lag)
+            col += 1
+        windows = [self.sales[:, (self.head - np.arange(w, 0, -1)) % self.depth] for w in ROLLING_WINDOWS]
+        for window in windows:
+            matrix[:, col] = window.mean(axis=1)
+            col += 1
+        for window in windows:
+            matrix[:, col] = window.std(axis=1, ddof=1)
+            col += 1
+        last_sales, last_customers = self._recent(self.sales, 1), self._recent(self.customers, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix[:, col] = np.where(last_customers > 0, last_sales / last_customers, 0.0)
+
+        matrix[:, N_SCALED:] = self.unscaled
+        matrix[:, N_SCALED + OPEN_COLUMN] = self.open_flags[:, step]
+        return matrix
+
+    def advance(self, step, predictions):
+        """Record step ``step``'s predictions and push them into the history window
+
+        ``predictions`` may be None when no store is open on that step.
+        """
+        is_open = self.open_flags[:, step] == 1
+        sales = np.zeros(len(self.store_ids))
+        if predictions is not None:
+            sales = np.where(is_open, np.clip(predictions, 0, None), 0.0)
+        customers = np.where(is_open, self._recent(self.customers, 7), 0.0)
+        if step >= self.gap:
+            self.forecast[:, step - self.gap] = sales
+        self.sales[:, self.head] = sales
+        self.customers[:, self.head] = customers
+        self.head = (self.head + 1) % self.depth
+
+    def run(self, predict_fn):
+        """Forecast every step synchronously with ``predict_fn(matrix) -> predictions``"""
+        for step in range(self.steps):
+            self.advance(step, predict_fn(self.features(step)) if self.any_open(step) else None)
+        return self.forecast
@@ -0,0 +1,367 @@
+"""Parallel feature engineering over the full sales history - a columnar, memory-mappable feature table
+
+Usage:
+    python -m src.features.pipeline build [--history Data/train.csv] [--stores Data/store.csv]
+                                          [--out Data/features] [--workers N] [--force]
+    python -m src.features.pipeline info [--out Data/features]
+
+The history is sorted by (Store, Date) once and split into contiguous
+store ranges. Each range is scored in a process pool with plain array
+operations: no groupby. A row's position within its store masks lags and
+windows that would reach into the previous store. Worker results are
+written straight into preallocated ``.npy`` column files at their row
+offsets.
+
+Table layout (one file per column, all the same length, sorted by Store then Date):
+    Data/features/manifest.json   columns, dtypes, row count and source file stamps
+    Data/features/<column>.npy    np.load(..., mmap_mode='r') shares pages between readers
+
+History features for day ``t`` only use days before ``t``, exactly like
+FeatureStore at serving time: Sales_Lag_1 is the previous day on record
+and the rolling windows end on that day. The first rows of each store,
+where a lag or window is not yet available, hold NaN.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .feature_store import calendar_features
+from .store_table import UNSCALED_FEATURES, StoreTable
+
+logger = logging.getLogger(__name__)
+
+TABLE_DIR = "Data/features"
+MANIFEST_FILE = "manifest.json"
+TABLE_VERSION = 1
+
+SALES_LAGS = (1, 7, 14, 21, 30)
+CUSTOMER_LAGS = (1, 7, 14, 30)
+ROLLING_WINDOWS = (7, 14, 30)
+STATE_HOLIDAY_CODES = {'0': 0, 'a': 1, 'b': 2, 'c': 3}
+
+# Every one of the 22 FEATURE_NAMES is a column, alongside the notebook's extra features
+CALENDAR_COLUMNS = ['DayOfWeek', 'Month', 'Quarter', 'IsWeekend', 'Promo', 'SchoolHoliday']
+HISTORY_COLUMNS = (
+    [f'Sales_Lag_{lag}' for lag in SALES_LAGS]
+    + [f'Customers_Lag_{lag}' for lag in CUSTOMER_LAGS]
+    + [f'Sales_Rolling_Mean_{w}' for w in ROLLING_WINDOWS]
+    + [f'Sales_Rolling_Std_{w}' for w in ROLLING_WINDOWS]
+    + ['SalesPerCustomer']
+)
+EXTRA_COLUMNS = [
+    'Year', 'Day', 'WeekOfYear', 'DayOfYear',
+    'Month_sin', 'Month_cos', 'DayOfWeek_sin', 'DayOfWeek_cos',
+    'StateHoliday', 'CompetitionMonthsOpen', 'Promo2', 'Promo2Weeks', 'PromoInterval',
+]
+# Store and Open are key columns with compact integer dtypes; the rest are float32 features
+KEY_DTYPES = {'Store': np.int16, 'Date': 'datetime64[D]', 'Sales': np.int32, 'Customers': np.int16, 'Open': np.int8}
+FLOAT_COLUMNS = [
+    name for name in CALENDAR_COLUMNS + HISTORY_COLUMNS + UNSCALED_FEATURES + EXTRA_COLUMNS
+    if name not in KEY_DTYPES
+]
+
+_STORE_TABLE = None  # set in each worker by _init_worker
+
+
+# PER-CHUNK FEATURES (run in worker processes)
+def _init_worker(store_table):
+    global _STORE_TABLE
+    _STORE_TABLE = store_table
+
+
+def positions_in_group(keys):
+    """0, 1, 2, ... restarting wherever a sorted ``keys`` array changes value"""
+    index = np.arange(len(keys))
+    starts = np.ones(len(keys), dtype=bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return index - np.maximum.accumulate(np.where(starts, index, 0))
+
+
+def lagged(values, lag, position):
+    """values[t - lag] within the same group, NaN where that reaches into the previous group"""
+    out = np.full(len(values), np.nan)
+    out[lag:] = values[:-lag]
+    out[position < lag] = np.nan
+    return out
+
+
+def trailing_window_stats(values, window, position):
+    """Mean and sample std of values[t - window .. t - 1] within the same group"""
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    if len(values) > window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)[:-1]
+        mean[window:] = windows.mean(axis=1)
+        std[window:] = windows.std(axis=1, ddof=1)
+    short = position < window
+    mean[short] = np.nan
+    std[short] = np.nan
+    return mean, std
+
+
+def iso_calendar(days):
+    """(ISO year, ISO week) for datetime64[D] days"""
+    day_of_week = (days.astype(np.int64) + 3) % 7  # Monday = 0
+    thursday = days - day_of_week + 3
+    iso_year = thursday.astype('datetime64[Y]')
+    week = (thursday - iso_year.astype('datetime64[D]')).astype(np.int64) // 7 + 1
+    return iso_year.astype(np.int64) + 1970, week
+
+
+def chunk_features(chunk):
+    """All FLOAT_COLUMNS for one contiguous, (Store, Date)-sorted block of stores"""
+    table = _STORE_TABLE
+    store_ids = chunk['Store']
+    days = chunk['Date']
+    sales = chunk['Sales'].astype(np.float64)
+    customers = chunk['Customers'].astype(np.float64)
+    position = positions_in_group(store_ids)
+
+    out = {}
+    calendar = calendar_features(days, chunk['Promo'], chunk['SchoolHoliday'])
+    for col, name in enumerate(CALENDAR_COLUMNS):
+        out[name] = calendar[:, col]
+
+    for lag in SALES_LAGS:
+        out[f'Sales_Lag_{lag}'] = lagged(sales, lag, position)
+    for lag in CUSTOMER_LAGS:
+        out[f'Customers_Lag_{lag}'] = lagged(customers, lag, position)
+    for window in ROLLING_WINDOWS:
+        out[f'Sales_Rolling_Mean_{window}'], out[f'Sales_Rolling_Std_{window}'] = (
+            trailing_window_stats(sales, window, position)
+        )
+    # Same rule as the notebook: no customers -> SalesPerCustomer = 0
+    last_sales, last_customers = out['Sales_Lag_1'], out['Customers_Lag_1']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['SalesPerCustomer'] = np.where(last_customers > 0, last_sales / last_customers,
+                                           np.where(np.isnan(last_customers), np.nan, 0.0))
+
+    unscaled = table.unscaled_block(store_ids, chunk['Open'])
+    for col, name in enumerate(UNSCALED_FEATURES):
+        if name not in KEY_DTYPES:
+            out[name] = unscaled[:, col]
+
+    year = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = out['Month']
+    day_of_week = out['DayOfWeek']
+    _, week = iso_calendar(days)
+    out['Year'] = year
+    out['Day'] = (days - days.astype('datetime64[M]').astype('datetime64[D]')).astype(np.int64) + 1
+    out['WeekOfYear'] = week
+    out['DayOfYear'] = (days - days.astype('datetime64[Y]').astype('datetime64[D]')).astype(np.int64) + 1
+    out['Month_sin'] = np.sin(2 * np.pi * month / 12)
+    out['Month_cos'] = np.cos(2 * np.pi * month / 12)
+    out['DayOfWeek_sin'] = np.sin(2 * np.pi * day_of_week / 7)
+    out['DayOfWeek_cos'] = np.cos(2 * np.pi * day_of_week / 7)
+    out['StateHoliday'] = chunk['StateHoliday']
+    out['CompetitionMonthsOpen'] = table.competition_months_open(store_ids, days)
+    out['Promo2'] = table.Promo2[store_ids]
+    out['Promo2Weeks'] = np.clip(
+        52 * (year - table.Promo2SinceYear[store_ids]) + (week - table.Promo2SinceWeek[store_ids]), 0, None
+    )
+    out['PromoInterval'] = table.PromoInterval[store_ids]
+    return {name: out[name].astype(np.float32, copy=False) for name in FLOAT_COLUMNS}
+
+
+def _score_range(start, stop, chunk):
+    return start, stop, chunk_features(chunk)
+
+
+# TABLE BUILD
+def load_history(path):
+    """train.csv columns as arrays sorted by (Store, Date)"""
+    df = pd.read_csv(
+        path, usecols=['Store', 'Date', 'Sales', 'Customers', 'Open', 'Promo', 'StateHoliday', 'SchoolHoliday'],
+        dtype={'StateHoliday': str}
+    )
+    store_ids = df['Store'].to_numpy(dtype=np.int64)
+    days = pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[D]')
+    order = np.lexsort((days, store_ids))
+    state_holiday = df['StateHoliday'].fillna('0').map(STATE_HOLIDAY_CODES).fillna(0).to_numpy(dtype=np.int8)
+    return {
+        'Store': store_ids[order],
+        'Date': days[order],
+        'Sales': df['Sales'].to_numpy(dtype=np.int64)[order],
+        'Customers': df['Customers'].to_numpy(dtype=np.int64)[order],
+        'Open': df['Open'].fillna(1).to_numpy(dtype=np.int8)[order],
+        'Promo': df['Promo'].fillna(0).to_numpy(dtype=np.int8)[order],
+        'SchoolHoliday': df['SchoolHoliday'].fillna(0).to_numpy(dtype=np.int8)[order],
+        'StateHoliday': state_holiday[order],
+    }
+
+
+def store_ranges(store_ids, n_chunks):
+    """Split sorted ``store_ids`` into about ``n_chunks`` [start, stop) row ranges on store boundaries"""
+    n_rows = len(store_ids)
+    boundaries = np.flatnonzero(np.diff(store_ids)) + 1
+    if len(boundaries) == 0:
+        return [(0, n_rows)]
+    # Move each even split point forward to the next store boundary
+    targets = np.linspace(0, n_rows, n_chunks + 1)[1:-1]
+    cuts = np.unique(boundaries[np.minimum(np.searchsorted(boundaries, targets), len(boundaries) - 1)])
+    edges = np.concatenate([[0], cuts, [n_rows]]).astype(np.int64)
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return {"path": path, "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def is_fresh(out_dir, sources):
+    """True if ``out_dir`` holds a complete table built from exactly these source files"""
+    manifest = read_manifest(out_dir)
+    return (manifest is not None and manifest.get("table_version") == TABLE_VERSION
+            and manifest.get("sources") == sources
+            and all(os.path.exists(os.path.join(out_dir, f"{name}.npy")) for name in manifest["columns"]))
+
+
+def build_feature_table(history_path="Data/train.csv", stores_path="Data/store.csv", out_dir=TABLE_DIR,
+                        workers=None, force=False):
+    """Build (or reuse) the feature table; returns its manifest"""
+    sources = [source_stamp(history_path), source_stamp(stores_path)]
+    if not force and is_fresh(out_dir, sources):
+        logger.info(f"✅ Feature table in {out_dir} is up to date")
+        return read_manifest(out_dir)
+
+    start_time = time.perf_counter()
+    store_table = StoreTable.from_csv(stores_path)
+    history = load_history(history_path)
+    n_rows = len(history['Store'])
+    workers = workers or os.cpu_count() or 1
+    ranges = store_ranges(history['Store'], workers * 4)
+    logger.info(f"🔄 Building features for {n_rows} rows in {len(ranges)} chunks on {workers} processes")
+
+    os.makedirs(out_dir, exist_ok=True)
+    # Drop the manifest first so a half-written table is never mistaken for a fresh one
+    if os.path.exists(os.path.join(out_dir, MANIFEST_FILE)):
+        os.remove(os.path.join(out_dir, MANIFEST_FILE))
+
+    columns = {}
+    for name, dtype in KEY_DTYPES.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), history[name].astype(dtype))
+        columns[name] = np.dtype(dtype).str
+    outputs = {
+        name: np.lib.format.open_memmap(os.path.join(out_dir, f"{name}.npy"), mode='w+',
+                                        dtype=np.float32, shape=(n_rows,))
+        for name in FLOAT_COLUMNS
+    }
+    columns.update({name: np.dtype(np.float32).str for name in FLOAT_COLUMNS})
+
+    inputs = ['Store', 'Date', 'Sales', 'Customers', 'Open', 'Promo', 'SchoolHoliday', 'StateHoliday']
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_table,)) as pool:
+        futures = [
+            pool.submit(_score_range, start, stop, {name: history[name][start:stop] for name in inputs})
+            for start, stop in ranges
+        ]
+        for future in as_completed(futures):
+            start, stop, features = future.result()
+            for name, values in features.items():
+                outputs[name][start:stop] = values
+    for array in outputs.values():
+        array.flush()
+    del outputs
+
+    manifest = {
+        "table_version": TABLE_VERSION,
+        "rows": n_rows,
+        "stores": int(len(np.unique(history['Store']))),
+        "first_date": str(history['Date'].min()),
+        "last_date": str(history['Date'].max()),
+        "columns": columns,
+        "sources": sources,
+        "built_at": datetime.now().isoformat(),
+        "build_seconds": time.perf_counter() - start_time,
+        "workers": workers,
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"✅ Feature table written to {out_dir} in {manifest['build_seconds']:.1f}s")
+    return manifest
+
+
+# TABLE READERS
+def read_manifest(out_dir=TABLE_DIR):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_feature_table(out_dir=TABLE_DIR, columns=None, mmap=True):
+    """{column: array} for the requested columns (default: all), memory-mapped read-only by default"""
+    manifest = read_manifest(out_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No feature table in {out_dir}")
+    names = list(manifest["columns"]) if columns is None else list(columns)
+    return {
+        name: np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode='r' if mmap else None)
+        for name in names
+    }
+
+
+def recent_history(out_dir=TABLE_DIR, depth=30, before=None):
+    """The last ``depth`` rows per store of Store/Date/Sales/Customers as a frame sorted by (Store, Date)
+
+    With ``before``, only rows dated before it are considered (e.g. the history at a backtest cutoff).
+    """
+    table = load_feature_table(out_dir, ['Store', 'Date', 'Sales', 'Customers'])
+    rows = (np.arange(len(table['Store'])) if before is None
+            else np.flatnonzero(np.asarray(table['Date']) < np.datetime64(before, 'D')))
+    store_ids = np.asarray(table['Store'], dtype=np.int64)[rows]
+    ends = np.append(np.flatnonzero(np.diff(store_ids)) + 1, len(store_ids))
+    group_end = np.repeat(ends, np.diff(ends, prepend=0))
+    keep = rows[group_end - np.arange(len(store_ids)) <= depth]
+    return pd.DataFrame({
+        'Store': np.asarray(table['Store'], dtype=np.int64)[keep],
+        'Date': pd.to_datetime(table['Date'][keep]),
+        'Sales': table['Sales'][keep],
+        'Customers': table['Customers'][keep],
+    })
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.features.pipeline", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Build the feature table (skipped if up to date)")
+    build_cmd.add_argument("--history", default="Data/train.csv")
+    build_cmd.add_argument("--stores", default="Data/store.csv")
+    build_cmd.add_argument("--out", default=TABLE_DIR)
+    build_cmd.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    build_cmd.add_argument("--force", action="store_true", help="Rebuild even if the table is up to date")
+
+    info_cmd = commands.add_parser("info", help="Show a table's manifest")
+    info_cmd.add_argument("--out", default=TABLE_DIR)
+    return parser
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = build_parser().parse_args(argv)
+    if args.command == "info":
+        manifest = read_manifest(args.out)
+        if manifest is None:
+            print(f"✘ No feature table in {args.out}")
+            return 1
+        print(json.dumps({k: v for k, v in manifest.items() if k != "columns"}, indent=2))
+        print(f"{len(manifest['columns'])} columns: {', '.join(manifest['columns'])}")
+        return 0
+
+    manifest = build_feature_table(args.history, args.stores, args.out, args.workers, args.force)
+    print(f"✔ {manifest['rows']} rows x {len(manifest['columns'])} columns in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
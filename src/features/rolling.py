@@ -0,0 +1,141 @@
+"""Incremental rolling mean/std per store - O(1) per store when a day slides into the window
+
+Usage:
+    python -m src.features.rolling check [--history Data/train.csv] [--stores 50]
+
+``check`` replays a history day by day through FeatureStore.append_day and
+compares every store's lag and rolling features with a pandas
+``groupby().rolling()`` reference.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class RollingWindowStats:
+    """Mean and sum of squared deviations (M2) of the last ``w`` sales for every window ``w``
+
+    Arrays are (rows, windows), indexed by store ID like FeatureStore. When a
+    day enters a full window and the oldest day leaves it, mean and M2 are
+    updated with the sliding-window form of Welford's recurrence::
+
+        mean' = mean + (x_new - x_old) / w
+        M2'   = M2 + (x_new - x_old) * (x_new - mean' + x_old - mean)
+
+    Unlike running sums of squares this never subtracts two large, nearly
+    equal numbers, so the variance stays accurate for large sales values.
+    Rounding still accumulates slowly, so a row is recomputed exactly from
+    its window after ``resync_every`` slides.
+    """
+
+    def __init__(self, n_rows, windows, resync_every=365):
+        self.windows = np.asarray(windows, dtype=np.int64)
+        self.resync_every = resync_every
+        self.mean = np.full((n_rows, len(windows)), np.nan)
+        self.m2 = np.full((n_rows, len(windows)), np.nan)
+        self.slides = np.zeros(n_rows, dtype=np.int64)
+
+    def reset(self, rows, history):
+        """Exact two-pass stats for ``rows`` from their (len(rows), >= max window) oldest-to-newest sales"""
+        for col, window in enumerate(self.windows):
+            recent = history[:, -window:]
+            mean = recent.mean(axis=1)
+            self.mean[rows, col] = mean
+            self.m2[rows, col] = ((recent - mean[:, None]) ** 2).sum(axis=1)
+        self.slides[rows] = 0
+
+    def slide(self, rows, added, removed):
+        """Push ``added`` (len(rows),) into every window and drop ``removed`` (len(rows), windows)"""
+        delta = added[:, None] - removed
+        mean = self.mean[rows]
+        new_mean = mean + delta / self.windows
+        self.m2[rows] = np.maximum(self.m2[rows] + delta * (added[:, None] - new_mean + removed - mean), 0.0)
+        self.mean[rows] = new_mean
+        self.slides[rows] += 1
+
+    def stale_rows(self, rows):
+        """Rows among ``rows`` due for an exact recompute"""
+        return rows[self.slides[rows] >= self.resync_every]
+
+    def std(self, rows):
+        """Sample (ddof=1) standard deviation per window, like pandas rolling().std()"""
+        return np.sqrt(self.m2[rows] / (self.windows - 1))
+
+
+# PANDAS REFERENCE CHECK
+def pandas_reference(df):
+    """History features of each store's last day, computed with pandas rolling()"""
+    from .feature_store import HISTORY_FEATURES, ROLLING_WINDOWS, SALES_LAGS
+
+    grouped = df.groupby('Store', sort=False)
+    sales = grouped['Sales']
+    out = pd.DataFrame(index=df.index)
+    for lag in SALES_LAGS:
+        out[f'Sales_Lag_{lag}'] = sales.shift(lag - 1)
+    out['Customers_Lag_1'] = df['Customers']
+    out['Customers_Lag_7'] = grouped['Customers'].shift(6)
+    for window in ROLLING_WINDOWS:
+        out[f'Sales_Rolling_Mean_{window}'] = sales.rolling(window).mean().reset_index(level=0, drop=True)
+    for window in ROLLING_WINDOWS:
+        out[f'Sales_Rolling_Std_{window}'] = sales.rolling(window).std().reset_index(level=0, drop=True)
+    out['SalesPerCustomer'] = np.where(df['Customers'] > 0, df['Sales'] / df['Customers'].where(df['Customers'] > 0), 0.0)
+    last = out.groupby(df['Store'], sort=False).tail(1)[HISTORY_FEATURES]
+    last.index = df.loc[last.index, 'Store'].to_numpy()
+    return last
+
+
+def check(history_path, n_stores=None, rtol=1e-6):
+    """Replay ``history_path`` through append_day and compare with pandas; returns max relative error"""
+    from .feature_store import HISTORY_FEATURES, FeatureStore
+
+    df = pd.read_csv(history_path, usecols=['Store', 'Date', 'Sales', 'Customers'], parse_dates=['Date'])
+    if n_stores:
+        df = df[df['Store'] <= n_stores]
+    df = df.sort_values(['Store', 'Date'], kind='stable').reset_index(drop=True)
+
+    store = FeatureStore(int(df['Store'].max()))
+    update_seconds = []
+    for date, day in df.groupby('Date', sort=True):
+        start = time.perf_counter()
+        store.append_day(day['Store'].to_numpy(), day['Sales'].to_numpy(dtype=np.float64),
+                         day['Customers'].to_numpy(dtype=np.float64), date)
+        update_seconds.append(time.perf_counter() - start)
+
+    reference = pandas_reference(df)
+    reference = reference[store.ready[reference.index.to_numpy()]]
+    expected = reference.to_numpy(dtype=np.float64)
+    actual = store.lookup(reference.index.to_numpy()).astype(np.float64)
+    scale = np.maximum(np.abs(expected), 1.0)
+    error = np.abs(actual - expected) / scale
+
+    print(f"✔ {len(update_seconds)} daily updates, median {1000 * np.median(update_seconds):.3f} ms")
+    for name, worst in zip(HISTORY_FEATURES, error.max(axis=0, initial=0.0)):
+        print(f"  {name:<22} max rel. error {worst:.2e}")
+    # Features are stored as float32, so agreement is bounded at ~1e-7
+    worst = float(error.max(initial=0.0))
+    print(f"{'✔' if worst <= rtol else '✘'} {len(reference)} stores compared, max rel. error {worst:.2e}")
+    return worst
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.features.rolling", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    check_cmd = commands.add_parser("check", help="Compare incremental features with pandas rolling()")
+    check_cmd.add_argument("--history", default="Data/train.csv")
+    check_cmd.add_argument("--stores", type=int, default=None, help="Only stores 1..N (default: all)")
+    check_cmd.add_argument("--rtol", type=float, default=1e-6)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    worst = check(args.history, args.stores, args.rtol)
+    return 0 if worst <= args.rtol else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Static store metadata from store.csv preindexed by store ID"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Label encodings used by the model (alphabetical, as in the dashboard)
+STORE_TYPE_CODES = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+ASSORTMENT_CODES = {'a': 0, 'b': 1, 'c': 2}
+PROMO_INTERVAL_CODES = {'None': 0, 'Jan,Apr,Jul,Oct': 1, 'Feb,May,Aug,Nov': 2, 'Mar,Jun,Sept,Dec': 3}
+
+# Columns of StoreTable.unscaled - the last 5 entries of FEATURE_NAMES
+UNSCALED_FEATURES = ['Store', 'Open', 'StoreType', 'Assortment', 'CompetitionDistance']
+OPEN_COLUMN = 1
+
+
+class StoreTable:
+    """Dense per-store arrays (row = store ID) with categorical encodings precomputed
+
+    Row 0 is unused so a store ID indexes its row directly; unknown stores
+    have ``known`` set to False.
+    """
+
+    def __init__(self, df):
+        n_rows = int(df['Store'].max()) + 1
+        ids = df['Store'].to_numpy(dtype=np.int64)
+
+        self.known = np.zeros(n_rows, dtype=bool)
+        self.known[ids] = True
+
+        # Same missing-value rules as the notebook cleaning step
+        distance = df['CompetitionDistance'].fillna(df['CompetitionDistance'].median())
+        columns = {
+            'StoreType': df['StoreType'].map(STORE_TYPE_CODES),
+            'Assortment': df['Assortment'].map(ASSORTMENT_CODES),
+            'CompetitionDistance': distance,
+            'CompetitionOpenSinceMonth': df['CompetitionOpenSinceMonth'].fillna(0),
+            'CompetitionOpenSinceYear': df['CompetitionOpenSinceYear'].fillna(0),
+            'Promo2': df['Promo2'],
+            'Promo2SinceWeek': df['Promo2SinceWeek'].fillna(0),
+            'Promo2SinceYear': df['Promo2SinceYear'].fillna(0),
+            'PromoInterval': df['PromoInterval'].fillna('None').replace('', 'None').map(PROMO_INTERVAL_CODES),
+        }
+        for name, values in columns.items():
+            array = np.zeros(n_rows, dtype=np.float32)
+            array[ids] = values.to_numpy(dtype=np.float32)
+            setattr(self, name, array)
+
+        # Unscaled block of features_final, ready for a single row gather
+        self.unscaled = np.zeros((n_rows, len(UNSCALED_FEATURES)), dtype=np.float32)
+        self.unscaled[:, 0] = np.arange(n_rows)
+        self.unscaled[:, OPEN_COLUMN] = 1
+        self.unscaled[:, 2] = self.StoreType
+        self.unscaled[:, 3] = self.Assortment
+        self.unscaled[:, 4] = self.CompetitionDistance
+
+    @classmethod
+    def from_csv(cls, path="Data/store.csv"):
+        """Load and index a Rossmann store.csv file"""
+        table = cls(pd.read_csv(path, keep_default_na=True))
+        logger.info(f"🏪 Store table loaded: {int(table.known.sum())} stores")
+        return table
+
+    def is_known(self, store_id):
+        return 0 < store_id < len(self.known) and bool(self.known[store_id])
+
+    def unscaled_block(self, store_ids, open_flags=1):
+        """Gather [Store, Open, StoreType, Assortment, CompetitionDistance] for each store ID"""
+        block = self.unscaled[np.atleast_1d(np.asarray(store_ids, dtype=np.int64))]
+        block[:, OPEN_COLUMN] = open_flags
+        return block
+
+    def competition_months_open(self, store_ids, dates):
+        """Months since the nearest competitor opened, clipped at 0 (CompetitionMonthsOpen)"""
+        store_ids = np.asarray(store_ids, dtype=np.int64)
+        months = np.asarray(dates, dtype='datetime64[M]').astype(np.int64)
+        year, month = months // 12 + 1970, months % 12 + 1
+        open_months = (12 * (year - self.CompetitionOpenSinceYear[store_ids])
+                       + (month - self.CompetitionOpenSinceMonth[store_ids]))
+        return np.clip(open_months, 0, None)
+
+    def as_dict(self, store_id):
+        """Metadata for one store in API response form"""
+        fields = [
+            'StoreType', 'Assortment', 'CompetitionDistance', 'CompetitionOpenSinceMonth',
+            'CompetitionOpenSinceYear', 'Promo2', 'Promo2SinceWeek', 'Promo2SinceYear',
+            'PromoInterval'
+        ]
+        record = {"Store": int(store_id)}
+        for name in fields:
+            value = getattr(self, name)[store_id]
+            record[name] = float(value) if name == 'CompetitionDistance' else int(value)
+        return record
@@ -0,0 +1,214 @@
+"""Per-store and per-StoreType error drift tracking with incremental statistics"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+N_STORES = 1115
+STORE_TYPE_NAMES = ['a', 'b', 'c', 'd']
+
+# Error % histogram edges for the per-store quantile sketch (last bin is open-ended)
+ERROR_PCT_EDGES = np.concatenate([[0.0], np.geomspace(0.1, 1000.0, 63)])
+
+
+class StoreDriftMonitor:
+    """Dense per-store error accumulators (row = store ID, row 0 unused)
+
+    Each store keeps a count, Welford running mean/M2 of the signed error
+    (predicted - actual), sums of |error| and error %, and a fixed-bin
+    histogram of error % as a quantile sketch. A logged prediction touches
+    one row of each array, so it costs a few microseconds, and every query
+    is a vectorized pass over all stores. StoreType figures are merged from
+    the store rows with Chan's parallel formula rather than tracked twice.
+
+    Stores differ too much in volume for one RMSE baseline, so each store
+    learns its own: its first ``min_count`` observations are frozen as its
+    baseline, unless one was given with ``set_baseline``. Alerts compare the
+    RMSE of the observations after the baseline with it.
+    """
+
+    def __init__(self, n_stores=N_STORES, store_types=None, threshold_degradation=0.15, min_count=30):
+        n_rows = n_stores + 1
+        self.n_stores = n_stores
+        self.store_types = (np.zeros(n_rows, dtype=np.int64) if store_types is None
+                            else np.asarray(store_types, dtype=np.int64)[:n_rows])
+        self.threshold_degradation = threshold_degradation
+        self.min_count = min_count
+
+        # NaN until learned or set; count and squared-error sum at the time it was fixed
+        self.baseline_rmse = np.full(n_rows, np.nan, dtype=np.float64)
+        self.baseline_count = np.zeros(n_rows, dtype=np.int64)
+        self.baseline_sq = np.zeros(n_rows, dtype=np.float64)
+
+        self.count = np.zeros(n_rows, dtype=np.int64)
+        self.mean = np.zeros(n_rows, dtype=np.float64)
+        self.m2 = np.zeros(n_rows, dtype=np.float64)
+        self.abs_sum = np.zeros(n_rows, dtype=np.float64)
+        self.pct_sum = np.zeros(n_rows, dtype=np.float64)
+        self.pct_hist = np.zeros((n_rows, len(ERROR_PCT_EDGES)), dtype=np.int64)
+
+    @classmethod
+    def from_store_table(cls, store_table, **kwargs):
+        """Size the arrays and StoreType segments from a StoreTable"""
+        return cls(len(store_table.known) - 1, store_types=store_table.StoreType, **kwargs)
+
+    def _squared_error_sum(self, rows):
+        return self.m2[rows] + self.count[rows] * self.mean[rows] ** 2
+
+    def _learn_baselines(self, rows):
+        """Freeze the RMSE so far as the baseline of ``rows`` that reached ``min_count`` without one"""
+        rows = rows[np.isnan(self.baseline_rmse[rows]) & (self.count[rows] >= self.min_count)]
+        if len(rows) == 0:
+            return
+        squared = self._squared_error_sum(rows)
+        self.baseline_rmse[rows] = np.sqrt(squared / self.count[rows])
+        self.baseline_count[rows] = self.count[rows]
+        self.baseline_sq[rows] = squared
+
+    @staticmethod
+    def _error_pct(error, actual):
+        return np.where(actual > 0, np.abs(error) / np.where(actual > 0, actual, 1.0) * 100, 0.0)
+
+    def update(self, store_id, actual, predicted):
+        """Add one prediction/actual pair (Welford update)"""
+        error = predicted - actual
+        error_pct = abs(error) / actual * 100 if actual > 0 else 0.0
+
+        n = self.count[store_id] + 1
+        delta = error - self.mean[store_id]
+        self.mean[store_id] += delta / n
+        self.m2[store_id] += delta * (error - self.mean[store_id])
+        self.count[store_id] = n
+        self.abs_sum[store_id] += abs(error)
+        self.pct_sum[store_id] += error_pct
+        self.pct_hist[store_id, np.searchsorted(ERROR_PCT_EDGES, error_pct, side='right') - 1] += 1
+        self._learn_baselines(np.array([store_id]))
+
+    def update_many(self, store_ids, actual, predicted):
+        """Add many pairs at once by merging per-store batch moments (Chan et al.)"""
+        store_ids = np.asarray(store_ids, dtype=np.int64)
+        actual = np.asarray(actual, dtype=np.float64)
+        error = np.asarray(predicted, dtype=np.float64) - actual
+        n_rows = len(self.count)
+
+        batch_n = np.bincount(store_ids, minlength=n_rows)
+        touched = batch_n > 0
+        batch_mean = np.zeros(n_rows)
+        batch_mean[touched] = np.bincount(store_ids, error, n_rows)[touched] / batch_n[touched]
+        batch_m2 = np.bincount(store_ids, (error - batch_mean[store_ids]) ** 2, n_rows)
+
+        total = self.count + batch_n
+        delta = batch_mean - self.mean
+        safe_total = np.maximum(total, 1)
+        self.m2 += batch_m2 + delta ** 2 * self.count * batch_n / safe_total
+        self.mean += delta * batch_n / safe_total
+        self.count = total
+
+        error_pct = self._error_pct(error, actual)
+        self.abs_sum += np.bincount(store_ids, np.abs(error), n_rows)
+        self.pct_sum += np.bincount(store_ids, error_pct, n_rows)
+        bins = np.searchsorted(ERROR_PCT_EDGES, error_pct, side='right') - 1
+        np.add.at(self.pct_hist, (store_ids, bins), 1)
+        self._learn_baselines(np.flatnonzero(touched))
+
+    def set_baseline(self, rmse):
+        """Baseline RMSE to compare later observations against - a scalar or one value per store row"""
+        rows = np.arange(len(self.count))
+        self.baseline_rmse[:] = rmse
+        self.baseline_count[:] = self.count
+        self.baseline_sq[:] = self._squared_error_sum(rows)
+
+    def store_metrics(self):
+        """Per-store arrays (index = store ID): count, bias, std, rmse, mae, mape"""
+        n = np.maximum(self.count, 1)
+        variance = self.m2 / n
+        return {
+            'count': self.count,
+            'bias': self.mean,
+            'std': np.sqrt(variance),
+            'rmse': np.sqrt(variance + self.mean ** 2),
+            'mae': self.abs_sum / n,
+            'mape': self.pct_sum / n,
+        }
+
+    def segment_metrics(self):
+        """Per-StoreType count, bias, std, rmse, mae and mape"""
+        n_segments = len(STORE_TYPE_NAMES)
+        types = self.store_types
+        count = np.bincount(types, self.count, n_segments)
+        safe_count = np.maximum(count, 1)
+        mean = np.bincount(types, self.count * self.mean, n_segments) / safe_count
+        m2 = np.bincount(types, self.m2 + self.count * (self.mean - mean[types]) ** 2, n_segments)
+        variance = m2 / safe_count
+        mae = np.bincount(types, self.abs_sum, n_segments) / safe_count
+        mape = np.bincount(types, self.pct_sum, n_segments) / safe_count
+
+        return {
+            name: {
+                'count': int(count[code]),
+                'bias': float(mean[code]),
+                'std': float(np.sqrt(variance[code])),
+                'rmse': float(np.sqrt(variance[code] + mean[code] ** 2)),
+                'mae': float(mae[code]),
+                'mape': float(mape[code]),
+            }
+            for code, name in enumerate(STORE_TYPE_NAMES)
+        }
+
+    def error_pct_quantile(self, q):
+        """Per-store q-quantile of error % from the histogram sketch (upper bin edge, NaN if no data)"""
+        cumulative = np.cumsum(self.pct_hist, axis=1)
+        target = np.ceil(q * self.count)
+        bins = (cumulative < target[:, None]).sum(axis=1)
+        upper_edges = np.append(ERROR_PCT_EDGES[1:], np.inf)
+        return np.where(self.count > 0, upper_edges[np.minimum(bins, len(upper_edges) - 1)], np.nan)
+
+    def alerts(self):
+        """Stores whose RMSE since their baseline exceeds it by more than the degradation threshold"""
+        rows = np.arange(len(self.count))
+        n_since = self.count - self.baseline_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rmse = np.sqrt(np.maximum(self._squared_error_sum(rows) - self.baseline_sq, 0) / np.maximum(n_since, 1))
+            degradation = (rmse - self.baseline_rmse) / self.baseline_rmse
+        flagged = np.flatnonzero((n_since >= self.min_count) & ~np.isnan(self.baseline_rmse)
+                                 & (degradation > self.threshold_degradation))
+        if len(flagged):
+            logger.warning(f"🚨 ALERT: RMSE degradation at {len(flagged)} stores")
+        return [
+            {
+                'store_id': int(store),
+                'store_type': STORE_TYPE_NAMES[self.store_types[store]],
+                'count': int(n_since[store]),
+                'rmse': float(rmse[store]),
+                'baseline_rmse': float(self.baseline_rmse[store]),
+                'rmse_degradation_pct': float(degradation[store] * 100),
+            }
+            for store in flagged
+        ]
+
+    def worst_stores(self, k=10, metric='rmse'):
+        """Top-k stores by ``metric`` among stores with at least ``min_count`` observations"""
+        metrics = self.store_metrics()
+        values = np.where(self.count >= self.min_count, metrics[metric], -np.inf)
+        k = min(k, int(np.count_nonzero(np.isfinite(values))))
+        if k == 0:
+            return []
+        top = np.argpartition(values, -k)[-k:]
+        top = top[np.argsort(values[top])[::-1]]
+        return [
+            {
+                'store_id': int(store),
+                'store_type': STORE_TYPE_NAMES[self.store_types[store]],
+                'count': int(self.count[store]),
+                **{name: float(metrics[name][store]) for name in ('bias', 'rmse', 'mae', 'mape')},
+            }
+            for store in top
+        ]
+
+    def reset(self):
+        """Clear all accumulators (e.g. after a model reload); baselines are kept"""
+        for array in (self.count, self.mean, self.m2, self.abs_sum, self.pct_sum, self.pct_hist,
+                      self.baseline_count, self.baseline_sq):
+            array[...] = 0
@@ -0,0 +1,151 @@
+"""Joining served predictions with later actuals and feeding them to PerformanceMonitor in bulk"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _day_numbers(dates):
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+class ServedPredictions:
+    """Last prediction served per (store, date) for the most recent ``retention_days`` dates
+
+    Dense (store, day-slot) arrays, where the slot is the date's day number
+    modulo ``retention_days``. Each slot remembers which day it currently
+    holds, so old dates are overwritten in place and memory never grows.
+    Each cell also keeps the model version that served it, stored as a small
+    integer code. Cells are written from the event loop and read from the
+    ingestion thread. A single cell write is atomic enough for this use, so
+    there is no lock.
+    """
+
+    def __init__(self, n_stores=1115, retention_days=62):
+        self.retention_days = retention_days
+        self.prediction = np.full((n_stores + 1, retention_days), np.nan, dtype=np.float64)
+        self.version = np.zeros((n_stores + 1, retention_days), dtype=np.int16)
+        self.slot_day = np.full(retention_days, np.iinfo(np.int64).min, dtype=np.int64)
+        self.versions = []
+        self._version_codes = {}
+
+    def _version_code(self, version):
+        code = self._version_codes.get(version)
+        if code is None:
+            code = self._version_codes[version] = len(self.versions)
+            self.versions.append(version)
+        return code
+
+    def record(self, store_id, date, prediction, version):
+        """Remember one served prediction"""
+        day = int(_day_numbers(date))
+        slot = day % self.retention_days
+        if self.slot_day[slot] != day:
+            if day < self.slot_day[slot]:
+                return  # older than the retained window
+            self.prediction[:, slot] = np.nan
+            self.slot_day[slot] = day
+        self.prediction[store_id, slot] = prediction
+        self.version[store_id, slot] = self._version_code(version)
+
+    def code(self, version):
+        """Integer code of ``version``, or -1 if it never served a prediction"""
+        return self._version_codes.get(version, -1)
+
+    def lookup(self, store_ids, dates):
+        """Vectorized join: (predictions, version codes, matched mask) for each (store, date)"""
+        store_ids = np.asarray(store_ids, dtype=np.int64)
+        days = _day_numbers(dates)
+        slots = days % self.retention_days
+        in_range = (store_ids > 0) & (store_ids < len(self.prediction))
+        rows = np.where(in_range, store_ids, 0)
+        predictions = self.prediction[rows, slots]
+        matched = in_range & (self.slot_day[slots] == days) & ~np.isnan(predictions)
+        return predictions, self.version[rows, slots], matched
+
+
+class ActualsIngestor:
+    """Feeds (store, date, actual) batches to a PerformanceMonitor on one background thread
+
+    The single worker serializes every monitor update, so the monitor needs
+    no lock, and requests return as soon as their batch is queued. Each
+    batch is joined only with predictions served by the version that was
+    active when it was submitted, so after a hot swap actuals are never
+    scored against another version's predictions.
+    """
+
+    def __init__(self, monitor, served):
+        self.monitor = monitor
+        self.served = served
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="actuals")
+        # Each counter has a single writer thread: submitted (event loop), completed (worker)
+        self.submitted = 0
+        self.completed = 0
+
+        self.batches = 0
+        self.received = 0
+        self.matched = 0
+        self.other_version = 0
+        self.matched_by_version = {}
+
+    def submit(self, store_ids, dates, actuals, version=None):
+        """Queue a batch; the join and monitor update run on the worker thread"""
+        self.submitted += 1
+        return self._worker.submit(self._ingest, store_ids, dates, actuals, version)
+
+    def call(self, fn, *args):
+        """Run ``fn`` on the worker thread, ordered with ingestion (e.g. monitor reports)"""
+        return self._worker.submit(fn, *args)
+
+    def _ingest(self, store_ids, dates, actuals, version):
+        try:
+            return self._join_and_log(store_ids, dates, actuals, version)
+        except Exception as e:
+            logger.error(f"❌ Actuals ingestion failed: {e}", exc_info=True)
+            return 0
+        finally:
+            self.completed += 1
+
+    def _join_and_log(self, store_ids, dates, actuals, version=None):
+        store_ids = np.asarray(store_ids, dtype=np.int64)
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        actuals = np.asarray(actuals, dtype=np.float64)
+
+        predictions, versions, matched = self.served.lookup(store_ids, dates)
+        if version is not None:
+            other = matched & (versions != self.served.code(version))
+            self.other_version += int(np.count_nonzero(other))
+            matched &= ~other
+        n_matched = int(np.count_nonzero(matched))
+        if n_matched:
+            self.monitor.log_predictions(
+                actuals[matched], predictions[matched], store_ids[matched],
+                timestamps=dates[matched].astype('datetime64[ns]')
+            )
+            counts = np.bincount(versions[matched], minlength=len(self.served.versions))
+            for code in np.flatnonzero(counts):
+                version = self.served.versions[code]
+                self.matched_by_version[version] = self.matched_by_version.get(version, 0) + int(counts[code])
+
+        self.batches += 1
+        self.received += len(store_ids)
+        self.matched += n_matched
+        logger.debug(f"📥 Actuals batch: {n_matched}/{len(store_ids)} matched served predictions")
+        return n_matched
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "received": self.received,
+            "matched": self.matched,
+            "unmatched": self.received - self.matched,
+            "other_version": self.other_version,
+            "matched_by_version": dict(self.matched_by_version),
+            "pending_batches": self.submitted - self.completed,
+        }
+
+    def shutdown(self):
+        self._worker.shutdown(wait=True)
@@ -8,25 +8,89 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns of the running-sum table: |error|, error^2, error %
+_ABS, _SQ, _PCT = range(3)
+
+
+def _epoch_seconds(timestamps):
+    """Naive datetimes -> float seconds, read as UTC like pd.to_datetime(unit='s') reads them back"""
+    return np.asarray(timestamps, dtype="datetime64[ns]").astype(np.int64) / 1e9
+
+
 class PerformanceMonitor:
-    """Monitor model performance and system health"""
-    
-    def __init__(self, baseline_rmse=147015, baseline_mape=1.65):
+    """Monitor model performance and system health
+
+    The last ``capacity`` predictions live in fixed-size numpy ring buffers,
+    so memory is capped however long the API runs. Alongside them is a ring
+    of cumulative sums of |error|, error^2 and error %. The sum over any
+    trailing window of up to ``capacity - 1`` predictions is then the
+    difference of two cumulative rows. That makes logging and RMSE/MAE/MAPE
+    queries O(1) for any window, and lifetime metrics come from the
+    newest cumulative row.
+
+    An optional StoreDriftMonitor (``drift``) receives every logged
+    prediction as well, adding per-store and per-StoreType views. An
+    optional PredictionLog (``prediction_log``) persists every record to
+    append-only binary segments.
+
+    The overall RMSE/MAPE baselines are the served model's holdout scores
+    when given. Otherwise they are learned from the first
+    ``baseline_samples`` logged predictions, the way StoreDriftMonitor
+    learns each store's baseline; until then the overall check is skipped.
+    """
+
+    def __init__(self, baseline_rmse=None, baseline_mape=None, capacity=100_000,
+                 windows=(100, 1_000, 10_000), min_samples=10, drift=None, prediction_log=None,
+                 baseline_samples=1_000):
         self.baseline_rmse = baseline_rmse
         self.baseline_mape = baseline_mape
+        self.baseline_samples = baseline_samples
         self.threshold_degradation = 0.15  # 15% threshold
-        self.predictions_log = []
-        logger.info("✅ PerformanceMonitor initialized")
-    
+        self.capacity = capacity
+        self.windows = tuple(min(w, capacity - 1) for w in windows)
+        self.min_samples = min_samples
+        self.drift = drift
+        self.prediction_log = prediction_log
+
+        self.count = 0  # predictions logged over the monitor's lifetime
+        self._timestamp = np.zeros(capacity, dtype=np.float64)
+        self._store_id = np.zeros(capacity, dtype=np.int32)
+        self._actual = np.zeros(capacity, dtype=np.float64)
+        self._predicted = np.zeros(capacity, dtype=np.float64)
+        self._error = np.zeros(capacity, dtype=np.float64)
+        self._error_pct = np.zeros(capacity, dtype=np.float64)
+        self._cumulative = np.zeros((capacity, 3), dtype=np.float64)
+        logger.info(f"✅ PerformanceMonitor initialized (capacity {capacity})")
+
     def log_prediction(self, actual, predicted, store_id, timestamp=None):
         """Log a prediction for monitoring"""
         if timestamp is None:
             timestamp = datetime.now()
-        
+
         error = abs(actual - predicted)
         error_pct = (error / actual) * 100 if actual > 0 else 0
-        
-        record = {
+
+        pos = self.count % self.capacity
+        previous = self._cumulative[(self.count - 1) % self.capacity] if self.count else (0.0, 0.0, 0.0)
+        epoch = _epoch_seconds(timestamp)
+        self._timestamp[pos] = epoch
+        self._store_id[pos] = store_id
+        self._actual[pos] = actual
+        self._predicted[pos] = predicted
+        self._error[pos] = error
+        self._error_pct[pos] = error_pct
+        self._cumulative[pos] = (previous[_ABS] + error, previous[_SQ] + error * error, previous[_PCT] + error_pct)
+        self.count += 1
+        if self.count == self.baseline_samples:
+            self._learn_baseline(self._cumulative[pos])
+        if self.drift is not None:
+            self.drift.update(store_id, actual, predicted)
+        if self.prediction_log is not None:
+            self.prediction_log.append(float(epoch), store_id, actual, predicted)
+
+        logger.debug(f"📝 Prediction logged: Store {store_id}, Error: {error_pct:.2f}%")
+
+        return {
             'timestamp': timestamp,
             'store_id': store_id,
             'actual': actual,
@@ -34,66 +98,177 @@ class PerformanceMonitor:
             'error': error,
             'error_pct': error_pct
         }
-        
-        self.predictions_log.append(record)
-        logger.info(f"📝 Prediction logged: Store {store_id}, Error: {error_pct:.2f}%")
-        
-        return record
-    
-    def check_model_performance(self):
+
+    def log_predictions(self, actual, predicted, store_ids, timestamps=None):
+        """Log many predictions at once (array-likes of equal length)"""
+        actual = np.asarray(actual, dtype=np.float64)
+        predicted = np.asarray(predicted, dtype=np.float64)
+        n_new = len(actual)
+        if n_new == 0:
+            return 0
+        if timestamps is None:
+            timestamps = np.full(n_new, _epoch_seconds(datetime.now()))
+        else:
+            timestamps = _epoch_seconds(pd.to_datetime(pd.Series(timestamps)).to_numpy())
+
+        error = np.abs(actual - predicted)
+        safe_actual = np.where(actual > 0, actual, 1.0)
+        error_pct = np.where(actual > 0, error / safe_actual * 100, 0.0)
+
+        increments = np.column_stack([error, error * error, error_pct])
+        cumulative = np.cumsum(increments, axis=0)
+        if self.count:
+            cumulative += self._cumulative[(self.count - 1) % self.capacity]
+
+        # Only the newest ``capacity`` rows survive; older ones only count towards the lifetime sums
+        keep = slice(max(0, n_new - self.capacity), n_new)
+        pos = (self.count + np.arange(n_new)[keep]) % self.capacity
+        self._timestamp[pos] = timestamps[keep]
+        self._store_id[pos] = np.asarray(store_ids)[keep]
+        self._actual[pos] = actual[keep]
+        self._predicted[pos] = predicted[keep]
+        self._error[pos] = error[keep]
+        self._error_pct[pos] = error_pct[keep]
+        self._cumulative[pos] = cumulative[keep]
+        if self.count < self.baseline_samples <= self.count + n_new:
+            self._learn_baseline(cumulative[self.baseline_samples - 1 - self.count])
+        self.count += n_new
+        if self.drift is not None:
+            self.drift.update_many(store_ids, actual, predicted)
+        if self.prediction_log is not None:
+            self.prediction_log.extend(timestamps, store_ids, actual, predicted)
+        return n_new
+
+    def _learn_baseline(self, sums):
+        """Freeze the metrics of the first ``baseline_samples`` predictions as any missing baseline"""
+        if self.baseline_rmse is None:
+            self.baseline_rmse = float(np.sqrt(sums[_SQ] / self.baseline_samples))
+        if self.baseline_mape is None:
+            self.baseline_mape = float(sums[_PCT] / self.baseline_samples)
+        logger.info(f"📊 Baseline learned from {self.baseline_samples} predictions: "
+                    f"RMSE {self.baseline_rmse:.2f}, MAPE {self.baseline_mape:.2f}%")
+
+    def _window_sums(self, window):
+        """(n, [sum |error|, sum error^2, sum error %]) over the last ``window`` predictions"""
+        n = min(window, self.count, self.capacity - 1)
+        if n == 0:
+            return 0, np.zeros(3)
+        latest = self._cumulative[(self.count - 1) % self.capacity]
+        if n == self.count:
+            return n, latest.copy()
+        return n, latest - self._cumulative[(self.count - 1 - n) % self.capacity]
+
+    def window_metrics(self, window):
+        """RMSE, MAE and MAPE over the last ``window`` predictions"""
+        n, sums = self._window_sums(window)
+        if n == 0:
+            return {'n': 0, 'rmse': None, 'mae': None, 'mape': None}
+        return {
+            'n': n,
+            'rmse': float(np.sqrt(max(sums[_SQ], 0.0) / n)),
+            'mae': float(sums[_ABS] / n),
+            'mape': float(sums[_PCT] / n)
+        }
+
+    def check_model_performance(self, window=100):
         """Check if model performance is acceptable"""
-        if len(self.predictions_log) < 10:
+        if self.count < self.min_samples:
             return {"status": "⏳ Insufficient data"}
-        
-        recent = pd.DataFrame(self.predictions_log[-100:])
-        
-        rmse = np.sqrt(np.mean(recent['error']**2))
-        mape = recent['error_pct'].mean()
-        
-        rmse_degradation = (rmse - self.baseline_rmse) / self.baseline_rmse
-        mape_degradation = (mape - self.baseline_mape) / self.baseline_mape
-        
+
+        recent = self.window_metrics(window)
+        rmse, mape = recent['rmse'], recent['mape']
+
+        # No baseline yet (or a degenerate one): report the metrics without comparing
+        rmse_degradation = (rmse - self.baseline_rmse) / self.baseline_rmse if self.baseline_rmse else None
+        mape_degradation = (mape - self.baseline_mape) / self.baseline_mape if self.baseline_mape else None
+
         status = {
+            'window': recent['n'],
             'current_rmse': rmse,
             'baseline_rmse': self.baseline_rmse,
-            'rmse_degradation_pct': rmse_degradation * 100,
+            'rmse_degradation_pct': None if rmse_degradation is None else rmse_degradation * 100,
+            'current_mae': recent['mae'],
             'current_mape': mape,
             'baseline_mape': self.baseline_mape,
-            'mape_degradation_pct': mape_degradation * 100,
+            'mape_degradation_pct': None if mape_degradation is None else mape_degradation * 100,
             'alert': False
         }
-        
-        if abs(rmse_degradation) > self.threshold_degradation:
+
+        # Only a worse RMSE is degradation; doing better than the baseline is not an alert
+        if rmse_degradation is not None and rmse_degradation > self.threshold_degradation:
             status['alert'] = True
             logger.warning(f"🚨 ALERT: RMSE degradation {rmse_degradation*100:.2f}%")
-        
+
+        if self.drift is not None:
+            status['store_alerts'] = self.drift.alerts()
+            status['alert'] = status['alert'] or bool(status['store_alerts'])
+
         return status
-    
+
     def generate_report(self):
         """Generate monitoring report"""
-        if not self.predictions_log:
+        if not self.count:
             return {"message": "No predictions logged yet"}
-        
-        df = pd.DataFrame(self.predictions_log)
-        
+
+        lifetime = self._cumulative[(self.count - 1) % self.capacity]
         report = {
             'timestamp': datetime.now().isoformat(),
-            'total_predictions': len(df),
+            'total_predictions': self.count,
+            'retained_predictions': min(self.count, self.capacity),
             'performance': {
-                'rmse': float(np.sqrt(np.mean(df['error']**2))),
-                'mae': float(np.mean(df['error'])),
-                'mape': float(df['error_pct'].mean())
-            }
+                'rmse': float(np.sqrt(lifetime[_SQ] / self.count)),
+                'mae': float(lifetime[_ABS] / self.count),
+                'mape': float(lifetime[_PCT] / self.count)
+            },
+            'windows': {str(w): self.window_metrics(w) for w in self.windows}
         }
-        
-        logger.info(f"📊 Report generated: {len(df)} predictions")
+        if self.drift is not None:
+            report['store_types'] = self.drift.segment_metrics()
+            report['worst_stores'] = self.drift.worst_stores(10)
+
+        logger.info(f"📊 Report generated: {self.count} predictions")
         return report
-    
-    def save_logs(self, filepath='logs/predictions.json'):
-        """Save prediction logs to file"""
+
+    def recent(self, n=None):
+        """The last ``n`` retained predictions (default: all retained), oldest first"""
+        retained = min(self.count, self.capacity)
+        n = retained if n is None else min(n, retained)
+        pos = (self.count - n + np.arange(n)) % self.capacity
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(self._timestamp[pos], unit='s'),
+            'store_id': self._store_id[pos],
+            'actual': self._actual[pos],
+            'predicted': self._predicted[pos],
+            'error': self._error[pos],
+            'error_pct': self._error_pct[pos]
+        })
+
+    def save_logs(self, filepath=None):
+        """Save prediction logs to disk
+
+        By default this flushes the attached prediction log. Records are
+        appended as they are logged (see prediction_log.py), so it only
+        forces the background writer's pending batch out now. With
+        ``filepath``, the retained predictions are written there as JSON
+        records instead, as in earlier versions.
+        """
+        if filepath is not None:
+            try:
+                records = self.recent().to_dict(orient='records')
+                with open(filepath, 'w') as f:
+                    json.dump(records, f, default=str, indent=2)
+                logger.info(f"✅ Logs saved to {filepath}")
+                return len(records)
+            except Exception as e:
+                logger.error(f"❌ Error saving logs: {e}")
+                return 0
+        if self.prediction_log is None:
+            logger.warning("⚠️  No prediction log attached - nothing to save")
+            return 0
         try:
-            with open(filepath, 'w') as f:
-                json.dump(self.predictions_log, f, default=str, indent=2)
-            logger.info(f"✅ Logs saved to {filepath}")
+            written = self.prediction_log.flush(fsync=True)
+            logger.info(f"✅ {written} prediction records flushed to {self.prediction_log.directory}")
+            return written
         except Exception as e:
-            logger.error(f"❌ Error saving logs: {e}")
\ No newline at end of file
+            logger.error(f"❌ Error saving logs: {e}")
+            return 0
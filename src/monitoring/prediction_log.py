@@ -0,0 +1,209 @@
+"""Append-only binary prediction log with segment rotation and memory-mapped readers
+
+Layout:
+    logs/predictions/predictions-000001.bin   16-byte header + fixed-width records
+    logs/predictions/predictions-000002.bin   ...
+
+Records are RECORD_DTYPE rows (timestamp as epoch seconds, store_id,
+actual, predicted) written in arrival order. A crash can at most leave a
+torn last record, which readers ignore.
+"""
+
+import glob
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('store_id', '<i4'),
+    ('actual', '<f8'),
+    ('predicted', '<f8'),
+])
+MAGIC = b"RPLOG\x00\x01\x00"
+HEADER = MAGIC + np.uint64(RECORD_DTYPE.itemsize).tobytes()
+HEADER_BYTES = len(HEADER)
+SEGMENT_PATTERN = "predictions-{:06d}.bin"
+
+LOG_DIR = "logs/predictions"
+
+
+class PredictionLog:
+    """Buffers appended records and writes them from a background thread
+
+    ``append`` only takes a lock and adds a tuple to a list, so logging stays
+    off the request path. Every ``flush_interval`` seconds the flusher packs
+    the pending tuples into one RECORD_DTYPE array and appends its bytes to
+    the current segment. A new segment starts once it passes ``segment_bytes``.
+    Segments are never shared, so several processes can log to one directory.
+    """
+
+    def __init__(self, directory=LOG_DIR, segment_bytes=64_000_000, flush_interval=1.0):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._file = None
+        self._segment = max(segment_numbers(directory), default=0)
+        self.records_written = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self._thread.start()
+
+    def append(self, timestamp, store_id, actual, predicted):
+        """Queue one record (timestamp in epoch seconds)"""
+        with self._lock:
+            self._pending.append((timestamp, store_id, actual, predicted))
+
+    def extend(self, timestamps, store_ids, actual, predicted):
+        """Queue many records given as equal-length array-likes"""
+        records = np.empty(len(store_ids), dtype=RECORD_DTYPE)
+        records['timestamp'] = timestamps
+        records['store_id'] = store_ids
+        records['actual'] = actual
+        records['predicted'] = predicted
+        with self._lock:
+            self._pending.append(records)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Error writing prediction log: {e}")
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return None
+        rows = [item for item in pending if isinstance(item, tuple)]
+        blocks = [item for item in pending if not isinstance(item, tuple)]
+        if rows:
+            blocks.append(np.array(rows, dtype=RECORD_DTYPE))
+        return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        # Exclusive create: other workers logging to the same directory take
+        # the next free number instead of appending into this segment
+        self._segment = max(self._segment, *segment_numbers(self.directory), 0)
+        while True:
+            self._segment += 1
+            path = os.path.join(self.directory, SEGMENT_PATTERN.format(self._segment))
+            try:
+                self._file = open(path, 'xb')
+                break
+            except FileExistsError:
+                continue
+        self._file.write(HEADER)
+        logger.info(f"🗂️  Prediction log segment {path}")
+
+    def flush(self, fsync=False):
+        """Write everything queued so far to the current segment"""
+        with self._write_lock:
+            records = self._take_pending()
+            if records is None:
+                return 0
+            if self._file is None or self._file.tell() >= self.segment_bytes:
+                self._open_segment()
+            self._file.write(records.tobytes())
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+            self.records_written += len(records)
+            return len(records)
+
+    def close(self):
+        """Stop the flusher, write the remaining records and close the segment"""
+        self._stop.set()
+        self._thread.join()
+        self.flush(fsync=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def segment_numbers(directory):
+    numbers = []
+    for path in glob.glob(os.path.join(directory, "predictions-*.bin")):
+        stem = os.path.basename(path)[len("predictions-"):-len(".bin")]
+        if stem.isdigit():
+            numbers.append(int(stem))
+    return sorted(numbers)
+
+
+def open_segment(path):
+    """Memory-map one segment as a read-only RECORD_DTYPE array (torn tail dropped)"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_BYTES)
+    if header != HEADER:
+        raise ValueError(f"{path} is not a prediction log segment")
+    n_records = (os.path.getsize(path) - HEADER_BYTES) // RECORD_DTYPE.itemsize
+    if n_records == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_BYTES, shape=(n_records,))
+
+
+def iter_segments(directory=LOG_DIR):
+    """Memory-mapped segments, oldest first"""
+    for number in segment_numbers(directory):
+        yield open_segment(os.path.join(directory, SEGMENT_PATTERN.format(number)))
+
+
+def historical_metrics(directory=LOG_DIR, start=None, end=None):
+    """RMSE, MAE and MAPE over all logged records in [start, end) epoch seconds
+
+    Each segment is reduced straight from its memory map, so millions of
+    records never become Python objects.
+    """
+    count, abs_sum, sq_sum, pct_sum = 0, 0.0, 0.0, 0.0
+    for records in iter_segments(directory):
+        if start is not None or end is not None:
+            ts = records['timestamp']
+            mask = np.ones(len(records), dtype=bool)
+            if start is not None:
+                mask &= ts >= start
+            if end is not None:
+                mask &= ts < end
+            records = records[mask]
+        actual = records['actual']
+        error = np.abs(records['predicted'] - actual)
+        count += len(records)
+        abs_sum += float(error.sum())
+        sq_sum += float(np.dot(error, error))
+        pct_sum += float((error / np.where(actual > 0, actual, 1.0) * 100)[actual > 0].sum())
+
+    if count == 0:
+        return {'count': 0, 'rmse': None, 'mae': None, 'mape': None}
+    return {
+        'count': count,
+        'rmse': float(np.sqrt(sq_sum / count)),
+        'mae': abs_sum / count,
+        'mape': pct_sum / count
+    }
+
+
+def replay(monitor, directory=LOG_DIR):
+    """Feed every logged record into a PerformanceMonitor, one vectorized call per segment
+
+    The monitor must not have a prediction log attached, or the records
+    would be written again.
+    """
+    total = 0
+    for records in iter_segments(directory):
+        timestamps = (records['timestamp'] * 1e9).astype(np.int64).astype('datetime64[ns]')
+        total += monitor.log_predictions(
+            records['actual'], records['predicted'], records['store_id'], timestamps=timestamps
+        )
+    return total
@@ -0,0 +1,218 @@
+"""Retraining CLI - fit or continue the XGBoost model on the cached feature table and package a new version
+
+Usage:
+    python -m src.train [--table Data/features] [--holdout-weeks 6] [--version 2025-11-20] [--activate]
+    python -m src.train --incremental [--base 2025-11-13] [--new-weeks 1] [--rounds 100]
+
+The feature table (src/features/pipeline.py) is rebuilt only when
+train.csv or store.csv changed, so a retrain does not re-engineer the
+history. A full fit trains a fresh model and scaler. --incremental loads
+an existing version, keeps its scaler and adds --rounds trees fitted only
+on the training rows newer than that version's training data.
+
+Either way, the last --holdout-weeks of data are held out and scored with
+the same metrics as Data/milestone3_model_results.csv. Scores are given
+per store-day and for chain-wide daily totals, which is how milestone 3
+scored its models. The currently served version is scored on the same
+holdout for comparison. The result is written to models/versions/<version>
+with the evaluation in its manifest.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+
+from .api.artifacts import is_packaged, load_packaged, package_model
+from .api.inference import FEATURE_NAMES, N_FEATURES, N_SCALED, scale_in_place
+from .api.registry import VERSIONS_DIR, ModelRegistry, activate_version, read_manifest
+from .evaluation import daily_totals, regression_metrics, results_frame
+from .features.pipeline import TABLE_DIR, build_feature_table, load_feature_table
+
+XGB_PARAMS = {
+    "n_estimators": 500,
+    "max_depth": 8,
+    "learning_rate": 0.1,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "tree_method": "hist",
+    "n_jobs": -1,
+    "random_state": 42,
+}
+
+
+# DATA
+def load_training_rows(table_dir):
+    """(X raw (N, 22) float32, Sales, Date) for open days with sales and complete history features
+
+    Rows whose lags reach before a store's first day are dropped, as in the
+    notebook - the API never serves a store without a full history window.
+    """
+    columns = load_feature_table(table_dir, set(FEATURE_NAMES) | {'Date', 'Sales'})
+    sales = np.asarray(columns['Sales'])
+    keep = (np.asarray(columns['Open']) == 1) & (sales > 0)
+    for name in FEATURE_NAMES[:N_SCALED]:
+        keep &= ~np.isnan(columns[name])
+
+    rows = np.flatnonzero(keep)
+    X = np.empty((len(rows), N_FEATURES), dtype=np.float32)
+    for col, name in enumerate(FEATURE_NAMES):
+        X[:, col] = columns[name][rows]
+    return X, sales[rows].astype(np.float64), np.asarray(columns['Date'])[rows]
+
+
+def scaled(X, scaler):
+    """Copy of a raw matrix with columns 0-16 scaled, as the serving pipeline does"""
+    out = X.copy()
+    scale_in_place(out, scaler)
+    return out
+
+
+# MODELS
+def load_version(version):
+    """(model, scaler, manifest) of a packaged version"""
+    package_dir = os.path.join(VERSIONS_DIR, version)
+    if not is_packaged(package_dir):
+        raise FileNotFoundError(f"No packaged model for version {version} in {VERSIONS_DIR}")
+    model, scaler = load_packaged(package_dir, mmap=False)
+    return model, scaler, read_manifest(package_dir)
+
+
+def fit_full(X_train, y_train, rounds):
+    scaler = StandardScaler().fit(X_train[:, :N_SCALED])
+    model = xgb.XGBRegressor(**{**XGB_PARAMS, "n_estimators": rounds})
+    model.fit(scaled(X_train, scaler), y_train)
+    return model, scaler
+
+
+def fit_incremental(base_model, scaler, X_new, y_new, rounds):
+    """Add ``rounds`` trees to ``base_model`` fitted on the new rows only; the scaler is kept"""
+    model = xgb.XGBRegressor(**{**XGB_PARAMS, "n_estimators": rounds})
+    model.fit(scaled(X_new, scaler), y_new, xgb_model=base_model.get_booster())
+    return model
+
+
+def evaluate(name, model, scaler, X, y, dates):
+    """Milestone-3 style metric rows: per store-day and for chain-wide daily totals"""
+    predicted = model.predict(scaled(X, scaler)).astype(np.float64)
+    _, actual_total, predicted_total = daily_totals(dates, y, predicted)
+    return [
+        {"Model": f"{name} (store-day)", **regression_metrics(y, predicted)},
+        {"Model": f"{name} (chain daily)", **regression_metrics(actual_total, predicted_total)},
+    ]
+
+
+# PIPELINE
+def train(args):
+    version = args.version or datetime.now().strftime("%Y-%m-%d-%H%M")
+    out_dir = os.path.join(VERSIONS_DIR, version)
+    if is_packaged(out_dir):
+        print(f"✘ Version {version} already exists in {VERSIONS_DIR}")
+        return 1
+
+    start = time.perf_counter()
+    manifest = build_feature_table(args.history, args.stores, args.table, args.workers)
+    X, y, dates = load_training_rows(args.table)
+    print(f"✔ {len(y):,} training rows from {args.table} ({manifest['first_date']} .. {manifest['last_date']}) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    holdout_start = dates.max() - np.timedelta64(7 * args.holdout_weeks - 1, 'D')
+    train_mask = dates < holdout_start
+    X_train, y_train, train_dates = X[train_mask], y[train_mask], dates[train_mask]
+    X_hold, y_hold, hold_dates = X[~train_mask], y[~train_mask], dates[~train_mask]
+    train_end = train_dates.max()
+
+    served_version = ModelRegistry(VERSIONS_DIR).current_version()
+    fit_start = time.perf_counter()
+    base_version = None
+    if args.incremental:
+        base_version = args.base or served_version
+        if base_version is None:
+            print("✘ --incremental needs --base or a CURRENT version to continue from")
+            return 1
+        base_model, scaler, base_manifest = load_version(base_version)
+        if args.new_weeks is not None:
+            new_start = train_end - np.timedelta64(7 * args.new_weeks - 1, 'D')
+        elif base_manifest.get("train_end"):
+            new_start = np.datetime64(base_manifest["train_end"], 'D') + 1
+        else:
+            print(f"✘ Version {base_version} does not record its training range; pass --new-weeks")
+            return 1
+        new_rows = train_dates >= new_start
+        if not new_rows.any():
+            print(f"✘ No training rows after {base_version}'s data (from {new_start})")
+            return 1
+        model = fit_incremental(base_model, scaler, X_train[new_rows], y_train[new_rows], args.rounds)
+        train_start = str(new_start)
+        n_fit_rows = int(np.count_nonzero(new_rows))
+        print(f"✔ Added {args.rounds} trees to {base_version} on {n_fit_rows:,} rows from {new_start} "
+              f"in {time.perf_counter() - fit_start:.1f}s")
+    else:
+        model, scaler = fit_full(X_train, y_train, args.rounds or XGB_PARAMS["n_estimators"])
+        train_start = str(train_dates.min())
+        n_fit_rows = len(y_train)
+        print(f"✔ Trained on {n_fit_rows:,} rows in {time.perf_counter() - fit_start:.1f}s")
+
+    results = evaluate(version, model, scaler, X_hold, y_hold, hold_dates)
+    if served_version is not None and served_version != version:
+        try:
+            served_model, served_scaler, _ = load_version(served_version)
+            results += evaluate(f"{served_version} (served)", served_model, served_scaler, X_hold, y_hold, hold_dates)
+        except FileNotFoundError:
+            pass
+    evaluation = results_frame(results)
+    print(f"📊 Holdout {holdout_start} .. {hold_dates.max()} ({len(y_hold):,} rows)")
+    print(evaluation.to_string(index=False))
+
+    max_diff = package_model(
+        model, scaler, out_dir, version=version,
+        trained_from=args.table, base_version=base_version,
+        train_start=train_start, train_end=str(train_end), fit_rows=n_fit_rows,
+        holdout_start=str(holdout_start), holdout_end=str(hold_dates.max()),
+        params={**XGB_PARAMS, "n_estimators": model.get_booster().num_boosted_rounds()},
+        evaluation=results,
+    )
+    evaluation.to_csv(os.path.join(out_dir, "evaluation.csv"), index=False)
+    print(f"✔ Version {version} written to {out_dir} (packaging max abs diff {max_diff:.3g})")
+
+    if args.activate:
+        activate_version(VERSIONS_DIR, version)
+        print(f"✔ {VERSIONS_DIR}/CURRENT -> {version}")
+    print(f"📊 Total wall time {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.train", description=__doc__.splitlines()[0])
+    parser.add_argument("--history", default="Data/train.csv")
+    parser.add_argument("--stores", default="Data/store.csv")
+    parser.add_argument("--table", default=TABLE_DIR, help="Feature table directory (built if missing or stale)")
+    parser.add_argument("--workers", type=int, default=None, help="Feature pipeline processes")
+    parser.add_argument("--holdout-weeks", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=None,
+                        help=f"Trees to fit (default: {XGB_PARAMS['n_estimators']}, or 100 with --incremental)")
+    parser.add_argument("--incremental", action="store_true", help="Continue boosting an existing version")
+    parser.add_argument("--base", default=None, help="Version to continue from (default: CURRENT)")
+    parser.add_argument("--new-weeks", type=int, default=None,
+                        help="Fit on the last N training weeks (default: rows after the base's train_end)")
+    parser.add_argument("--version", default=None, help="Version name (default: current date and time)")
+    parser.add_argument("--activate", action="store_true", help="Point models/versions/CURRENT at the new version")
+    return parser
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = build_parser().parse_args(argv)
+    if args.incremental and args.rounds is None:
+        args.rounds = 100
+    return train(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Shared fixtures: the API served from a tiny packaged model, sales history and store metadata"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+
+from src.api.artifacts import package_model
+from src.api.inference import N_FEATURES, N_SCALED
+from src.api.registry import ModelRegistry, activate_version
+
+N_STORES = 3
+HISTORY_DAYS = 40
+LAST_DATE = np.datetime64("2015-07-31")
+# Holdout rows as src/train.py writes them to the manifest of version v1
+EVALUATION = [
+    {"Model": "v1 (store-day)", "RMSE": 900.0, "MAE": 650.0, "MAPE": 11.5, "R2": 0.91},
+    {"Model": "v1 (chain daily)", "RMSE": 150000.0, "MAE": 72000.0, "MAPE": 1.7, "R2": 0.998},
+]
+
+
+def write_history(path):
+    """train.csv-style history: HISTORY_DAYS days ending on LAST_DATE for stores 1..N_STORES"""
+    rng = np.random.default_rng(0)
+    dates = LAST_DATE - np.arange(HISTORY_DAYS)[::-1]
+    rows = [
+        {"Store": store, "Date": str(day), "Sales": float(rng.integers(3000, 8000)),
+         "Customers": float(rng.integers(300, 800))}
+        for store in range(1, N_STORES + 1) for day in dates
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def write_stores(path):
+    """store.csv-style metadata for stores 1..N_STORES"""
+    pd.DataFrame({
+        "Store": np.arange(1, N_STORES + 1),
+        "StoreType": ["a", "c", "d"][:N_STORES],
+        "Assortment": ["a", "c", "a"][:N_STORES],
+        "CompetitionDistance": [1270.0, 570.0, 14130.0][:N_STORES],
+        "CompetitionOpenSinceMonth": [9, 11, 12][:N_STORES],
+        "CompetitionOpenSinceYear": [2008, 2007, 2006][:N_STORES],
+        "Promo2": [0, 1, 1][:N_STORES],
+        "Promo2SinceWeek": [np.nan, 13, 14][:N_STORES],
+        "Promo2SinceYear": [np.nan, 2010, 2011][:N_STORES],
+        "PromoInterval": [np.nan, "Jan,Apr,Jul,Oct", "Jan,Apr,Jul,Oct"][:N_STORES],
+    }).to_csv(path, index=False)
+
+
+def package_version(versions_dir, version, seed, **manifest_fields):
+    """Fit a few trees on random rows and package them as ``version``"""
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 10, size=(200, N_FEATURES)).astype(np.float32)
+    y = 5000 + 300 * X[:, 0] + rng.normal(0, 50, size=200)
+    scaler = StandardScaler().fit(X[:, :N_SCALED])
+    X[:, :N_SCALED] = scaler.transform(X[:, :N_SCALED])
+    model = xgb.XGBRegressor(n_estimators=5, max_depth=3, random_state=seed).fit(X, y)
+    package_model(model, scaler, os.path.join(versions_dir, version), version=version, **manifest_fields)
+
+
+@pytest.fixture(scope="session")
+def data_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("data")
+    write_history(directory / "train.csv")
+    write_stores(directory / "store.csv")
+    return directory
+
+
+@pytest.fixture(scope="session")
+def versions_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("versions")
+    package_version(str(directory), "v1", seed=1, evaluation=EVALUATION)
+    package_version(str(directory), "v2", seed=2)
+    return directory
+
+
+@pytest.fixture
+def client(tmp_path, data_dir, versions_dir, monkeypatch):
+    """TestClient with startup run against the fixture model, history and stores"""
+    from fastapi.testclient import TestClient
+
+    from src.api import config, main
+
+    activate_version(str(versions_dir), "v1")
+    registry = ModelRegistry(str(versions_dir), str(tmp_path / "packaged"))
+    registry.on_swap(main.on_model_swap)
+    monkeypatch.setattr(main, "REGISTRY", registry)
+    monkeypatch.setattr(main, "HISTORY_PATH", str(data_dir / "train.csv"))
+    monkeypatch.setattr(main, "STORE_METADATA_PATH", str(data_dir / "store.csv"))
+    monkeypatch.setattr(config, "FEATURE_TABLE_DIR", str(tmp_path / "features"))
+    monkeypatch.setattr(config, "PREDICTION_LOG_DIR", "")
+    monkeypatch.setattr(config, "MONITOR_CAPACITY", 1000)
+    monkeypatch.setattr(config, "ADMIN_TOKEN", None)
+    monkeypatch.setattr(config, "MODEL_WATCH_INTERVAL", 0)
+    monkeypatch.setattr(config, "STREAM_CHUNK_ROWS", 2)
+
+    with TestClient(main.app) as test_client:
+        yield test_client
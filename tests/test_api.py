@@ -0,0 +1,241 @@
+"""End-to-end checks of the API routes against the fixture model (see conftest.py)"""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.api.inference import FEATURE_NAMES, N_FEATURES
+
+from conftest import LAST_DATE, N_STORES
+
+EXAMPLE_ROW = {
+    "DayOfWeek": 3, "Month": 11, "Quarter": 4, "IsWeekend": 0, "Promo": 1.0, "SchoolHoliday": 0,
+    "Sales_Lag_1": 5000.0, "Sales_Lag_7": 4800.0, "Sales_Lag_14": 4700.0, "Sales_Lag_30": 4900.0,
+    "Customers_Lag_1": 800.0, "Customers_Lag_7": 820.0,
+    "Sales_Rolling_Mean_7": 4900.0, "Sales_Rolling_Mean_14": 4850.0,
+    "Sales_Rolling_Std_7": 100.0, "Sales_Rolling_Std_14": 120.0, "SalesPerCustomer": 6.25,
+    "Store": 1, "Open": 1, "StoreType": 0, "Assortment": 0, "CompetitionDistance": 1000.0,
+}
+NEXT_DATE = str(LAST_DATE + 1)
+
+
+def example_matrix(n_rows):
+    return np.tile(np.array([EXAMPLE_ROW[name] for name in FEATURE_NAMES], dtype='<f4'), (n_rows, 1))
+
+
+def predict_store(client, store=1, date=NEXT_DATE):
+    return client.post("/predict_store", json={"Store": store, "Date": date, "Promo": 1, "SchoolHoliday": 0})
+
+
+# STREAMING (NDJSON)
+def test_stream_scores_every_row(client):
+    rows = [EXAMPLE_ROW] * 5
+    body = "\n".join(json.dumps(row) for row in rows) + "\n"
+    response = client.post("/predict_batch/stream", content=body,
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Model-Version"] == "v1"
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(line["index"] for line in lines) == list(range(5))
+    assert all("prediction" in line for line in lines)
+
+    # Same rows through /predict_batch give the same predictions
+    batch = client.post("/predict_batch", json={"data": rows}).json()
+    by_index = {line["index"]: line["prediction"] for line in lines}
+    np.testing.assert_allclose([by_index[i] for i in range(5)], batch["predictions"], rtol=1e-6)
+
+
+def test_stream_reports_invalid_rows(client):
+    bad = {**EXAMPLE_ROW, "Month": 13}
+    body = "\n".join(json.dumps(row) for row in (EXAMPLE_ROW, bad, EXAMPLE_ROW))
+    response = client.post("/predict_batch/stream", content=body)
+
+    lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+    assert sorted(lines) == [0, 1, 2]
+    assert "error" in lines[1] and "Month" in lines[1]["error"]
+    assert "prediction" in lines[0] and "prediction" in lines[2]
+
+
+def test_stream_answers_before_body_ends(client):
+    # Called as plain ASGI: TestClient sends the whole body before the app runs
+    from src.api import main
+
+    chunk = ("\n".join(json.dumps(EXAMPLE_ROW) for _ in range(2)) + "\n").encode()
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": True},
+        {"type": "http.request", "body": chunk, "more_body": False},
+    ]
+    events = []
+
+    async def receive():
+        if not messages:
+            return {"type": "http.disconnect"}
+        events.append("body")
+        return messages.pop(0)
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            events.append("output")
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/predict_batch/stream", "raw_path": b"/predict_batch/stream",
+        "root_path": "", "query_string": b"", "client": ("testclient", 50000), "server": ("testserver", 80),
+        "headers": [(b"content-type", b"application/x-ndjson")],
+    }
+    asyncio.run(main.app(scope, receive, send))
+
+    assert events[:3] == ["body", "output", "body"]
+    assert events.count("output") == 2
+
+
+# BINARY
+def test_binary_round_trip(client):
+    matrix = example_matrix(4)
+    matrix[2, FEATURE_NAMES.index("Month")] = 13
+    response = client.post("/predict_batch/binary", content=matrix.tobytes(),
+                           headers={"Content-Type": "application/octet-stream"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Batch-Size"] == "4"
+    assert response.headers["X-Failed-Rows"] == "1"
+    predictions = np.frombuffer(response.content, dtype='<f4')
+    assert np.isnan(predictions[2])
+    assert np.isfinite(np.delete(predictions, 2)).all()
+
+
+def test_binary_rejects_partial_rows(client):
+    response = client.post("/predict_batch/binary", content=b"\0" * (N_FEATURES * 4 + 3))
+    assert response.status_code == 400
+
+
+# STORE/DATE PREDICTION
+def test_predict_store_requires_next_date(client):
+    assert predict_store(client).status_code == 200
+    assert predict_store(client, date=str(LAST_DATE + 3)).status_code == 422
+    assert client.get("/stores/1").json()["NextDate"] == NEXT_DATE
+
+
+def test_daily_history_advances_next_date(client):
+    day = {"Date": NEXT_DATE, "Store": [1, 2, 3], "Sales": [5000.0, 0.0, 6500.0], "Customers": [600.0, 0.0, 700.0]}
+    response = client.post("/features/daily", json=day)
+    assert response.status_code == 200
+    assert response.json()["appended"] == [1, 2, 3]
+
+    following = str(LAST_DATE + 2)
+    assert predict_store(client, date=following).status_code == 200
+    assert predict_store(client).status_code == 422
+    assert client.get("/stores/1").json()["NextDate"] == following
+
+    # Re-posting the same day is a no-op
+    assert client.post("/features/daily", json=day).json()["skipped"] == [1, 2, 3]
+
+
+# FORECAST
+def test_forecast_shape(client):
+    response = client.post("/forecast", json={"Stores": [1, 2, 99], "horizon": 7})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["stores"] == [1, 2]
+    assert result["skipped"] == [99]
+    assert result["dates"][0] == NEXT_DATE and len(result["dates"]) == 7
+    assert np.asarray(result["forecast"]).shape == (2, 7)
+
+
+def test_forecast_closed_days_are_zero(client):
+    response = client.post("/forecast", json={"horizon": 3, "Open": [1, 0, 1]})
+
+    forecast = np.asarray(response.json()["forecast"])
+    assert forecast.shape == (N_STORES, 3)
+    assert (forecast[:, 1] == 0).all()
+    assert (forecast[:, [0, 2]] > 0).all()
+
+
+def test_forecast_start_date_contract(client):
+    assert client.post("/forecast", json={"horizon": 3, "start_date": str(LAST_DATE)}).status_code == 422
+
+    direct = client.post("/forecast", json={"Stores": [1], "horizon": 5}).json()
+    later = client.post("/forecast", json={"Stores": [1], "horizon": 3, "start_date": str(LAST_DATE + 3)}).json()
+    assert later["gap_days"] == 2
+    assert later["dates"] == direct["dates"][2:]
+    np.testing.assert_allclose(later["forecast"], np.asarray(direct["forecast"])[:, 2:])
+
+
+# MONITORING
+def test_actuals_join_served_predictions(client):
+    assert predict_store(client).status_code == 200
+
+    response = client.post("/monitor/actuals", json={
+        "Store": [1, 2], "Date": [NEXT_DATE, NEXT_DATE], "Sales": [5000.0, 6000.0]
+    })
+    assert response.status_code == 202
+
+    report = client.get("/monitor/report").json()
+    assert report["ingestion"]["received"] == 2
+    assert report["ingestion"]["matched"] == 1
+    assert report["ingestion"]["matched_by_version"] == {"v1": 1}
+    assert report["report"]["total_predictions"] == 1
+
+
+def test_exact_actuals_give_zero_error(client):
+    # /predict_store reports Sales / 1000; actuals are posted in raw Sales units
+    prediction = predict_store(client).json()["prediction"]
+    client.post("/monitor/actuals", json={"Store": [1], "Date": [NEXT_DATE], "Sales": [prediction * 1000]})
+
+    performance = client.get("/monitor/report").json()["report"]["performance"]
+    assert performance["rmse"] == pytest.approx(0.0, abs=1e-3)
+    assert performance["mape"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_actuals_ignore_other_versions(client):
+    assert predict_store(client).status_code == 200
+    client.post("/admin/reload", json={"version": "v2"})
+    client.post("/monitor/actuals", json={"Store": [1], "Date": [NEXT_DATE], "Sales": [5000.0]})
+
+    ingestion = client.get("/monitor/report").json()["ingestion"]
+    assert ingestion["matched"] == 0
+    assert ingestion["other_version"] == 1
+
+
+# MODEL METADATA
+def test_model_info_reads_manifest_metrics(client):
+    info = client.get("/model/info").json()
+    assert info["version"] == "v1"
+    assert info["performance_metrics"] == {"rmse": 150000.0, "mae": 72000.0, "mape": 1.7, "r2": 0.998}
+
+    client.post("/admin/reload", json={"version": "v2"})
+    assert client.get("/model/info").json()["performance_metrics"] == {}
+
+
+# MODEL ADMIN
+def test_admin_reload_swaps_version(client):
+    before = client.post("/predict_batch", json={"data": [EXAMPLE_ROW]}).json()
+
+    response = client.post("/admin/reload", json={"version": "v2"})
+    assert response.status_code == 200
+    assert response.json()["previous_version"] == "v1"
+    assert response.json()["version"] == "v2"
+
+    after = client.post("/predict_batch", json={"data": [EXAMPLE_ROW]}).json()
+    assert after["model_version"] == "v2"
+    assert after["predictions"] != before["predictions"]
+    assert client.get("/admin/models").json()["active"] == "v2"
+
+
+def test_admin_reload_unknown_version(client):
+    response = client.post("/admin/reload", json={"version": "missing"})
+    assert response.status_code == 404
+    assert client.get("/model/info").json()["version"] == "v1"
+
+
+def test_admin_token_required(client, monkeypatch):
+    from src.api import config
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "secret")
+    assert client.post("/admin/reload", json={"version": "v2"}).status_code == 403
+    assert client.post("/admin/reload", json={"version": "v2"},
+                       headers={"X-Admin-Token": "secret"}).status_code == 200
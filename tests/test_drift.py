@@ -0,0 +1,55 @@
+"""Per-store drift baselines and alerts"""
+
+import numpy as np
+import pytest
+
+from src.monitoring.drift import StoreDriftMonitor
+
+
+def log(monitor, store_id, errors, actual=5000.0):
+    errors = np.asarray(errors, dtype=np.float64)
+    monitor.update_many(np.full(len(errors), store_id), np.full(len(errors), actual), actual + errors)
+
+
+def test_baseline_learned_from_first_observations():
+    monitor = StoreDriftMonitor(n_stores=2, min_count=5)
+    log(monitor, 1, [100.0, -100.0] * 2)
+    assert np.isnan(monitor.baseline_rmse[1])
+
+    log(monitor, 1, [100.0])
+    assert monitor.baseline_rmse[1] == pytest.approx(100.0)
+    assert np.isnan(monitor.baseline_rmse[2])
+    assert monitor.alerts() == []
+
+
+def test_alert_compares_errors_after_baseline():
+    monitor = StoreDriftMonitor(n_stores=2, min_count=5)
+    log(monitor, 1, [100.0] * 5)
+    log(monitor, 2, [100.0] * 5)
+    log(monitor, 1, [200.0] * 5)
+    log(monitor, 2, [105.0] * 5)
+
+    alerts = monitor.alerts()
+    assert [alert['store_id'] for alert in alerts] == [1]
+    assert alerts[0]['baseline_rmse'] == pytest.approx(100.0)
+    assert alerts[0]['rmse'] == pytest.approx(200.0)
+    assert alerts[0]['count'] == 5
+
+
+def test_scalar_updates_learn_the_same_baseline():
+    batched, single = StoreDriftMonitor(n_stores=1, min_count=3), StoreDriftMonitor(n_stores=1, min_count=3)
+    errors = [30.0, -40.0, 50.0]
+    log(batched, 1, errors)
+    for error in errors:
+        single.update(1, 5000.0, 5000.0 + error)
+    np.testing.assert_allclose(single.baseline_rmse[1], batched.baseline_rmse[1])
+
+
+def test_set_baseline_applies_to_later_observations():
+    monitor = StoreDriftMonitor(n_stores=1, min_count=2)
+    log(monitor, 1, [1000.0] * 4)
+    monitor.set_baseline(100.0)
+    log(monitor, 1, [110.0] * 2)
+    assert monitor.alerts() == []
+    log(monitor, 1, [400.0] * 2)
+    assert [alert['store_id'] for alert in monitor.alerts()] == [1]
@@ -0,0 +1,43 @@
+"""Overall baselines, degradation alerts and log saving of PerformanceMonitor"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.monitoring.performance_monitor import PerformanceMonitor
+
+
+def log(monitor, errors, actual=5000.0):
+    errors = np.asarray(errors, dtype=np.float64)
+    monitor.log_predictions(np.full(len(errors), actual), actual + errors, np.ones(len(errors), dtype=np.int64))
+
+
+def test_baseline_learned_after_warm_up():
+    monitor = PerformanceMonitor(capacity=1000, baseline_samples=20)
+    log(monitor, [100.0] * 15)
+    status = monitor.check_model_performance()
+    assert status['baseline_rmse'] is None and status['alert'] is False
+
+    log(monitor, [100.0] * 5 + [500.0] * 5)
+    assert monitor.baseline_rmse == pytest.approx(100.0)
+    assert monitor.baseline_mape == pytest.approx(2.0)
+
+
+def test_only_worse_rmse_alerts():
+    monitor = PerformanceMonitor(baseline_rmse=100.0, baseline_mape=2.0, capacity=1000)
+    log(monitor, [10.0] * 20)
+    assert monitor.check_model_performance(window=20)['alert'] is False
+
+    log(monitor, [200.0] * 20)
+    assert monitor.check_model_performance(window=20)['alert'] is True
+
+
+def test_save_logs_to_a_file(tmp_path):
+    monitor = PerformanceMonitor(capacity=1000)
+    log(monitor, [100.0, -50.0])
+    path = tmp_path / "predictions.json"
+
+    assert monitor.save_logs(str(path)) == 2
+    assert [row['error'] for row in json.loads(path.read_text())] == [100.0, 50.0]
+    assert monitor.save_logs() == 0  # no prediction log attached
@@ -0,0 +1,25 @@
+"""Binary prediction log segments and readers"""
+
+import numpy as np
+
+from src.monitoring.prediction_log import PredictionLog, historical_metrics, iter_segments, segment_numbers
+
+
+def test_two_logs_share_a_directory(tmp_path):
+    # Two workers logging to one directory must never write into the same segment
+    first = PredictionLog(str(tmp_path), flush_interval=60)
+    second = PredictionLog(str(tmp_path), flush_interval=60)
+    first.extend(np.full(3, 1.0), [1, 2, 3], [100.0] * 3, [110.0] * 3)
+    second.extend(np.full(2, 2.0), [4, 5], [200.0] * 2, [200.0] * 2)
+    first.flush()
+    second.flush()
+    first.extend(np.full(1, 3.0), [6], [100.0], [90.0])
+    first.flush()
+    first.close()
+    second.close()
+
+    assert segment_numbers(str(tmp_path)) == [1, 2]
+    segments = list(iter_segments(str(tmp_path)))
+    assert sorted(len(records) for records in segments) == [2, 4]
+    assert sorted(np.concatenate([records['store_id'] for records in segments])) == [1, 2, 3, 4, 5, 6]
+    assert historical_metrics(str(tmp_path))['count'] == 6